@@ -3,14 +3,27 @@ Main Embedding Agent that orchestrates the document processing pipeline
 """
 
 import os
+import random
+import shutil
+import time
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass
 
-from .models import DocumentChunk, ProductDocuments, ProductType, DocumentType
+import numpy as np
+
+from .models import DocumentChunk, ProductDocuments, ProductType, DocumentType, make_chunk_id
 from .chunking_strategies import ChunkerFactory
 from .metadata_enricher import MetadataEnricher
 from .vector_store import WeaviateVectorStore
+from .embedding_utils import EmbeddingStats, embed_texts, supports_aliases
+from .enrichment_cache import EnrichmentCache
+from .pipeline import Stage, StreamingPipeline
+from .staged_run import StagedRun, STAGES, VECTOR_NAMES
+from agents.retrieval.chunk_store import ChunkStore
+from agents.retrieval.sentence_store import SentenceStore, split_sentences, min_compressible_sentences
+from agents.retrieval.faq_index import FAQQuestionStore
+from config import Config
 
 
 class EmbeddingAgent:
@@ -37,7 +50,9 @@ class EmbeddingAgent:
         self.gemini_api_key = gemini_api_key
         
         # Initialize components
-        self.enricher = MetadataEnricher(gemini_api_key)
+        self.cache = EnrichmentCache(Config.ENRICHMENT_CACHE_PATH) if Config.ENRICHMENT_CACHE_PATH else None
+        self.embedding_stats = EmbeddingStats()
+        self.enricher = MetadataEnricher(gemini_api_key, cache=self.cache)
         self.vector_store = WeaviateVectorStore(
             host=weaviate_host,
             port=weaviate_port,
@@ -47,32 +62,228 @@ class EmbeddingAgent:
         # Product documents storage
         self.product_documents: Dict[ProductType, ProductDocuments] = {}
         
-    def run(self):
-        """Execute the complete embedding pipeline"""
+    def run(self, incremental: bool = False, blue_green: bool = False):
+        """
+        Execute the complete embedding pipeline
+
+        Args:
+            incremental: Sync the existing collection (insert, update, delete)
+                         instead of dropping and re-creating it
+            blue_green: Build a new versioned collection and switch the alias to it
+                        once validated, leaving the live collection untouched until then
+        """
         print("Starting Embedding Agent Pipeline...")
+        self.embedding_stats = EmbeddingStats()
         
         # Phase 1: Data Loading & Product Consolidation
         print("\n=== Phase 1: Data Loading & Product Consolidation ===")
         self._load_and_consolidate_documents()
-        
-        # Phase 2: Advanced Chunking & Metadata Enrichment
-        print("\n=== Phase 2: Advanced Chunking & Metadata Enrichment ===")
-        all_chunks = self._chunk_all_documents()
-        
-        # Phase 3: Multi-Vector Embedding Generation
-        print("\n=== Phase 3: Multi-Vector Embedding Generation ===")
-        enriched_chunks = self._enrich_chunks(all_chunks)
-        embedded_chunks = self._generate_embeddings(enriched_chunks)
-        
-        # Phase 4: Weaviate Schema Design & Ingestion
-        print("\n=== Phase 4: Weaviate Schema Design & Ingestion ===")
-        self._setup_vector_store()
-        self._ingest_chunks(embedded_chunks)
+
+        if incremental and not blue_green:
+            # A sync diffs the whole corpus against the index, so it runs phase by phase
+            print("\n=== Phase 2: Advanced Chunking & Metadata Enrichment ===")
+            all_chunks = self._chunk_all_documents()
+
+            print("\n=== Phase 3: Multi-Vector Embedding Generation ===")
+            enriched_chunks = self._enrich_chunks(all_chunks)
+            embedded_chunks = self._generate_embeddings(enriched_chunks)
+
+            print("\n=== Phase 4: Weaviate Sync ===")
+            self._sync_chunks(embedded_chunks)
+        else:
+            # Phases 2-4 overlap: chunks stream through enrichment, embedding and insertion
+            print("\n=== Phases 2-4: Streaming Chunking, Enrichment, Embedding & Ingestion ===")
+            embedded_chunks = self._stream_ingest(blue_green)
         
         print("\n✅ Embedding Agent Pipeline Complete!")
         print(f"Total chunks processed: {len(embedded_chunks)}")
+        self._print_run_stats()
         
         return embedded_chunks
+
+    def run_staged(self,
+                   run_id: Optional[str] = None,
+                   from_stage: Optional[str] = None,
+                   to_stage: str = "insert",
+                   incremental: bool = False,
+                   blue_green: bool = False) -> List[DocumentChunk]:
+        """
+        Execute the pipeline stage by stage, persisting every stage's output
+
+        Each stage (chunk, enrich, embed, insert) writes its artifact under
+        INGEST_RUNS_DIR/<run_id> and checkpoints as it goes. Re-running with
+        the same run ID skips completed stages and resumes an interrupted
+        enrich or embed stage from its last checkpoint.
+
+        Args:
+            run_id: Run to resume; a new run is started when None
+            from_stage: Re-run this stage and all later ones from the previous stage's artifact
+            to_stage: Last stage to run
+            incremental: Sync the existing collection in the insert stage
+            blue_green: Insert into a new collection version and swap the alias to it
+
+        Returns:
+            Chunks output by the last stage run, without their embeddings
+        """
+        run = StagedRun(Config.INGEST_RUNS_DIR, run_id, dimensions=Config.EMBEDDING_DIMENSIONS)
+        print(f"Starting staged Embedding Agent run {run.run_id} ({run.directory})")
+        self.embedding_stats = EmbeddingStats()
+
+        first = STAGES.index(from_stage) if from_stage else 0
+        last = STAGES.index(to_stage)
+        if first > last:
+            raise ValueError(f"--from-stage {from_stage} comes after --to-stage {to_stage}")
+        for stage in STAGES[:first]:
+            if not run.is_complete(stage):
+                raise ValueError(f"Run {run.run_id} has not completed the {stage} stage; "
+                                 f"cannot start from {from_stage}")
+        if from_stage:
+            run.reset_from(from_stage)
+        elif run.completed_stages:
+            print(f"Resuming: completed stages {', '.join(run.completed_stages)}")
+
+        chunks: List[DocumentChunk] = []
+        for stage in STAGES[:last + 1]:
+            if run.is_complete(stage) and stage != STAGES[last]:
+                print(f"\n=== Stage {stage}: already complete, skipped ===")
+                continue
+            if run.is_complete(stage):
+                print(f"\n=== Stage {stage}: already complete, loading its output ===")
+                chunks = run.read_chunks() if stage == "chunk" else run.read_enriched()
+                continue
+
+            print(f"\n=== Stage {stage} ===")
+            if stage == "chunk":
+                self._load_and_consolidate_documents()
+                count = run.write_chunks(self._iter_chunks())
+                print(f"✓ Wrote {count} chunks to {run.CHUNKS_FILE}")
+                run.mark_complete("chunk", chunk_count=count)
+                chunks = run.read_chunks()
+            elif stage == "enrich":
+                chunks = self._staged_enrich(run)
+                run.mark_complete("enrich", generation_model=Config.GENERATION_MODEL)
+            elif stage == "embed":
+                chunks = self._staged_embed(run)
+                run.mark_complete("embed", embedding_model=Config.EMBEDDING_MODEL,
+                                  embedding_dimensions=Config.EMBEDDING_DIMENSIONS)
+            else:
+                chunks = self._staged_insert(run, incremental, blue_green)
+                run.mark_complete("insert", collection=self.vector_store.collection_name)
+
+        print(f"\n✅ Staged run {run.run_id} complete through the {to_stage} stage")
+        print(f"Total chunks processed: {len(chunks)}")
+        self._print_run_stats()
+        return chunks
+
+    def _staged_enrich(self, run: StagedRun) -> List[DocumentChunk]:
+        """Enrich the run's chunks, appending each finished slice to its artifact"""
+        chunks = run.read_chunks()
+        done = {chunk.chunk_id for chunk in run.read_enriched()}
+        pending = [chunk for chunk in chunks if chunk.chunk_id not in done]
+        if done:
+            print(f"Resuming enrichment: {len(done)} chunks already enriched, {len(pending)} left")
+
+        step = max(1, Config.INGEST_CHECKPOINT_CHUNKS)
+        for start in range(0, len(pending), step):
+            enriched = self._enrich_chunks(pending[start:start + step])
+            run.append_enriched(enriched)
+            print(f"💾 Checkpoint: {len(done) + start + len(enriched)}/{len(chunks)} chunks enriched")
+
+        results = run.read_enriched()
+        self._check_stage_output(run, "enrich", [chunk.chunk_id for chunk in chunks],
+                                 {chunk.chunk_id for chunk in results})
+        return results
+
+    def _staged_embed(self, run: StagedRun) -> List[DocumentChunk]:
+        """Embed the run's enriched chunks, appending each finished slice to its artifact"""
+        chunks = run.read_enriched()
+        done = run.embedded_ids()
+        pending = [chunk for chunk in chunks if chunk.chunk_id not in done]
+        if done:
+            print(f"Resuming embedding: {len(done)} chunks already embedded, {len(pending)} left")
+
+        step = max(1, Config.INGEST_CHECKPOINT_CHUNKS)
+        written = len(done)
+        for start in range(0, len(pending), step):
+            embedded = self._generate_embeddings(pending[start:start + step])
+            # A chunk missing any of its vectors is not checkpointed, so a resumed run embeds it again
+            complete = [chunk for chunk in embedded if not self.vector_store.missing_embeddings(chunk)]
+            if len(complete) < len(embedded):
+                print(f"⚠️ {len(embedded) - len(complete)} chunks are missing embeddings and were not checkpointed")
+            run.append_embeddings(complete)
+            for chunk in embedded:
+                for name in VECTOR_NAMES:
+                    setattr(chunk, name, None)
+            written += len(complete)
+            print(f"💾 Checkpoint: {written}/{len(chunks)} chunks embedded")
+
+        self._check_stage_output(run, "embed", [chunk.chunk_id for chunk in chunks], run.embedded_ids())
+        return chunks
+
+    def _check_stage_output(self, run: StagedRun, stage: str, expected_ids: List[str], written_ids: Set[str]):
+        """Refuse to mark a stage complete while any of its input chunks is missing from its artifact"""
+        missing = [chunk_id for chunk_id in expected_ids if chunk_id not in written_ids]
+        if missing:
+            raise RuntimeError(
+                f"{len(missing)} chunks (e.g. {missing[0]}) are missing from the {stage} output of run "
+                f"{run.run_id}; re-run with --run-id {run.run_id} to finish them"
+            )
+
+    def _staged_insert(self, run: StagedRun, incremental: bool, blue_green: bool) -> List[DocumentChunk]:
+        """Write the run's embedded chunks to Weaviate and build the local stores"""
+        chunks = run.read_enriched()
+        vectors = run.read_embeddings()
+        missing = [chunk.chunk_id for chunk in chunks if chunk.chunk_id not in vectors]
+        if missing:
+            raise RuntimeError(f"{len(missing)} chunks of run {run.run_id} have no embeddings; "
+                               f"re-run with --from-stage embed")
+
+        def attach(batch: List[DocumentChunk]):
+            for chunk in batch:
+                for name, vector in vectors[chunk.chunk_id].items():
+                    setattr(chunk, name, vector)
+
+        def release(batch: List[DocumentChunk]):
+            for chunk in batch:
+                for name in VECTOR_NAMES:
+                    setattr(chunk, name, None)
+
+        if incremental and not blue_green:
+            attach(chunks)
+            self._sync_chunks(chunks)
+            release(chunks)
+            return chunks
+
+        versioned = self._begin_rebuild(blue_green)
+        if not versioned:
+            self._setup_vector_store()
+        collection = self.vector_store.open_collection()
+
+        print(f"Ingesting {len(chunks)} chunks into {self.vector_store.collection_name}...")
+        batch_size = Config.WEAVIATE_BATCH_SIZE
+        for start in range(0, len(chunks), batch_size):
+            batch = chunks[start:start + batch_size]
+            attach(batch)
+            self.vector_store.write_batch(collection, batch)
+            release(batch)
+            print(f"📈 Ingested {start + len(batch)}/{len(chunks)} chunks")
+        print("✓ Ingestion complete!")
+
+        self._build_chunk_store(chunks)
+
+        if versioned:
+            candidates = [chunk for chunk in chunks if "content_embedding" in vectors[chunk.chunk_id]]
+            sampled = random.sample(candidates, k=min(5, len(candidates)))
+            samples = [(chunk.chunk_id, vectors[chunk.chunk_id]["content_embedding"]) for chunk in sampled]
+            self._validate_and_swap(len(chunks), samples)
+        return chunks
+
+    def _print_run_stats(self):
+        print(f"Embeddings: {self.embedding_stats.summary()}")
+        if self.cache is not None:
+            stats = self.cache.stats()
+            print(f"Cache: enrichment {stats['enrichment']['hits']} hits / {stats['enrichment']['misses']} misses, "
+                  f"embedding {stats['embedding']['hits']} hits / {stats['embedding']['misses']} misses")
     
     def _load_and_consolidate_documents(self):
         """Phase 1: Load and group files by product"""
@@ -107,8 +318,23 @@ class EmbeddingAgent:
     
     def _chunk_all_documents(self) -> List[DocumentChunk]:
         """Phase 2: Chunk all documents using appropriate strategies"""
-        all_chunks = []
-        
+        all_chunks = list(self._iter_chunks())
+        print(f"\nTotal chunks created: {len(all_chunks)}")
+        return all_chunks
+
+    def _iter_chunks(self) -> Iterator[DocumentChunk]:
+        """Chunks of every document, one document at a time, with repeated chunk IDs disambiguated"""
+        occurrences: Dict[str, int] = {}
+        for chunk in self._iter_document_chunks():
+            occurrence = occurrences.get(chunk.chunk_id, 0)
+            occurrences[chunk.chunk_id] = occurrence + 1
+            if occurrence:
+                # Same product, file, section and content as an earlier chunk: distinct, still deterministic ID
+                chunk.chunk_id = make_chunk_id(chunk.product_name.value, chunk.source_file,
+                                               chunk.section_hierarchy, chunk.content_hash, occurrence)
+            yield chunk
+
+    def _iter_document_chunks(self) -> Iterator[DocumentChunk]:
         for product_type, product_docs in self.product_documents.items():
             print(f"\nProcessing {product_type.value} insurance documents...")
             
@@ -122,8 +348,8 @@ class EmbeddingAgent:
                     product_type,
                     policy_name
                 )
-                all_chunks.extend(chunks)
                 print(f"  - Terms document: {len(chunks)} chunks")
+                yield from chunks
             
             # Process FAQs document
             if product_docs.faq_file:
@@ -132,8 +358,8 @@ class EmbeddingAgent:
                     product_type,
                     policy_name
                 )
-                all_chunks.extend(chunks)
                 print(f"  - FAQs document: {len(chunks)} chunks")
+                yield from chunks
             
             # Process Benefits document
             if product_docs.benefits_file:
@@ -142,11 +368,8 @@ class EmbeddingAgent:
                     product_type,
                     policy_name
                 )
-                all_chunks.extend(chunks)
                 print(f"  - Benefits document: {len(chunks)} chunks")
-        
-        print(f"\nTotal chunks created: {len(all_chunks)}")
-        return all_chunks
+                yield from chunks
     
     def _chunk_document(self, 
                        file_path: str, 
@@ -174,47 +397,38 @@ class EmbeddingAgent:
     
     def _enrich_chunks(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
         """Phase 3: Enrich chunks with summaries and hypothetical questions"""
-        print(f"Enriching {len(chunks)} chunks with AI-generated metadata...")
-        print("📊 Progress will be shown for each chunk...")
+        print(f"Enriching {len(chunks)} chunks with AI-generated metadata "
+              f"({self.enricher.concurrency} concurrent, {Config.GENERATION_RPM} RPM / {Config.GENERATION_TPM} TPM)...")
 
-        enriched_chunks = []
+        reported = [0]
 
-        for i, chunk in enumerate(chunks, 1):
-            print(f"🔄 [{i:3d}/{len(chunks)}] Processing: {chunk.product_name} - {chunk.document_type} (ID: {chunk.chunk_id[:8]})", end=" ", flush=True)
+        def report(done: int, total: int, elapsed: float):
+            if done - reported[0] >= 25 or done == total:
+                reported[0] = done
+                rate = done / elapsed if elapsed > 0 else 0.0
+                remaining = (total - done) / rate if rate > 0 else 0.0
+                print(f"📈 Enriched {done}/{total} chunks ({done/total*100:.1f}%, "
+                      f"{rate * 60:.0f} chunks/min, ~{remaining:.0f}s left)")
 
-            try:
-                # Enrich single chunk
-                enriched_batch = self.enricher.enrich_chunks_batch([chunk])
-                if enriched_batch:
-                    enriched_chunks.extend(enriched_batch)
-                    print("✅")
-                else:
-                    print("⚠️  (no enrichment)")
-                    enriched_chunks.append(chunk)  # Keep original if enrichment fails
-
-            except Exception as e:
-                print(f"❌ Error: {str(e)[:50]}...")
-                enriched_chunks.append(chunk)  # Keep original if enrichment fails
-
-            # Show periodic summary
-            if i % 50 == 0:
-                print(f"📈 Milestone: {i}/{len(chunks)} chunks processed ({i/len(chunks)*100:.1f}%)")
+        enriched_chunks = self.enricher.enrich_chunks_concurrently(chunks, on_progress=report)
 
         print(f"✅ Enrichment complete: {len(enriched_chunks)} chunks enriched")
         return enriched_chunks
     
     def _generate_embeddings(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
         """Generate embeddings for all chunks"""
-        print(f"Generating multi-vector embeddings for {len(chunks)} chunks...")
-        print("📊 Progress will be shown for each chunk...")
+        print(f"Generating multi-vector embeddings for {len(chunks)} chunks "
+              f"(batches of {Config.EMBEDDING_BATCH_SIZE} texts)...")
 
         # Generate embeddings using vector store with progress tracking
-        embedded_chunks = self.vector_store.generate_embeddings_with_progress(chunks)
+        embedded_chunks = self.vector_store.generate_embeddings_with_progress(
+            chunks, cache=self.cache, stats=self.embedding_stats
+        )
         
         # Count successful embeddings
-        content_count = sum(1 for c in embedded_chunks if c.content_embedding)
-        summary_count = sum(1 for c in embedded_chunks if c.summary_embedding)
-        question_count = sum(1 for c in embedded_chunks if c.hypothetical_question_embedding)
+        content_count = sum(1 for c in embedded_chunks if c.content_embedding is not None)
+        summary_count = sum(1 for c in embedded_chunks if c.summary_embedding is not None)
+        question_count = sum(1 for c in embedded_chunks if c.hypothetical_question_embedding is not None)
         
         print(f"  - Content embeddings: {content_count}")
         print(f"  - Summary embeddings: {summary_count}")
@@ -232,6 +446,228 @@ class EmbeddingAgent:
         print(f"Ingesting {len(chunks)} chunks into Weaviate...")
         self.vector_store.insert_chunks(chunks)
         print("✓ Ingestion complete!")
+        self._build_chunk_store(chunks)
+
+    def _stream_ingest(self, blue_green: bool = False) -> List[DocumentChunk]:
+        """
+        Chunk, enrich, embed and insert as one streaming pipeline
+
+        Stages are connected by bounded queues, so Weaviate receives its first
+        batch while later documents are still being enriched, and only a few
+        batches of embeddings are in memory at any time: each chunk's vectors
+        are released once it is inserted.
+
+        A rebuild never drops the live collection before its replacement is
+        ready: it is written to a new collection version that the alias is
+        swapped to at the end, keeping COLLECTION_VERSIONS_KEPT earlier versions
+        for rollback. Servers without alias support rebuild in place, dropping
+        the live collection only once the first batch is ready.
+
+        Args:
+            blue_green: Build a new collection version even if the server does not report alias support
+
+        Returns:
+            Ingested chunks, without their embeddings
+        """
+        versioned = self._begin_rebuild(blue_green)
+        target = [self.vector_store.open_collection()] if versioned else []
+
+        print(f"Streaming with {self.enricher.concurrency} enrichment workers, embedding batches of "
+              f"{Config.EMBEDDING_BATCH_SIZE} chunks, insert batches of {Config.WEAVIATE_BATCH_SIZE}, "
+              f"queues of {Config.PIPELINE_QUEUE_SIZE}")
+
+        ingested: List[DocumentChunk] = []
+        samples: List[Tuple[str, np.ndarray]] = []
+        vector_counts = {"content_embedding": 0, "summary_embedding": 0, "hypothetical_question_embedding": 0}
+        started = time.perf_counter()
+
+        def insert(batch: List[DocumentChunk]) -> List[DocumentChunk]:
+            if not target:
+                # In-place rebuild: enrichment and embedding of this batch succeeded, replace the collection now
+                self._setup_vector_store()
+                target.append(self.vector_store.open_collection())
+            self.vector_store.write_batch(target[0], batch)
+            for chunk in batch:
+                # Reservoir sample of chunks whose own vector must find them during validation
+                # (copied, so a kept sample does not hold its whole embed batch's matrix)
+                if chunk.content_embedding is not None:
+                    seen = vector_counts["content_embedding"]
+                    slot = seen if seen < 5 else random.randrange(seen + 1)
+                    if slot < len(samples):
+                        samples[slot] = (chunk.chunk_id, chunk.content_embedding.copy())
+                    elif slot < 5:
+                        samples.append((chunk.chunk_id, chunk.content_embedding.copy()))
+                for name in vector_counts:
+                    if getattr(chunk, name) is not None:
+                        vector_counts[name] += 1
+                    setattr(chunk, name, None)
+
+            done = len(ingested) + len(batch)
+            elapsed = time.perf_counter() - started
+            print(f"📈 Ingested {done} chunks ({done / elapsed * 60:.0f} chunks/min)")
+            return batch
+
+        pipeline = StreamingPipeline([
+            Stage("enrich", self.enricher.enrich_group, workers=self.enricher.concurrency,
+                  batch_size=max(1, Config.ENRICHMENT_BATCH_SIZE)),
+            Stage("embed", lambda batch: self.vector_store.generate_embeddings(
+                      batch, cache=self.cache, stats=self.embedding_stats),
+                  workers=2, batch_size=Config.EMBEDDING_BATCH_SIZE),
+            Stage("insert", insert, batch_size=Config.WEAVIATE_BATCH_SIZE),
+        ], queue_size=Config.PIPELINE_QUEUE_SIZE)
+        stage_stats = pipeline.run(self._iter_chunks(), sink=ingested.append)
+
+        print(f"✓ Streamed {len(ingested)} chunks in {time.perf_counter() - started:.1f}s")
+        for name, stats in stage_stats.items():
+            print(f"  - {name}: {stats['processed']} chunks, {stats['busy_seconds']}s busy")
+        print(f"  - Content embeddings: {vector_counts['content_embedding']}")
+        print(f"  - Summary embeddings: {vector_counts['summary_embedding']}")
+        print(f"  - Question embeddings: {vector_counts['hypothetical_question_embedding']}")
+
+        # The chunk store of a new version must exist before retrieval switches to it
+        self._build_chunk_store(ingested)
+
+        if versioned:
+            self._validate_and_swap(len(ingested), samples)
+        return ingested
+
+    def _begin_rebuild(self, blue_green: bool) -> bool:
+        """
+        Create the collection version a full rebuild writes to, when the server can swap to it
+
+        Returns:
+            True if a new version was created, False if the rebuild must replace the live collection in place
+        """
+        if blue_green or supports_aliases(self.vector_store.client):
+            new_collection = self.vector_store.create_version()
+            print(f"Building collection {new_collection} (live collection stays in service until the swap)...")
+            return True
+        print("⚠️ Weaviate server has no collection aliases; rebuilding the live collection in place")
+        return False
+
+    def _validate_and_swap(self, expected_count: int, samples: List[Tuple[str, np.ndarray]]):
+        """Put a freshly built collection version live once it validates, then prune all but COLLECTION_VERSIONS_KEPT old versions"""
+        new_collection = self.vector_store.collection_name
+        problems = self.vector_store.validate_collection(expected_count, samples)
+        if problems:
+            for problem in problems:
+                print(f"❌ {problem}")
+            raise RuntimeError(f"Validation of {new_collection} failed; alias "
+                               f"{self.vector_store.alias_name} left unchanged")
+
+        previous = self.vector_store.swap_alias()
+        print(f"✓ Alias {self.vector_store.alias_name} now serves {new_collection}"
+              f"{f' (was {previous})' if previous else ''}")
+
+        for name in self.vector_store.prune_versions(Config.COLLECTION_VERSIONS_KEPT):
+            print(f"  - Deleted old collection {name}")
+            shutil.rmtree(os.path.join(Config.CHUNK_STORE_DIR, name), ignore_errors=True)
+
+    def _sync_chunks(self, chunks: List[DocumentChunk]):
+        """Incrementally sync chunks into the existing Weaviate collection"""
+        print(f"Syncing {len(chunks)} chunks into {self.vector_store.collection_name}...")
+        counts = self.vector_store.sync_chunks(chunks)
+        print(f"✓ Sync complete: {counts['inserted']} inserted, {counts['updated']} updated, "
+              f"{counts['deleted']} deleted, {counts['unchanged']} unchanged")
+        self._build_chunk_store(chunks)
+        return counts
+
+    def _build_chunk_store(self, chunks: List[DocumentChunk]):
+        """Write the local chunk store the Retrieval Agent hydrates search hits from"""
+        store_dir = os.path.join(Config.CHUNK_STORE_DIR, self.vector_store.collection_name)
+        print(f"Building local chunk store at {store_dir}...")
+        count = ChunkStore.build(
+            store_dir,
+            (chunk.to_store_record() for chunk in chunks),
+            metadata={
+                "embedding_model": Config.EMBEDDING_MODEL,
+                "embedding_dimensions": Config.EMBEDDING_DIMENSIONS
+            }
+        )
+        print(f"✓ Chunk store built ({count} chunks)")
+
+        self._build_sentence_store(chunks, store_dir)
+        self._build_faq_store(chunks, store_dir)
+
+    def _build_sentence_store(self, chunks: List[DocumentChunk], store_dir: str):
+        """Embed the sentences of long chunks once, for query-time context compression"""
+        # Only chunks the query-time compressor would actually shorten
+        min_sentences = min_compressible_sentences(Config.COMPRESSION_TOP_SENTENCES, Config.COMPRESSION_NEIGHBOURS)
+        split = [(chunk.chunk_id, split_sentences(chunk.content)) for chunk in chunks]
+        split = [(chunk_id, sentences) for chunk_id, sentences in split if len(sentences) >= min_sentences]
+
+        total = sum(len(sentences) for _, sentences in split)
+        print(f"Embedding {total} sentences from {len(split)} long chunks for context compression...")
+
+        chunk_store = ChunkStore(store_dir)
+        index_version = chunk_store.index_version
+        chunk_store.close()
+
+        try:
+            count = SentenceStore.build(store_dir, self._embedded_entries(split), index_version,
+                                        Config.EMBEDDING_DIMENSIONS)
+        except Exception as e:
+            # Compression is optional; the Retrieval Agent sends full chunks without it
+            print(f"⚠️ Sentence embedding failed, context compression disabled: {e}")
+            return
+        print(f"✓ Sentence store built ({count} sentences)")
+
+    def _embedded_entries(self, split: List[Tuple[str, List[str]]]) -> Iterator[Tuple[str, List[str], List[np.ndarray]]]:
+        """
+        (chunk_id, texts, embeddings) per chunk, embedding a few requests' worth of texts at a time
+
+        Keeps the sentence and FAQ store builds at a bounded number of vectors
+        in memory however large the corpus is.
+        """
+        budget = Config.EMBEDDING_BATCH_SIZE * 4
+        group: List[Tuple[str, List[str]]] = []
+        size = 0
+        for chunk_id, texts in split + [(None, [])]:
+            if group and (chunk_id is None or size + len(texts) > budget):
+                embeddings = embed_texts([text[:2048] for _, group_texts in group for text in group_texts],
+                                         cache=self.cache, stats=self.embedding_stats)
+                position = 0
+                for group_id, group_texts in group:
+                    yield group_id, group_texts, embeddings[position:position + len(group_texts)]
+                    position += len(group_texts)
+                group, size = [], 0
+            if chunk_id is not None:
+                group.append((chunk_id, texts))
+                size += len(texts)
+
+    def _build_faq_store(self, chunks: List[DocumentChunk], store_dir: str):
+        """Embed each FAQ's canonical question and its variations, for the FAQ fast path"""
+        faq_chunks = [chunk for chunk in chunks if chunk.document_type == DocumentType.FAQ and chunk.question]
+
+        # A variation shared by several FAQs ("What does the Travel policy cover?") identifies none of them
+        variation_counts: Dict[str, int] = {}
+        for chunk in faq_chunks:
+            for question in set(chunk.hypothetical_questions or []):
+                variation_counts[question] = variation_counts.get(question, 0) + 1
+
+        split = []
+        for chunk in faq_chunks:
+            questions = [chunk.question] + [
+                question for question in dict.fromkeys(chunk.hypothetical_questions or [])
+                if question != chunk.question and variation_counts[question] == 1
+            ]
+            split.append((chunk.chunk_id, questions))
+
+        total = sum(len(questions) for _, questions in split)
+        print(f"Embedding {total} questions from {len(split)} FAQs for the FAQ fast path...")
+
+        chunk_store = ChunkStore(store_dir)
+        index_version = chunk_store.index_version
+        chunk_store.close()
+
+        try:
+            count = FAQQuestionStore.build(store_dir, self._embedded_entries(split), index_version,
+                                           Config.EMBEDDING_DIMENSIONS)
+        except Exception as e:
+            # The fast path is optional; FAQ questions still go through full retrieval without it
+            print(f"⚠️ FAQ question embedding failed, FAQ fast path disabled: {e}")
+            return
+        print(f"✓ FAQ question store built ({count} questions)")
     
     def search(self, query: str, search_type: str = "hybrid", limit: int = 5):
         """
@@ -253,4 +689,6 @@ class EmbeddingAgent:
     
     def close(self):
         """Clean up resources"""
-        self.vector_store.close() 
\ No newline at end of file
+        self.vector_store.close()
+        if self.cache is not None:
+            self.cache.close() 
\ No newline at end of file
@@ -0,0 +1,312 @@
+"""
+Shared Gemini embedding helpers
+
+gemini-embedding-001 is trained with Matryoshka representation learning, so
+its 3072-dimensional output can be truncated to a shorter prefix (e.g. 768 or
+1536) with little loss in retrieval quality. Truncated vectors are no longer
+unit length and must be renormalized before cosine search.
+
+Ingestion (WeaviateVectorStore) and query time (RetrievalAgent) both embed
+through these helpers so every vector in an index has the same dimensionality.
+
+Ingestion vectors are float32 NumPy arrays (rows of one matrix per embed
+request) and become Python lists only when handed to the Weaviate client:
+a 3072-dimensional list of floats takes ~100KB of heap, the array 12KB.
+"""
+
+import math
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+import google.generativeai as genai
+
+from config import Config
+from .enrichment_cache import text_hash
+
+
+# Prefix of the Weaviate collection description that records the embedding size
+INDEX_DIMENSIONS_TAG = "embedding_dimensions="
+
+# Collection aliases (blue/green builds) need Weaviate server 1.32+ and weaviate-client 4.16+
+MIN_ALIAS_SERVER_VERSION = (1, 32, 0)
+
+
+def prepare_embedding(values: Sequence[float], dimensions: int = None) -> np.ndarray:
+    """
+    Truncate an embedding to the configured dimensionality and L2-normalize it
+
+    Args:
+        values: Raw embedding returned by the API
+        dimensions: Target dimensionality (defaults to Config.EMBEDDING_DIMENSIONS)
+
+    Returns:
+        Unit-length float32 embedding with exactly `dimensions` values
+    """
+    return prepare_embeddings([values], dimensions)[0]
+
+
+def prepare_embeddings(rows: Sequence[Sequence[float]], dimensions: int = None) -> np.ndarray:
+    """
+    Truncate and L2-normalize a batch of embeddings in one float32 matrix
+
+    Args:
+        rows: Raw embeddings returned by the API
+        dimensions: Target dimensionality (defaults to Config.EMBEDDING_DIMENSIONS)
+
+    Returns:
+        (len(rows), dimensions) float32 matrix of unit-length rows
+    """
+    dimensions = dimensions or Config.EMBEDDING_DIMENSIONS
+    matrix = np.asarray(rows, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError("Embeddings in a batch must all have the same number of dimensions")
+
+    if matrix.shape[1] < dimensions:
+        raise ValueError(
+            f"Embedding has {matrix.shape[1]} dimensions, fewer than the configured {dimensions}"
+        )
+
+    matrix = np.ascontiguousarray(matrix[:, :dimensions])
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def embed_text(content: str, task_type: Optional[str] = None) -> List[float]:
+    """
+    Embed a single text at the configured output dimensionality
+
+    Args:
+        content: Text to embed
+        task_type: Optional Gemini task type (e.g. "retrieval_query")
+
+    Returns:
+        Normalized embedding of length Config.EMBEDDING_DIMENSIONS
+    """
+    result = genai.embed_content(
+        model=Config.EMBEDDING_MODEL,
+        content=content,
+        task_type=task_type,
+        output_dimensionality=Config.EMBEDDING_DIMENSIONS
+    )
+    # Query vectors go straight to the Weaviate client, which takes lists
+    return prepare_embedding(result['embedding']).tolist()
+
+
+def _embed_batch(contents: List[str], task_type: Optional[str]) -> np.ndarray:
+    result = genai.embed_content(
+        model=Config.EMBEDDING_MODEL,
+        content=contents,
+        task_type=task_type,
+        output_dimensionality=Config.EMBEDDING_DIMENSIONS
+    )
+    embeddings = result['embedding']
+    if len(embeddings) != len(contents):
+        raise ValueError(f"Batch embed returned {len(embeddings)} embeddings for {len(contents)} texts")
+    return prepare_embeddings(embeddings)
+
+
+class EmbeddingStats:
+    """Texts requested vs. embedded over a run, and the API work deduplication and the cache saved"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.texts = 0
+        self.duplicates = 0
+        self.cached = 0
+        self.embedded = 0
+        self.requests = 0
+        self.requests_saved = 0
+
+    def record(self, texts: int, duplicates: int, cached: int, embedded: int, batch_size: int):
+        with self._lock:
+            self.texts += texts
+            self.duplicates += duplicates
+            self.cached += cached
+            self.embedded += embedded
+            self.requests += math.ceil(embedded / batch_size)
+            self.requests_saved += math.ceil(texts / batch_size) - math.ceil(embedded / batch_size)
+
+    def summary(self) -> str:
+        with self._lock:
+            return (f"{self.embedded}/{self.texts} texts sent in {self.requests} requests "
+                    f"({self.duplicates} duplicates shared, {self.cached} from cache; "
+                    f"{self.texts - self.embedded} texts and {self.requests_saved} requests saved)")
+
+
+def embed_texts_partial(contents: List[str], task_type: Optional[str] = None,
+                        batch_size: int = None, max_retries: int = None,
+                        on_batch: Optional[Callable[[int, int], None]] = None,
+                        cache=None, stats: Optional[EmbeddingStats] = None) -> List[Optional[np.ndarray]]:
+    """
+    Embed many texts with one API call per batch, retrying only what failed
+
+    Identical texts are embedded once and share one vector (an FAQ's summary
+    is its question, a short benefit line's summary is its content), and
+    texts found in the cache are not sent at all. A failed batch is retried
+    with exponential backoff; if it still fails, its texts are embedded one
+    at a time so a single bad text cannot cost the rest of the batch. Texts
+    that fail on their own come back as None.
+
+    Args:
+        contents: Texts to embed
+        task_type: Optional Gemini task type (e.g. "retrieval_document")
+        batch_size: Texts per request (defaults to Config.EMBEDDING_BATCH_SIZE)
+        max_retries: Retries per failed batch (defaults to Config.EMBEDDING_MAX_RETRIES)
+        on_batch: Called with (texts done, total texts to send) after each batch
+        cache: Optional EnrichmentCache; cached texts are not sent and new embeddings are stored
+        stats: Optional EmbeddingStats the texts sent and saved are added to
+
+    Returns:
+        Normalized float32 embeddings in the same order as contents (None where embedding
+        failed); rows of one request share that request's matrix, duplicate texts one row
+    """
+    batch_size = batch_size or Config.EMBEDDING_BATCH_SIZE
+    hashes = [text_hash(content) for content in contents]
+    texts: Dict[str, str] = {}
+    for hash_value, content in zip(hashes, contents):
+        texts.setdefault(hash_value, content)
+
+    cached = cache.get_embeddings(list(texts), Config.EMBEDDING_MODEL, Config.EMBEDDING_DIMENSIONS) \
+        if cache is not None else {}
+    missing = [hash_value for hash_value in texts if hash_value not in cached]
+    if cached:
+        print(f"♻️ Embedding cache: {len(texts) - len(missing)}/{len(texts)} distinct texts already embedded")
+    duplicates = len(contents) - len(texts)
+    if duplicates:
+        print(f"♻️ {duplicates} duplicate texts share an embedding")
+
+    new_embeddings = _embed_uncached([texts[hash_value] for hash_value in missing], task_type,
+                                     batch_size, max_retries, on_batch) if missing else []
+    if cache is not None:
+        cache.put_embeddings(
+            [(hash_value, embedding) for hash_value, embedding in zip(missing, new_embeddings)
+             if embedding is not None],
+            Config.EMBEDDING_MODEL, Config.EMBEDDING_DIMENSIONS
+        )
+    if stats is not None:
+        stats.record(len(contents), duplicates, len(texts) - len(missing), len(missing), batch_size)
+
+    vectors = {**cached, **dict(zip(missing, new_embeddings))}
+    return [vectors[hash_value] for hash_value in hashes]
+
+
+def _embed_uncached(contents: List[str], task_type: Optional[str], batch_size: int,
+                    max_retries: Optional[int], on_batch) -> List[Optional[np.ndarray]]:
+    max_retries = Config.EMBEDDING_MAX_RETRIES if max_retries is None else max_retries
+    embeddings: List[Optional[np.ndarray]] = [None] * len(contents)
+
+    for start in range(0, len(contents), batch_size):
+        batch = contents[start:start + batch_size]
+        for attempt in range(max_retries + 1):
+            try:
+                embeddings[start:start + len(batch)] = list(_embed_batch(batch, task_type))
+                break
+            except Exception as e:
+                if attempt < max_retries:
+                    delay = 2 ** attempt
+                    print(f"⚠️ Embed batch at {start} failed ({str(e)[:80]}), retrying in {delay}s...")
+                    time.sleep(delay)
+                    continue
+                print(f"⚠️ Embed batch at {start} failed {max_retries + 1} times, embedding its {len(batch)} texts one by one")
+                for offset, text in enumerate(batch):
+                    try:
+                        embeddings[start + offset] = _embed_batch([text], task_type)[0]
+                    except Exception as item_error:
+                        print(f"❌ Embedding text {start + offset} failed: {str(item_error)[:80]}")
+
+        if on_batch:
+            on_batch(min(start + batch_size, len(contents)), len(contents))
+
+    return embeddings
+
+
+def embed_texts(contents: List[str], task_type: Optional[str] = None,
+                batch_size: int = None, cache=None, stats: Optional[EmbeddingStats] = None) -> List[np.ndarray]:
+    """
+    Embed many texts with one API call per batch
+
+    Args:
+        contents: Texts to embed
+        task_type: Optional Gemini task type (e.g. "retrieval_document")
+        batch_size: Texts per request (defaults to Config.EMBEDDING_BATCH_SIZE)
+        cache: Optional EnrichmentCache of earlier embeddings
+        stats: Optional EmbeddingStats the texts sent and saved are added to
+
+    Returns:
+        Normalized float32 embeddings in the same order as contents
+    """
+    embeddings = embed_texts_partial(contents, task_type, batch_size, cache=cache, stats=stats)
+    failed = sum(1 for embedding in embeddings if embedding is None)
+    if failed:
+        raise RuntimeError(f"{failed} of {len(contents)} texts could not be embedded")
+    return embeddings
+
+
+def supports_aliases(client) -> bool:
+    """Whether the connected Weaviate server is recent enough for collection aliases"""
+    try:
+        version = client.get_meta().get("version", "")
+    except Exception as e:
+        print(f"⚠️ Could not read the Weaviate server version: {e}")
+        return False
+    parts = [int(part) for part in re.findall(r"\d+", version)[:3]]
+    return bool(parts) and tuple(parts) >= MIN_ALIAS_SERVER_VERSION
+
+
+def resolve_collection(client, name: str, current: Optional[str] = None) -> str:
+    """
+    Collection an alias points to, or the name itself when it is not an alias
+
+    Args:
+        client: Connected Weaviate client
+        name: Alias or collection name
+        current: Collection in use; kept when the lookup fails, so a transient
+                 error is not mistaken for an alias swap
+
+    Returns:
+        Name of the physical collection
+    """
+    try:
+        alias = client.alias.get(alias_name=name)
+    except Exception as e:
+        fallback = current or name
+        print(f"⚠️ Could not resolve alias {name}, keeping {fallback}: {e}")
+        return fallback
+    return alias.collection if alias is not None else name
+
+
+def format_index_description(dimensions: int) -> str:
+    """Collection description recording the embedding size the index was built with"""
+    return f"{INDEX_DIMENSIONS_TAG}{dimensions}"
+
+
+def parse_index_dimensions(description: Optional[str]) -> Optional[int]:
+    """Read the embedding size recorded in a collection description, if any"""
+    if description and description.startswith(INDEX_DIMENSIONS_TAG):
+        try:
+            return int(description[len(INDEX_DIMENSIONS_TAG):])
+        except ValueError:
+            return None
+    return None
+
+
+def validate_index_dimensions(index_dimensions: Optional[int], source: str):
+    """
+    Reject an index built at a different dimensionality than the current config
+
+    Args:
+        index_dimensions: Dimensionality recorded when the index was built (None if unknown)
+        source: Where the recorded value came from, for the error message
+    """
+    if index_dimensions is None:
+        return
+
+    if int(index_dimensions) != Config.EMBEDDING_DIMENSIONS:
+        raise ValueError(
+            f"Index was built with {index_dimensions}-dimensional embeddings ({source}) but "
+            f"EMBEDDING_DIMENSIONS is {Config.EMBEDDING_DIMENSIONS}. Re-run the embedding "
+            f"pipeline or set EMBEDDING_DIMENSIONS={index_dimensions}."
+        )
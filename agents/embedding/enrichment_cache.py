@@ -0,0 +1,123 @@
+"""
+Persistent enrichment and embedding cache
+
+Summaries, hypothetical questions and embeddings only change when the text
+they were generated from, the prompt or the model changes. This SQLite cache
+keeps them keyed on exactly that, so re-running ingestion over an unchanged
+corpus reuses every result instead of calling Gemini again:
+
+- enrichments: (input hash, prompt version, generation model) -> summary, questions
+- embeddings:  (text hash, embedding model, dimensions) -> float32 vector
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 hex digest of a text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EnrichmentCache:
+    """Thread-safe SQLite store of enrichment and embedding results"""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path: SQLite file path; parent directories are created
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS enrichments ("
+            " input_hash TEXT, prompt_version TEXT, model TEXT,"
+            " summary TEXT, questions TEXT,"
+            " PRIMARY KEY (input_hash, prompt_version, model))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " text_hash TEXT, model TEXT, dimensions INTEGER, vector BLOB,"
+            " PRIMARY KEY (text_hash, model, dimensions))"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+        self.hits = {"enrichment": 0, "embedding": 0}
+        self.misses = {"enrichment": 0, "embedding": 0}
+
+    def get_enrichment(self, input_hash: str, prompt_version: str, model: str) -> Optional[Tuple[str, List[str]]]:
+        """Cached (summary, hypothetical questions), or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, questions FROM enrichments WHERE input_hash=? AND prompt_version=? AND model=?",
+                (input_hash, prompt_version, model)
+            ).fetchone()
+            self._count("enrichment", row is not None)
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def put_enrichment(self, input_hash: str, prompt_version: str, model: str,
+                       summary: str, questions: List[str]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO enrichments VALUES (?, ?, ?, ?, ?)",
+                (input_hash, prompt_version, model, summary, json.dumps(questions))
+            )
+            self._conn.commit()
+
+    def get_embeddings(self, hashes: Sequence[str], model: str, dimensions: int) -> Dict[str, np.ndarray]:
+        """Cached float32 vectors for the given text hashes (missing hashes are left out)"""
+        found: Dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model=? AND dimensions=? "
+                    f"AND text_hash IN ({','.join('?' * len(batch))})",
+                    (model, dimensions, *batch)
+                ).fetchall()
+                for hash_value, blob in rows:
+                    found[hash_value] = np.frombuffer(blob, dtype=np.float32)
+            self.hits["embedding"] += len(found)
+            self.misses["embedding"] += len(unique) - len(found)
+        return found
+
+    def put_embeddings(self, items: Sequence[Tuple[str, np.ndarray]], model: str, dimensions: int):
+        """Store (text hash, vector) pairs"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                [(hash_value, model, dimensions, np.asarray(vector, dtype=np.float32).tobytes())
+                 for hash_value, vector in items]
+            )
+            self._conn.commit()
+
+    def _count(self, kind: str, hit: bool):
+        if hit:
+            self.hits[kind] += 1
+        else:
+            self.misses[kind] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {kind: {"hits": self.hits[kind], "misses": self.misses[kind]} for kind in self.hits}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
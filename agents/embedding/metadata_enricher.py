@@ -2,29 +2,230 @@
 Metadata enrichment using LLMs for summaries and hypothetical questions
 """
 
-from typing import List, Optional
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 import google.generativeai as genai
 from .models import DocumentChunk, DocumentType
+from .rate_limiter import RateLimiter, call_with_backoff
+from .enrichment_cache import EnrichmentCache
 from config import Config
 
+# Bump whenever a summary or question prompt changes, so cached enrichments are regenerated
+ENRICHMENT_PROMPT_VERSION = "1"
+MULTI_ENRICHMENT_PROMPT_VERSION = "multi-1"
+
+# Output tokens reserved per generation call when estimating TPM usage
+ESTIMATED_OUTPUT_TOKENS = 200
+
 
 class MetadataEnricher:
     """Enriches chunks with AI-generated metadata"""
     
-    def __init__(self, gemini_api_key: str):
-        """Initialize with Gemini API"""
+    def __init__(self, gemini_api_key: str, concurrency: int = None, rate_limiter: RateLimiter = None,
+                 cache: Optional[EnrichmentCache] = None):
+        """
+        Initialize with Gemini API
+
+        Args:
+            gemini_api_key: API key for Gemini
+            concurrency: Chunks enriched at once (defaults to Config.ENRICHMENT_CONCURRENCY)
+            rate_limiter: Shared quota limiter (defaults to GENERATION_RPM / GENERATION_TPM)
+            cache: Optional persistent cache of earlier enrichments
+        """
         genai.configure(api_key=gemini_api_key)
         self.model = genai.GenerativeModel(Config.GENERATION_MODEL)
+        self.concurrency = max(1, concurrency or Config.ENRICHMENT_CONCURRENCY)
+        self.rate_limiter = rate_limiter or RateLimiter(Config.GENERATION_RPM, Config.GENERATION_TPM)
+        self.cache = cache
+
+        # Chunks that got a fallback summary or questions; their results are not cached
+        self._fallback_ids = set()
+
+        # Runs each chunk's question call next to its summary call
+        self._call_executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                                 thread_name_prefix="enrich-call")
     
     def enrich_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
-        """Enrich a single chunk with summary and hypothetical questions"""
+        """Enrich a single chunk with summary and hypothetical questions (generated in parallel)"""
+        cache_key = (chunk.enrichment_input_hash, ENRICHMENT_PROMPT_VERSION, Config.GENERATION_MODEL)
+        if self.cache is not None:
+            cached = self.cache.get_enrichment(*cache_key)
+            if cached is not None:
+                chunk.summary, chunk.hypothetical_questions = cached
+                return chunk
+
+        questions = self._call_executor.submit(self._generate_hypothetical_questions, chunk)
+
         # Generate summary
-        chunk.summary = self._generate_summary(chunk)
-        
-        # Generate hypothetical questions
-        chunk.hypothetical_questions = self._generate_hypothetical_questions(chunk)
+        summary = self._generate_summary(chunk)
+
+        chunk.summary = summary
+        chunk.hypothetical_questions = questions.result()
+
+        if self.cache is not None and chunk.chunk_id not in self._fallback_ids:
+            self.cache.put_enrichment(*cache_key, chunk.summary, chunk.hypothetical_questions)
         
         return chunk
+
+    def enrich_chunks_concurrently(self, chunks: List[DocumentChunk],
+                                   on_progress: Optional[Callable[[int, int, float], None]] = None) -> List[DocumentChunk]:
+        """
+        Enrich many chunks concurrently within the generation quota
+
+        Args:
+            chunks: Chunks to enrich
+            on_progress: Called with (chunks done, total, elapsed seconds) as groups of chunks finish
+
+        Returns:
+            Chunks in input order; a chunk whose enrichment fails is returned unenriched
+        """
+        started = time.perf_counter()
+        done = 0
+
+        group_size = max(1, Config.ENRICHMENT_BATCH_SIZE)
+        groups = [chunks[i:i + group_size] for i in range(0, len(chunks), group_size)]
+
+        enriched_chunks = []
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="enrich") as executor:
+            for enriched_group in executor.map(self.enrich_group, groups):
+                enriched_chunks.extend(enriched_group)
+                done += len(enriched_group)
+                if on_progress:
+                    on_progress(done, len(chunks), time.perf_counter() - started)
+
+        return enriched_chunks
+
+    def enrich_group(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
+        """Enrich a group of chunks: one JSON prompt when ENRICHMENT_BATCH_SIZE > 1, else one prompt pair per chunk"""
+        if Config.ENRICHMENT_BATCH_SIZE > 1:
+            try:
+                return self.enrich_chunks_multi(chunks)
+            except Exception as e:
+                print(f"Error enriching {len(chunks)} chunks together, enriching them one by one: {e}")
+        return self.enrich_chunks_batch(chunks)
+
+    def enrich_chunks_multi(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
+        """
+        Enrich chunks with one JSON generation call per group of chunks
+
+        Chunks that need the LLM (everything except FAQ entries) are packed
+        into a single prompt asking for a JSON array of {chunk_index, summary,
+        questions}. Each returned item is validated; only chunks whose item is
+        missing or malformed are asked again, and chunks still without a valid
+        item after ENRICHMENT_JSON_RETRIES go through the per-chunk prompts.
+
+        Args:
+            chunks: Chunks to enrich (typically ENRICHMENT_BATCH_SIZE of them)
+
+        Returns:
+            The same chunks, enriched
+        """
+        pending = []
+        for chunk in chunks:
+            cache_key = (chunk.enrichment_input_hash, MULTI_ENRICHMENT_PROMPT_VERSION, Config.GENERATION_MODEL)
+            cached = self.cache.get_enrichment(*cache_key) if self.cache is not None else None
+            if cached is not None:
+                chunk.summary, chunk.hypothetical_questions = cached
+            elif chunk.document_type == DocumentType.FAQ and chunk.question:
+                # FAQ enrichment is derived from the question without the LLM
+                self.enrich_chunks_batch([chunk])
+            else:
+                pending.append(chunk)
+
+        for attempt in range(Config.ENRICHMENT_JSON_RETRIES + 1):
+            if not pending:
+                break
+            try:
+                items = self._generate_multi(pending)
+            except Exception as e:
+                print(f"Error generating enrichment for {len(pending)} chunks: {e}")
+                break
+
+            malformed = []
+            for index, chunk in enumerate(pending):
+                item = items.get(index)
+                if item is None:
+                    malformed.append(chunk)
+                    continue
+                chunk.summary = self._local_summary(chunk) or item["summary"]
+                chunk.hypothetical_questions = item["questions"]
+                if self.cache is not None:
+                    self.cache.put_enrichment(chunk.enrichment_input_hash, MULTI_ENRICHMENT_PROMPT_VERSION,
+                                              Config.GENERATION_MODEL, chunk.summary, chunk.hypothetical_questions)
+            if malformed and attempt < Config.ENRICHMENT_JSON_RETRIES:
+                print(f"⚠️ {len(malformed)}/{len(pending)} enrichment items missing or malformed, re-requesting them")
+            pending = malformed
+
+        if pending:
+            print(f"⚠️ Falling back to per-chunk enrichment for {len(pending)} chunks")
+            self.enrich_chunks_batch(pending)
+
+        return chunks
+
+    def _create_multi_chunk_prompt(self, chunks: List[DocumentChunk]) -> str:
+        sections = []
+        for index, chunk in enumerate(chunks):
+            hierarchy = " > ".join(chunk.section_hierarchy) if chunk.section_hierarchy else "General"
+            sections.append(f"""[{index}] {chunk.product_name.value} {chunk.document_type.value} - {hierarchy}
+{chunk.content[:1000]}""")
+
+        return f"""For each numbered insurance document excerpt below, write:
+- summary: one sentence describing what specific aspect of coverage or rule the excerpt covers
+- questions: 3-5 natural questions a customer might ask that the excerpt answers (coverage amounts, eligibility, exclusions, claims, procedures)
+
+Return only a JSON array with one object per excerpt:
+[{{"chunk_index": 0, "summary": "...", "questions": ["...?", "...?", "...?"]}}]
+
+Excerpts:
+
+""" + "\n\n".join(sections)
+
+    def _generate_multi(self, chunks: List[DocumentChunk]) -> Dict[int, Dict]:
+        """Valid {summary, questions} items of one multi-chunk call, by chunk index"""
+        response_text = self._generate(
+            self._create_multi_chunk_prompt(chunks),
+            expected_output_tokens=ESTIMATED_OUTPUT_TOKENS * len(chunks),
+            json_output=True
+        )
+        try:
+            data = json.loads(response_text)
+        except json.JSONDecodeError:
+            return {}
+        if isinstance(data, dict):
+            data = data.get("items") or data.get("chunks") or []
+        if not isinstance(data, list):
+            return {}
+
+        items = {}
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("chunk_index")
+            summary = item.get("summary")
+            questions = item.get("questions")
+            if not isinstance(index, int) or not 0 <= index < len(chunks) or index in items:
+                continue
+            if not isinstance(summary, str) or not summary.strip() or not isinstance(questions, list):
+                continue
+            questions = [question.strip() for question in questions
+                         if isinstance(question, str) and '?' in question]
+            if not questions:
+                continue
+            items[index] = {"summary": summary.strip(), "questions": questions[:5]}
+        return items
+
+    def _generate(self, prompt: str, expected_output_tokens: int = ESTIMATED_OUTPUT_TOKENS,
+                  json_output: bool = False) -> str:
+        """One rate-limited generation call, retried with backoff on 429/5xx"""
+        generation_config = {"response_mime_type": "application/json"} if json_output else None
+
+        def call() -> str:
+            self.rate_limiter.acquire(len(prompt) // 4 + expected_output_tokens)
+            return self.model.generate_content(prompt, generation_config=generation_config).text
+
+        return call_with_backoff(call, max_retries=Config.ENRICHMENT_MAX_RETRIES)
     
     def enrich_chunks_batch(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
         """Enrich multiple chunks"""
@@ -42,6 +243,31 @@ class MetadataEnricher:
     
     def _generate_summary(self, chunk: DocumentChunk) -> str:
         """Generate a concise summary for the chunk"""
+        summary = self._local_summary(chunk)
+        if summary is not None:
+            return summary
+        
+        # For Terms chunks and long content, use LLM to generate summary
+        try:
+            prompt = f"""Generate a one-sentence summary of this insurance policy content. 
+Focus on what specific aspect of coverage or rule this section describes.
+
+Content: {chunk.content[:1000]}...
+
+Summary:"""
+            
+            return self._generate(prompt).strip()
+        except Exception as e:
+            print(f"Error generating summary: {e}")
+            self._fallback_ids.add(chunk.chunk_id)
+            # Fallback: use first sentence or first 100 chars
+            sentences = chunk.content.split('.')
+            if sentences:
+                return sentences[0].strip() + '.'
+            return chunk.content[:100] + '...'
+
+    def _local_summary(self, chunk: DocumentChunk) -> Optional[str]:
+        """Summary taken from the chunk itself, or None when it needs the LLM"""
         # For FAQ chunks, the question itself is the perfect summary
         if chunk.document_type == DocumentType.FAQ and chunk.question:
             return chunk.question
@@ -61,25 +287,8 @@ class MetadataEnricher:
             # Otherwise, create a short summary
             if len(chunk.content) < 100:
                 return chunk.content
-        
-        # For Terms chunks and long content, use LLM to generate summary
-        try:
-            prompt = f"""Generate a one-sentence summary of this insurance policy content. 
-Focus on what specific aspect of coverage or rule this section describes.
-
-Content: {chunk.content[:1000]}...
 
-Summary:"""
-            
-            response = self.model.generate_content(prompt)
-            return response.text.strip()
-        except Exception as e:
-            print(f"Error generating summary: {e}")
-            # Fallback: use first sentence or first 100 chars
-            sentences = chunk.content.split('.')
-            if sentences:
-                return sentences[0].strip() + '.'
-            return chunk.content[:100] + '...'
+        return None
     
     def _generate_hypothetical_questions(self, chunk: DocumentChunk) -> List[str]:
         """Generate potential questions that this chunk answers"""
@@ -91,11 +300,11 @@ Summary:"""
         # For other chunks, generate questions using LLM
         try:
             prompt = self._create_question_generation_prompt(chunk)
-            response = self.model.generate_content(prompt)
+            response_text = self._generate(prompt)
             
             # Parse questions from response
             questions = []
-            for line in response.text.strip().split('\n'):
+            for line in response_text.strip().split('\n'):
                 line = line.strip()
                 if line and (line[0].isdigit() or line.startswith('-')):
                     # Remove numbering or bullets
@@ -107,6 +316,7 @@ Summary:"""
             
         except Exception as e:
             print(f"Error generating questions: {e}")
+            self._fallback_ids.add(chunk.chunk_id)
             return self._generate_fallback_questions(chunk)
     
     def _create_question_generation_prompt(self, chunk: DocumentChunk) -> str:
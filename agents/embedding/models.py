@@ -5,8 +5,39 @@ Data models for the Embedding Agent
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass, field
 from enum import Enum
+import hashlib
+import json
 import uuid
 
+import numpy as np
+
+from config import Config
+
+
+# Namespace of the deterministic (uuid5) chunk IDs
+CHUNK_ID_NAMESPACE = uuid.UUID("6f1d8f0e-3c55-5b7a-9a43-2b8f6c4e1d27")
+
+
+def make_chunk_id(product: str, source_file: str, section_hierarchy: List[str],
+                  content_hash: str, occurrence: int = 0) -> str:
+    """
+    Deterministic chunk ID from where the chunk comes from and what it says
+
+    Args:
+        product: Product name
+        source_file: Source file name
+        section_hierarchy: Section path of the chunk
+        content_hash: SHA-256 of the chunk content
+        occurrence: Index among chunks with the same product, file, section and content
+
+    Returns:
+        uuid5 string, stable across ingestion runs for unchanged chunks
+    """
+    name = "\x1f".join([product, source_file, " > ".join(section_hierarchy), content_hash])
+    if occurrence:
+        name += f"\x1f{occurrence}"
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, name))
+
 
 class DocumentType(Enum):
     """Types of insurance documents"""
@@ -43,16 +74,45 @@ class DocumentChunk:
     question: Optional[str] = None
     is_table_data: bool = False
     
-    # Generated fields
-    chunk_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    # Generated fields (chunk_id defaults to the deterministic ID, see make_chunk_id)
+    chunk_id: Optional[str] = None
     summary: Optional[str] = None
     hypothetical_questions: List[str] = field(default_factory=list)
     
-    # Embeddings (will be populated during processing)
-    content_embedding: Optional[List[float]] = None
-    summary_embedding: Optional[List[float]] = None
-    hypothetical_question_embedding: Optional[List[float]] = None
+    # Embeddings (float32 arrays, populated during processing)
+    content_embedding: Optional[np.ndarray] = None
+    summary_embedding: Optional[np.ndarray] = None
+    hypothetical_question_embedding: Optional[np.ndarray] = None
     
+    def __post_init__(self):
+        if self.chunk_id is None:
+            self.chunk_id = make_chunk_id(self.product_name.value, self.source_file,
+                                          self.section_hierarchy, self.content_hash)
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the chunk content"""
+        return hashlib.sha256(self.content.encode('utf-8')).hexdigest()
+
+    @property
+    def enrichment_input_hash(self) -> str:
+        """SHA-256 of everything the enrichment prompts read from the chunk"""
+        parts = [self.product_name.value, self.document_type.value, " > ".join(self.section_hierarchy),
+                 self.question or "", self.content]
+        return hashlib.sha256("\x1f".join(parts).encode('utf-8')).hexdigest()
+
+    @property
+    def record_hash(self) -> str:
+        """
+        SHA-256 of everything written to the index for this chunk
+
+        Covers the stored properties and the embedding model and size, so an
+        incremental sync re-writes the object when any of them changes.
+        """
+        payload = json.dumps(self.to_weaviate_object(), sort_keys=True, ensure_ascii=False)
+        payload += f"\x1f{Config.EMBEDDING_MODEL}\x1f{Config.EMBEDDING_DIMENSIONS}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
     def to_weaviate_object(self) -> Dict[str, Any]:
         """Convert to Weaviate-compatible object"""
         return {
@@ -70,6 +130,37 @@ class DocumentChunk:
             "hypothetical_questions": " ".join(self.hypothetical_questions) if self.hypothetical_questions else ""
         }
 
+    def to_artifact_record(self) -> Dict[str, Any]:
+        """Everything but the embeddings, for staged ingestion artifacts"""
+        return {
+            "product_name": self.product_name.value,
+            "policy_name": self.policy_name,
+            "document_type": self.document_type.value,
+            "source_file": self.source_file,
+            "content": self.content,
+            "section_hierarchy": self.section_hierarchy,
+            "question": self.question,
+            "is_table_data": self.is_table_data,
+            "chunk_id": self.chunk_id,
+            "summary": self.summary,
+            "hypothetical_questions": self.hypothetical_questions
+        }
+
+    @classmethod
+    def from_artifact_record(cls, record: Dict[str, Any]) -> "DocumentChunk":
+        return cls(**{
+            **record,
+            "product_name": ProductType(record["product_name"]),
+            "document_type": DocumentType(record["document_type"])
+        })
+
+    def to_store_record(self) -> Dict[str, Any]:
+        """Convert to the record kept in the local chunk store for result hydration"""
+        record = self.to_weaviate_object()
+        # Only needed for vectorization, never read back by retrieval
+        record.pop("hypothetical_questions")
+        return record
+
 
 @dataclass
 class ProductDocuments:
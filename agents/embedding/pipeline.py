@@ -0,0 +1,163 @@
+"""
+Streaming stages connected by bounded queues
+
+Each stage runs in its own worker threads, reads items from a bounded input
+queue (in batches when the stage asks for them) and puts its outputs on the
+next stage's queue. A full queue blocks the stage feeding it, so at most a
+few queues' worth of items are in flight however large the input is, and
+every stage works at the same time as the others.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Marks the end of a stage's input
+_END = object()
+
+
+@dataclass
+class Stage:
+    """One pipeline stage"""
+    name: str
+    process: Callable[[List[Any]], Iterable[Any]]   # Batch of inputs -> outputs
+    workers: int = 1
+    batch_size: int = 1
+    processed: int = 0
+    busy_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class StreamingPipeline:
+    """Runs items from a source through stages concurrently with bounded memory"""
+
+    def __init__(self, stages: List[Stage], queue_size: int = 64):
+        """
+        Args:
+            stages: Stages in order; the last stage's outputs go to the sink
+            queue_size: Capacity of each queue between stages (in items)
+        """
+        self.stages = stages
+        self.queue_size = queue_size
+        self._stop = threading.Event()
+        self._errors: List[BaseException] = []
+
+    def run(self, source: Iterable[Any], sink: Optional[Callable[[Any], None]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Feed the source through every stage
+
+        Args:
+            source: Items for the first stage (consumed lazily)
+            sink: Called from the last stage's thread with each final output
+
+        Returns:
+            Per-stage items processed and busy seconds
+
+        Raises:
+            The first exception raised by any stage; the other stages stop early
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = []
+        for index, stage in enumerate(self.stages):
+            output = queues[index + 1] if index + 1 < len(queues) else None
+            remaining = [stage.workers]
+            for worker in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[index], output, sink, remaining,
+                          self.stages[index + 1].workers if output is not None else 0),
+                    name=f"{stage.name}-{worker}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        try:
+            for item in source:
+                if not self._put(queues[0], item):
+                    break
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            for _ in range(self.stages[0].workers):
+                self._put(queues[0], _END, force=True)
+
+        for thread in threads:
+            thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+        return {stage.name: {"processed": stage.processed, "busy_seconds": round(stage.busy_seconds, 2)}
+                for stage in self.stages}
+
+    def _work(self, stage: Stage, inbox: queue.Queue, outbox: Optional[queue.Queue],
+              sink: Optional[Callable[[Any], None]], remaining: List[int], downstream_workers: int):
+        try:
+            finished = False
+            while not finished and not self._stop.is_set():
+                batch = []
+                while len(batch) < stage.batch_size:
+                    item = self._get(inbox)
+                    if item is _END:
+                        finished = True
+                        break
+                    if item is None:          # Stopped while waiting
+                        return
+                    batch.append(item)
+                if not batch:
+                    continue
+
+                started = time.perf_counter()
+                outputs = list(stage.process(batch))
+                with stage._lock:
+                    stage.processed += len(batch)
+                    stage.busy_seconds += time.perf_counter() - started
+
+                for output in outputs:
+                    if outbox is not None:
+                        if not self._put(outbox, output):
+                            return
+                    elif sink is not None:
+                        sink(output)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            # The last worker of a stage to finish ends the next stage's input
+            with stage._lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last and outbox is not None:
+                for _ in range(downstream_workers):
+                    self._put(outbox, _END, force=True)
+
+    def _fail(self, error: BaseException):
+        self._errors.append(error)
+        self._stop.set()
+
+    def _put(self, target: queue.Queue, item: Any, force: bool = False) -> bool:
+        """Put without blocking forever once the pipeline has stopped"""
+        while True:
+            if self._stop.is_set() and not force:
+                return False
+            try:
+                target.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                if force and self._stop.is_set():
+                    # Nobody drains a stopped pipeline; make room for the end marker
+                    try:
+                        target.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def _get(self, source: queue.Queue) -> Any:
+        """Next item, or None once the pipeline has stopped"""
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=0.2)
+            except queue.Empty:
+                continue
+        return None
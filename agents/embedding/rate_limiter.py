@@ -0,0 +1,115 @@
+"""
+Rate limiting and retry for Gemini generation calls during ingestion
+
+Enrichment runs many generation calls concurrently. A token bucket per quota
+(requests per minute and tokens per minute) keeps the combined call rate
+inside the project's Gemini quota, and calls rejected anyway (429) or failed
+by the service (5xx) are retried with jittered exponential backoff so that
+concurrent workers do not retry in lockstep.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, TypeVar
+
+from google.api_core import exceptions as google_exceptions
+
+T = TypeVar("T")
+
+# HTTP status codes worth retrying: quota exceeded and transient server errors
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+# The same failures as google.api_core exceptions and gRPC status codes
+RETRYABLE_ERRORS = (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests,
+                    google_exceptions.InternalServerError, google_exceptions.BadGateway,
+                    google_exceptions.ServiceUnavailable, google_exceptions.GatewayTimeout,
+                    google_exceptions.DeadlineExceeded, TimeoutError)
+RETRYABLE_GRPC_STATUS = ("RESOURCE_EXHAUSTED", "INTERNAL", "UNAVAILABLE", "DEADLINE_EXCEEDED")
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, per_minute: float, capacity: float = None):
+        """
+        Args:
+            per_minute: Tokens added per minute
+            capacity: Largest burst (defaults to one minute's worth)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0):
+        """Block until `amount` tokens are available and take them"""
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one model"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def acquire(self, estimated_tokens: int):
+        """Wait for one request slot and the request's estimated tokens"""
+        self.requests.acquire(1)
+        self.tokens.acquire(estimated_tokens)
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether an API error is a quota rejection or transient server failure
+
+    Decided by the exception type or its status code only; the message can
+    contain unrelated numbers (IDs, sizes, token counts) that look like one.
+    """
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    code = getattr(error, "code", None)
+    if callable(code):
+        # grpc.RpcError exposes its StatusCode through a method
+        try:
+            code = code()
+        except Exception:
+            return False
+    if isinstance(code, int):
+        return int(code) in RETRYABLE_STATUS
+    return getattr(code, "name", None) in RETRYABLE_GRPC_STATUS
+
+
+def call_with_backoff(call: Callable[[], T], max_retries: int = 5,
+                      base_delay: float = 1.0, max_delay: float = 60.0) -> T:
+    """
+    Call and retry on 429/5xx with full-jitter exponential backoff
+
+    Args:
+        call: Function making one API call
+        max_retries: Retries after the first attempt
+        base_delay: Delay cap of the first retry in seconds (doubles per retry)
+        max_delay: Largest delay cap in seconds
+
+    Returns:
+        The call's result; the last error is raised once retries are exhausted
+        or immediately when the error is not retryable
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return call()
+        except Exception as e:
+            if attempt == max_retries or not is_retryable(e):
+                raise
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
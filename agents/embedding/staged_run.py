@@ -0,0 +1,239 @@
+"""
+Checkpointed ingestion runs
+
+A staged run writes the output of every pipeline stage under
+INGEST_RUNS_DIR/<run_id>/ so a run that dies part-way can be restarted with
+the same run ID and continue where it stopped, and single stages can be
+re-run from the previous stage's output:
+
+- chunks.jsonl     chunk stage: one chunk per line, without enrichment
+- enriched.jsonl   enrich stage: chunks with summary and questions, appended as they finish
+- embeddings/      embed stage: index.jsonl (chunk_id and vectors present, one line per row)
+                   plus one raw float32 file per vector type, row-aligned with the index
+- checkpoint.json  completed stages and the settings the artifacts were built with
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+import numpy as np
+
+from .models import DocumentChunk
+
+STAGES = ["chunk", "enrich", "embed", "insert"]
+VECTOR_NAMES = ["content_embedding", "summary_embedding", "hypothetical_question_embedding"]
+
+
+def new_run_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _truncate_partial_line(path: Path):
+    """Cut off a last line left incomplete by a crash, so the next append starts on a fresh line"""
+    if not path.exists():
+        return
+    with open(path, 'r+b') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # Scan back to the last complete line
+        position = size
+        while position > 0:
+            start = max(0, position - 65536)
+            f.seek(start)
+            block = f.read(position - start)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                f.truncate(start + newline + 1)
+                return
+            position = start
+        f.truncate(0)
+
+
+class StagedRun:
+    """Artifacts and checkpoint of one ingestion run"""
+
+    CHUNKS_FILE = "chunks.jsonl"
+    ENRICHED_FILE = "enriched.jsonl"
+    EMBEDDINGS_DIR = "embeddings"
+    CHECKPOINT_FILE = "checkpoint.json"
+
+    def __init__(self, runs_dir: str, run_id: Optional[str] = None, dimensions: int = None):
+        """
+        Open an existing run or start a new one
+
+        Args:
+            runs_dir: Directory holding all runs
+            run_id: Run to resume (a new run ID is generated when None)
+            dimensions: Embedding size of the embed stage's vectors
+        """
+        self.run_id = run_id or new_run_id()
+        self.directory = Path(runs_dir) / self.run_id
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / self.EMBEDDINGS_DIR).mkdir(exist_ok=True)
+        self.dimensions = dimensions
+
+        checkpoint_path = self.directory / self.CHECKPOINT_FILE
+        if checkpoint_path.exists():
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                self.checkpoint: Dict[str, Any] = json.load(f)
+        else:
+            self.checkpoint = {"run_id": self.run_id, "completed_stages": [], "settings": {}}
+
+        recorded = self.checkpoint["settings"].get("embedding_dimensions")
+        if recorded is not None and dimensions is not None and recorded != dimensions and \
+                ("embed" in self.checkpoint["completed_stages"] or self.embedded_ids()):
+            raise ValueError(
+                f"Run {self.run_id} embedded at {recorded} dimensions but EMBEDDING_DIMENSIONS is "
+                f"{dimensions}; re-run it with --from-stage embed"
+            )
+
+    @property
+    def completed_stages(self) -> List[str]:
+        return list(self.checkpoint["completed_stages"])
+
+    def is_complete(self, stage: str) -> bool:
+        return stage in self.checkpoint["completed_stages"]
+
+    def mark_complete(self, stage: str, **settings):
+        if stage not in self.checkpoint["completed_stages"]:
+            self.checkpoint["completed_stages"].append(stage)
+        self.checkpoint["settings"].update(settings)
+        self.checkpoint["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self._write_checkpoint()
+
+    def reset_from(self, stage: str):
+        """Discard the outputs of a stage and every later stage so they are rebuilt"""
+        later = STAGES[STAGES.index(stage):]
+        self.checkpoint["completed_stages"] = [s for s in self.checkpoint["completed_stages"] if s not in later]
+        self._write_checkpoint()
+        if "enrich" in later:
+            (self.directory / self.ENRICHED_FILE).unlink(missing_ok=True)
+        if "embed" in later:
+            for path in (self.directory / self.EMBEDDINGS_DIR).iterdir():
+                path.unlink()
+
+    def _write_checkpoint(self):
+        path = self.directory / self.CHECKPOINT_FILE
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.checkpoint, f, indent=2)
+        os.replace(tmp, path)
+
+    # Chunk artifacts
+
+    def write_chunks(self, chunks: Iterable[DocumentChunk]) -> int:
+        """Write the chunk stage output in one go (replaced atomically)"""
+        path = self.directory / self.CHUNKS_FILE
+        tmp = path.with_suffix(".jsonl.tmp")
+        count = 0
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(json.dumps(chunk.to_artifact_record(), ensure_ascii=False) + "\n")
+                count += 1
+        os.replace(tmp, path)
+        return count
+
+    def read_chunks(self) -> List[DocumentChunk]:
+        return list(self._read_jsonl(self.directory / self.CHUNKS_FILE))
+
+    def append_enriched(self, chunks: Iterable[DocumentChunk]):
+        """Append finished enrichments; each flushed line is a checkpoint"""
+        path = self.directory / self.ENRICHED_FILE
+        _truncate_partial_line(path)
+        with open(path, 'a', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(json.dumps(chunk.to_artifact_record(), ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read_enriched(self) -> List[DocumentChunk]:
+        return list(self._read_jsonl(self.directory / self.ENRICHED_FILE))
+
+    def _read_jsonl(self, path: Path) -> Iterator[DocumentChunk]:
+        if not path.exists():
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield DocumentChunk.from_artifact_record(json.loads(line))
+                except json.JSONDecodeError:
+                    # A line cut short by a crash; the chunk is simply redone
+                    continue
+
+    # Embedding artifacts
+
+    def _index_path(self) -> Path:
+        return self.directory / self.EMBEDDINGS_DIR / "index.jsonl"
+
+    def _column_path(self, name: str) -> Path:
+        return self.directory / self.EMBEDDINGS_DIR / f"{name}.f32"
+
+    def _read_index(self) -> List[Dict[str, Any]]:
+        path = self._index_path()
+        if not path.exists():
+            return []
+        entries = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        return entries
+
+    def embedded_ids(self) -> Set[str]:
+        return {entry["chunk_id"] for entry in self._read_index()}
+
+    def append_embeddings(self, chunks: List[DocumentChunk]):
+        """
+        Append the chunks' vectors as rows of the column files, then their index lines
+
+        Rows are written before the index, so after a crash any rows past the
+        last index line are incomplete and are cut off on the next append.
+        """
+        row_bytes = self.dimensions * 4
+        _truncate_partial_line(self._index_path())
+        rows = len(self._read_index())
+        for name in VECTOR_NAMES:
+            path = self._column_path(name)
+            if path.exists() and path.stat().st_size != rows * row_bytes:
+                with open(path, 'r+b') as f:
+                    f.truncate(rows * row_bytes)
+            matrix = np.zeros((len(chunks), self.dimensions), dtype=np.float32)
+            for row, chunk in enumerate(chunks):
+                vector = getattr(chunk, name)
+                if vector is not None:
+                    matrix[row] = vector
+            with open(path, 'ab') as f:
+                f.write(matrix.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        with open(self._index_path(), 'a', encoding='utf-8') as f:
+            for chunk in chunks:
+                present = [name for name in VECTOR_NAMES if getattr(chunk, name) is not None]
+                f.write(json.dumps({"chunk_id": chunk.chunk_id, "vectors": present}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read_embeddings(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """chunk_id -> {vector name: float32 row} for every embedded chunk (rows are memory-mapped)"""
+        entries = self._read_index()
+        if not entries:
+            return {}
+        columns = {
+            name: np.memmap(self._column_path(name), dtype=np.float32, mode='r',
+                            shape=(len(entries), self.dimensions))
+            for name in VECTOR_NAMES
+        }
+        return {
+            entry["chunk_id"]: {name: columns[name][row] for name in entry["vectors"]}
+            for row, entry in enumerate(entries)
+        }
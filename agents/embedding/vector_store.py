@@ -2,14 +2,22 @@
 Weaviate vector store interface for embedding storage
 """
 
-from typing import List, Optional, Dict, Any
+import time
+import re
+from typing import List, Optional, Dict, Any, Tuple
+import numpy as np
 import weaviate
 import weaviate.classes as wvc
+from weaviate.classes.query import Filter
 from weaviate.classes.config import Configure, Property, DataType
 import google.generativeai as genai
 from google.ai.generativelanguage_v1beta.types import content
 
 from .models import DocumentChunk
+from .embedding_utils import (
+    EmbeddingStats, embed_text, embed_texts_partial, format_index_description, parse_index_dimensions,
+    resolve_collection, supports_aliases, validate_index_dimensions, MIN_ALIAS_SERVER_VERSION
+)
 from config import Config
 
 
@@ -24,7 +32,9 @@ class WeaviateVectorStore:
         if gemini_api_key:
             genai.configure(api_key=gemini_api_key)
         
-        self.collection_name = "InsuranceDocumentChunk"
+        # Searches and incremental syncs go to the collection the alias serves
+        self.alias_name = Config.WEAVIATE_COLLECTION
+        self.collection_name = resolve_collection(self.client, self.alias_name)
         
     def create_schema(self):
         """Create the Weaviate schema for insurance documents"""
@@ -32,9 +42,14 @@ class WeaviateVectorStore:
             print(f"Collection {self.collection_name} already exists. Deleting...")
             self.client.collections.delete(self.collection_name)
         
-        # Create collection with multi-vector configuration
+        self._create_collection()
+
+    def _create_collection(self):
+        """Create the collection with multi-vector configuration"""
         self.client.collections.create(
             name=self.collection_name,
+            # Records the Matryoshka size so retrieval can reject a mismatched config
+            description=format_index_description(Config.EMBEDDING_DIMENSIONS),
             properties=[
                 # Metadata Properties
                 Property(name="product_name", data_type=DataType.TEXT),
@@ -48,6 +63,8 @@ class WeaviateVectorStore:
                 Property(name="content", data_type=DataType.TEXT),
                 Property(name="question", data_type=DataType.TEXT),
                 Property(name="chunk_id", data_type=DataType.TEXT),
+                # Fingerprint of the indexed object, compared by incremental sync
+                Property(name="record_hash", data_type=DataType.TEXT),
                 
                 # Temporary fields for vectorization
                 Property(name="summary", data_type=DataType.TEXT),
@@ -63,116 +80,287 @@ class WeaviateVectorStore:
         
         print(f"Created collection: {self.collection_name}")
     
-    def generate_embeddings(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
-        """Generate embeddings for chunks using Gemini"""
+    @staticmethod
+    def _embedding_slots(chunks: List[DocumentChunk]) -> List[Tuple[DocumentChunk, str, str]]:
+        """(chunk, vector attribute, text to embed) for every vector the chunks need"""
+        slots = []
         for chunk in chunks:
-            try:
-                # Generate content embedding
-                if chunk.content:
-                    content_result = genai.embed_content(
-                        model=Config.EMBEDDING_MODEL,
-                        content=chunk.content[:2048]  # Limit length
-                    )
-                    chunk.content_embedding = content_result['embedding']
-                
-                # Generate summary embedding
-                if chunk.summary:
-                    summary_result = genai.embed_content(
-                        model=Config.EMBEDDING_MODEL,
-                        content=chunk.summary
-                    )
-                    chunk.summary_embedding = summary_result['embedding']
-                
-                # Generate hypothetical questions embedding
-                if chunk.hypothetical_questions:
-                    questions_text = " ".join(chunk.hypothetical_questions)
-                    questions_result = genai.embed_content(
-                        model=Config.EMBEDDING_MODEL,
-                        content=questions_text[:2048]  # Limit length
-                    )
-                    chunk.hypothetical_question_embedding = questions_result['embedding']
-                    
-            except Exception as e:
-                print(f"Error generating embeddings for chunk {chunk.chunk_id}: {e}")
-        
-        return chunks
+            if chunk.content:
+                slots.append((chunk, "content_embedding", chunk.content[:2048]))  # Limit length
+            if chunk.summary:
+                slots.append((chunk, "summary_embedding", chunk.summary))
+            if chunk.hypothetical_questions:
+                questions_text = " ".join(chunk.hypothetical_questions)
+                slots.append((chunk, "hypothetical_question_embedding", questions_text[:2048]))  # Limit length
+        return slots
+
+    @classmethod
+    def missing_embeddings(cls, chunk: DocumentChunk) -> List[str]:
+        """Vector attributes the chunk needs but has no embedding for (e.g. after a failed batch)"""
+        return [attribute for _, attribute, _ in cls._embedding_slots([chunk]) if getattr(chunk, attribute) is None]
+
+    def generate_embeddings(self, chunks: List[DocumentChunk], show_progress: bool = False,
+                            cache=None, stats: Optional[EmbeddingStats] = None) -> List[DocumentChunk]:
+        """
+        Generate embeddings for chunks using Gemini batch embed requests
 
-    def generate_embeddings_with_progress(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
-        """Generate embeddings for chunks using Gemini with detailed progress tracking"""
-
-        for i, chunk in enumerate(chunks, 1):
-            print(f"🔄 [{i:3d}/{len(chunks)}] Embedding: {chunk.product_name} - {chunk.document_type} (ID: {chunk.chunk_id[:8]})", end=" ", flush=True)
-
-            try:
-                embeddings_generated = 0
-
-                # Generate content embedding
-                if chunk.content:
-                    content_result = genai.embed_content(
-                        model=Config.EMBEDDING_MODEL,
-                        content=chunk.content[:2048]  # Limit length
-                    )
-                    chunk.content_embedding = content_result['embedding']
-                    embeddings_generated += 1
-
-                # Generate summary embedding
-                if chunk.summary:
-                    summary_result = genai.embed_content(
-                        model=Config.EMBEDDING_MODEL,
-                        content=chunk.summary
-                    )
-                    chunk.summary_embedding = summary_result['embedding']
-                    embeddings_generated += 1
-
-                # Generate hypothetical questions embedding
-                if chunk.hypothetical_questions:
-                    questions_text = " ".join(chunk.hypothetical_questions)
-                    questions_result = genai.embed_content(
-                        model=Config.EMBEDDING_MODEL,
-                        content=questions_text[:2048]  # Limit length
-                    )
-                    chunk.hypothetical_question_embedding = questions_result['embedding']
-                    embeddings_generated += 1
-
-                print(f"✅ ({embeddings_generated} embeddings)")
-
-            except Exception as e:
-                print(f"❌ Error: {str(e)[:50]}...")
-
-            # Show periodic summary
-            if i % 50 == 0:
-                print(f"📈 Milestone: {i}/{len(chunks)} chunks embedded ({i/len(chunks)*100:.1f}%)")
+        Texts of all chunks and vector types are grouped into requests of
+        Config.EMBEDDING_BATCH_SIZE and each result is written back to its
+        chunk and vector slot. Identical texts across slots and chunks are
+        embedded once and share the vector. Failed batches are retried; a
+        vector that still cannot be embedded is left as None.
 
+        Args:
+            chunks: Chunks to embed (content, summary and questions as available)
+            show_progress: Print progress after each batch
+            cache: Optional EnrichmentCache; texts embedded in earlier runs are not sent again
+            stats: Optional EmbeddingStats the texts sent and saved are added to
+
+        Returns:
+            The same chunks with their embeddings set
+        """
+        slots = self._embedding_slots(chunks)
+        started = time.perf_counter()
+
+        def report(done: int, total: int):
+            elapsed = time.perf_counter() - started
+            print(f"🔄 Embedded {done}/{total} texts ({done / total * 100:.1f}%, {done / elapsed:.1f} texts/s)")
+
+        embeddings = embed_texts_partial(
+            [text for _, _, text in slots],
+            on_batch=report if show_progress else None,
+            cache=cache,
+            stats=stats
+        )
+
+        failed = 0
+        for (chunk, attribute, _), embedding in zip(slots, embeddings):
+            setattr(chunk, attribute, embedding)
+            if embedding is None:
+                failed += 1
+        if failed:
+            print(f"⚠️ {failed} of {len(slots)} embeddings could not be generated")
+
+        return chunks
+
+    def generate_embeddings_with_progress(self, chunks: List[DocumentChunk], cache=None,
+                                          stats: Optional[EmbeddingStats] = None) -> List[DocumentChunk]:
+        """Generate embeddings for chunks using Gemini with batch-level progress tracking"""
+        self.generate_embeddings(chunks, show_progress=True, cache=cache, stats=stats)
         print(f"✅ Embedding generation complete: {len(chunks)} chunks processed")
         return chunks
 
     def insert_chunks(self, chunks: List[DocumentChunk], batch_size: int = 100):
         """Insert chunks into Weaviate using batch operations"""
-        collection = self.client.collections.get(self.collection_name)
+        collection = self.open_collection()
         
         # Process in batches
         for i in range(0, len(chunks), batch_size):
             batch_chunks = chunks[i:i + batch_size]
-            
-            with collection.batch.dynamic() as batch:
-                for chunk in batch_chunks:
-                    # Prepare vectors
-                    vectors = {}
-                    if chunk.content_embedding:
-                        vectors["content_embedding"] = chunk.content_embedding
-                    if chunk.summary_embedding:
-                        vectors["summary_embedding"] = chunk.summary_embedding
-                    if chunk.hypothetical_question_embedding:
-                        vectors["hypothetical_question_embedding"] = chunk.hypothetical_question_embedding
-                    
-                    # Add object to batch
-                    batch.add_object(
-                        properties=chunk.to_weaviate_object(),
-                        vector=vectors
-                    )
-            
+            self.write_batch(collection, batch_chunks)
             print(f"Inserted batch {i//batch_size + 1} ({len(batch_chunks)} chunks)")
+
+    def open_collection(self):
+        """The current collection, checked to have been built at the configured dimensionality"""
+        collection = self.client.collections.get(self.collection_name)
+        validate_index_dimensions(
+            parse_index_dimensions(collection.config.get().description),
+            f"collection {self.collection_name}"
+        )
+        return collection
+
+    def write_batch(self, collection, chunks: List[DocumentChunk]):
+        """Write one batch of chunks (inserting or overwriting by UUID); raises if any object fails"""
+        with collection.batch.dynamic() as batch:
+            for chunk in chunks:
+                self._add_to_batch(batch, chunk)
+        failed = collection.batch.failed_objects
+        if failed:
+            raise RuntimeError(f"{len(failed)} objects failed to write: {failed[0].message}")
+
+    def _add_to_batch(self, batch, chunk: DocumentChunk):
+        """Add (or overwrite, as the UUID is the chunk_id) one chunk's object and vectors"""
+        # Prepare vectors (the client boundary: float32 arrays become lists only here)
+        self._check_vector_dimensions(chunk)
+        vectors = {}
+        for name in ("content_embedding", "summary_embedding", "hypothetical_question_embedding"):
+            vector = getattr(chunk, name)
+            if vector is not None:
+                vectors[name] = np.asarray(vector, dtype=np.float32).tolist()
+
+        batch.add_object(
+            properties={**chunk.to_weaviate_object(), "record_hash": chunk.record_hash},
+            vector=vectors,
+            uuid=chunk.chunk_id
+        )
+
+    def sync_chunks(self, chunks: List[DocumentChunk], batch_size: int = 100) -> Dict[str, int]:
+        """
+        Bring the collection in line with the given chunks without recreating it
+
+        Objects are matched by UUID (the deterministic chunk_id) and compared by
+        record_hash: new chunks are inserted, changed ones overwritten and
+        chunks no longer produced are deleted. The schema is left alone, and
+        is only created when the collection does not exist yet.
+
+        Args:
+            chunks: Every chunk of the current corpus, embedded
+            batch_size: Objects per write batch
+
+        Returns:
+            Counts of inserted, updated, deleted and unchanged chunks
+        """
+        if not self.client.collections.exists(self.collection_name):
+            print(f"Collection {self.collection_name} does not exist yet. Creating...")
+            self._create_collection()
+
+        collection = self.open_collection()
+
+        indexed = {
+            str(obj.uuid): obj.properties.get("record_hash")
+            for obj in collection.iterator(return_properties=["record_hash"])
+        }
+        current = {chunk.chunk_id: chunk for chunk in chunks}
+
+        to_insert = [chunk for chunk_id, chunk in current.items() if chunk_id not in indexed]
+        to_update = [chunk for chunk_id, chunk in current.items()
+                     if chunk_id in indexed and indexed[chunk_id] != chunk.record_hash]
+        to_delete = [chunk_id for chunk_id in indexed if chunk_id not in current]
+
+        to_write = to_insert + to_update
+        for i in range(0, len(to_write), batch_size):
+            self.write_batch(collection, to_write[i:i + batch_size])
+
+        for i in range(0, len(to_delete), batch_size):
+            collection.data.delete_many(where=Filter.by_id().contains_any(to_delete[i:i + batch_size]))
+
+        return {
+            "inserted": len(to_insert),
+            "updated": len(to_update),
+            "deleted": len(to_delete),
+            "unchanged": len(current) - len(to_insert) - len(to_update)
+        }
     
+    def _check_vector_dimensions(self, chunk: DocumentChunk):
+        """Refuse to insert vectors whose size differs from the configured dimensionality"""
+        for name in ("content_embedding", "summary_embedding", "hypothetical_question_embedding"):
+            vector = getattr(chunk, name)
+            if vector is not None and len(vector) != Config.EMBEDDING_DIMENSIONS:
+                raise ValueError(
+                    f"Chunk {chunk.chunk_id} has a {len(vector)}-dimensional {name}, "
+                    f"expected {Config.EMBEDDING_DIMENSIONS}"
+                )
+
+    def _version_names(self) -> List[Tuple[int, str]]:
+        """(version, name) of every versioned collection of the alias, oldest first"""
+        pattern = re.compile(rf"^{re.escape(self.alias_name)}_v(\d+)$")
+        versions = []
+        for name in self.client.collections.list_all(simple=True):
+            match = pattern.match(name)
+            if match:
+                versions.append((int(match.group(1)), name))
+        return sorted(versions)
+
+    def create_version(self) -> str:
+        """
+        Create the next versioned collection (<alias>_v<N>) and write to it from now on
+
+        Returns:
+            Name of the new collection
+
+        Raises:
+            RuntimeError: The server cannot serve versions through an alias
+        """
+        # Checked before building anything, rather than failing in swap_alias afterwards
+        if not supports_aliases(self.client):
+            raise RuntimeError(
+                f"Blue/green builds need collection aliases (Weaviate server "
+                f"{'.'.join(map(str, MIN_ALIAS_SERVER_VERSION))}+); upgrade the server or run without --blue-green"
+            )
+        versions = self._version_names()
+        next_version = versions[-1][0] + 1 if versions else 1
+        self.collection_name = f"{self.alias_name}_v{next_version}"
+        self._create_collection()
+        return self.collection_name
+
+    @staticmethod
+    def sample_vectors(chunks: List[DocumentChunk], sample_size: int = 5) -> List[Tuple[str, np.ndarray]]:
+        """(chunk_id, content embedding) of chunks spread over the list, for validate_collection"""
+        embedded = [chunk for chunk in chunks if chunk.content_embedding is not None]
+        step = max(1, len(embedded) // sample_size)
+        return [(chunk.chunk_id, chunk.content_embedding) for chunk in embedded[::step][:sample_size]]
+
+    def validate_collection(self, expected_count: int, samples: List[Tuple[str, np.ndarray]]) -> List[str]:
+        """
+        Check a freshly built collection before it is put live
+
+        The object count must match the chunks written, and each sample chunk
+        searched with its own content embedding must find itself among the
+        top 3 (no embedding API calls needed).
+
+        Args:
+            expected_count: Chunks written to the collection
+            samples: (chunk_id, content embedding) pairs used as sample queries
+
+        Returns:
+            Problems found (empty when the collection is valid)
+        """
+        collection = self.client.collections.get(self.collection_name)
+        problems = []
+
+        count = collection.aggregate.over_all(total_count=True).total_count
+        if count != expected_count:
+            problems.append(f"{self.collection_name} holds {count} objects, expected {expected_count}")
+
+        for chunk_id, vector in samples:
+            response = collection.query.near_vector(
+                near_vector=np.asarray(vector, dtype=np.float32).tolist(),
+                target_vector="content_embedding",
+                limit=3
+            )
+            if chunk_id not in {str(obj.uuid) for obj in response.objects}:
+                problems.append(f"Sample query for chunk {chunk_id} did not return it")
+
+        return problems
+
+    def swap_alias(self) -> Optional[str]:
+        """
+        Point the alias at the current collection in one atomic update
+
+        Before the first blue/green build the alias name is still a plain
+        collection; it is deleted so the alias can take its name (searches
+        fail only between that delete and the alias creation).
+
+        Returns:
+            Collection the alias pointed to before, if any
+        """
+        alias = self.client.alias.get(alias_name=self.alias_name)
+        if alias is not None:
+            self.client.alias.update(alias_name=self.alias_name, new_target_collection=self.collection_name)
+            return alias.collection
+
+        if self.client.collections.exists(self.alias_name):
+            print(f"⚠️ Replacing plain collection {self.alias_name} with an alias (one-time migration)")
+            self.client.collections.delete(self.alias_name)
+        self.client.alias.create(alias_name=self.alias_name, target_collection=self.collection_name)
+        return None
+
+    def prune_versions(self, keep: int) -> List[str]:
+        """
+        Delete old versioned collections, keeping the live one and the `keep` before it
+
+        Returns:
+            Names of the deleted collections
+        """
+        live = resolve_collection(self.client, self.alias_name, current=self.collection_name)
+        names = [name for _, name in self._version_names()]
+        if live in names:
+            names = names[:names.index(live)]
+        stale = names[:-keep] if keep > 0 else names
+        for name in stale:
+            self.client.collections.delete(name)
+        return stale
+
     def search_content(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Search using content embeddings"""
         return self._search_vector(query, "content_embedding", limit)
@@ -218,11 +406,7 @@ class WeaviateVectorStore:
         collection = self.client.collections.get(self.collection_name)
         
         # Generate query embedding
-        query_result = genai.embed_content(
-            model=Config.EMBEDDING_MODEL,
-            content=query
-        )
-        query_embedding = query_result['embedding']
+        query_embedding = embed_text(query)
         
         # Perform search
         response = collection.query.near_vector(
@@ -7,6 +7,8 @@ chunks into high-quality, human-readable answers with proper citations.
 
 from .response_agent import ResponseGenerationAgent
 from .models import ResponseRequest, ResponseResult, CitationStyle, ConfidenceConfig
+from .benefits_lookup import BenefitsLookupEngine, BenefitsIndex
 
 __version__ = "0.1.0"
-__all__ = ['ResponseGenerationAgent', 'ResponseRequest', 'ResponseResult', 'CitationStyle', 'ConfidenceConfig']
+__all__ = ['ResponseGenerationAgent', 'ResponseRequest', 'ResponseResult', 'CitationStyle', 'ConfidenceConfig',
+           'BenefitsLookupEngine', 'BenefitsIndex']
@@ -0,0 +1,203 @@
+"""
+Precompiled answer analysis for confidence scoring
+
+Confidence, context sufficiency and citation usage all look at the same
+generated answer. AnswerAnalyzer reads it once: one lowercase copy, one word
+count, one set of every uncertainty, instructional and negative-context
+phrase it contains, and one scan over its figures that yields all
+specificity pattern counts. The scoring methods of ResponseGenerationAgent
+read their signals from the resulting AnswerAnalysis, so each answer is
+analyzed once per request rather than once per method and citation.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, FrozenSet, List, Pattern
+
+
+UNCERTAINTY_PHRASES = [
+    # Strong uncertainty
+    "don't have enough information", "not enough information", "insufficient information",
+    "cannot determine", "unclear", "please contact", "i don't know", "unsure",
+    "unable to find", "no information available", "not specified", "not mentioned",
+
+    # Moderate uncertainty (context-dependent)
+    "may depend", "might vary", "could be", "possibly", "perhaps", "seems to",
+    "appears to", "likely", "probably", "i think", "it depends", "varies",
+
+    # Weak uncertainty (instructional context)
+    "you may", "may apply", "may choose", "might want", "could consider"
+]
+
+# Severity tiers are applied by position (8 / 8 / rest), as the confidence score always has
+STRONG_UNCERTAINTY = UNCERTAINTY_PHRASES[:8]
+MODERATE_UNCERTAINTY = UNCERTAINTY_PHRASES[8:16]
+WEAK_UNCERTAINTY = UNCERTAINTY_PHRASES[16:]
+
+# Phrases that make the context insufficient regardless of relevance
+INSUFFICIENT_CONTEXT_PHRASES = [
+    "don't have enough information", "not enough information", "insufficient information",
+    "cannot determine", "unclear", "please contact", "i don't know", "unsure",
+    "unable to find", "no information available", "not specified in", "not mentioned"
+]
+
+# Uncertainty words used to give instructions ("you may apply") rather than hedge
+INSTRUCTIONAL_PHRASES = [
+    "you may apply", "you may choose", "you may contact", "may be eligible",
+    "you might want", "you could consider", "may qualify", "may submit"
+]
+
+# Contexts in which a figure is mentioned but not stated as a fact
+MONETARY_NEGATIVE_PHRASES = ["don't have", "no information", "not specified", "unclear"]
+TIME_HYPOTHETICAL_PHRASES = ["may take", "might be", "could be", "possibly"]
+
+# Specificity indicators, counted as re.findall(pattern) would count them:
+#   monetary    \$\d+  \d+\s*dollars?  \d+\s*cents?
+#   percentage  \d+\s*%  \d+\s*percent
+#   time        \d+\s*days?  \d+\s*months?  \d+\s*years?  \d+\s*weeks?
+#   age         \d+\s*years?\s*old  age\s*\d+
+#   range       between\s*\d+\s*and\s*\d+
+# Every digit-led pattern matches at the start of a digit run, so one scan over the
+# digit runs (with the unit that follows, if any) yields all of their counts at once.
+_FIGURE = re.compile(
+    r'(\$)?\d+(?:\s*(?:(dollars?)|(cents?)|(%)|(percent)|(days?)|(months?)|(years?)(\s*old)?|(weeks?)))?'
+)
+_FIGURE_CATEGORIES = {
+    1: 'monetary', 2: 'monetary', 3: 'monetary', 4: 'percentage', 5: 'percentage',
+    6: 'time', 7: 'time', 8: 'time', 9: 'age', 10: 'time'
+}
+_AGE = re.compile(r'age\s*\d+')
+_RANGE = re.compile(r'between\s*\d+\s*and\s*\d+')
+
+_NUMBERED_MARKER = re.compile(r'\[\d+\]')
+_WORD = re.compile(r'\w+')
+
+_ALL_PHRASES = tuple(dict.fromkeys(
+    UNCERTAINTY_PHRASES + INSUFFICIENT_CONTEXT_PHRASES + INSTRUCTIONAL_PHRASES +
+    MONETARY_NEGATIVE_PHRASES + TIME_HYPOTHETICAL_PHRASES
+))
+
+
+@dataclass
+class AnswerAnalysis:
+    """Signals read from one answer"""
+    answer_lower: str
+    word_count: int
+    phrases: FrozenSet[str]               # Every known phrase that occurs in the answer
+    specificity_count: int                # Meaningful figures (amounts, percentages, periods, ages)
+    numbered_markers: FrozenSet[str] = field(default_factory=frozenset)   # "[1]", "[2]", ...
+
+    @cached_property
+    def words(self) -> FrozenSet[str]:
+        """Word tokens (\\w+) of the answer, built on first use"""
+        return frozenset(_WORD.findall(self.answer_lower))
+
+    def has_any(self, phrases: List[str]) -> bool:
+        return not self.phrases.isdisjoint(phrases)
+
+    @property
+    def strong_uncertainty(self) -> bool:
+        return self.has_any(STRONG_UNCERTAINTY)
+
+    @property
+    def moderate_uncertainty(self) -> bool:
+        return self.has_any(MODERATE_UNCERTAINTY)
+
+    @property
+    def weak_uncertainty(self) -> bool:
+        return self.has_any(WEAK_UNCERTAINTY)
+
+    @property
+    def instructional(self) -> bool:
+        return self.has_any(INSTRUCTIONAL_PHRASES)
+
+    @property
+    def insufficient_context(self) -> bool:
+        return self.has_any(INSUFFICIENT_CONTEXT_PHRASES)
+
+
+class AnswerAnalyzer:
+    """Analyzes answers once and serves repeated lookups of the same answer from a small memo"""
+
+    def __init__(self, cache_size: int = 256):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, AnswerAnalysis]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._word_patterns: Dict[str, Pattern] = {}
+
+    def analyze(self, answer: str) -> AnswerAnalysis:
+        """
+        Analyze an answer
+
+        Args:
+            answer: Generated answer text
+
+        Returns:
+            AnswerAnalysis shared by every scoring step for this answer
+        """
+        with self._cache_lock:
+            analysis = self._cache.get(answer)
+            if analysis is not None:
+                self._cache.move_to_end(answer)
+                return analysis
+
+        analysis = self._analyze(answer)
+
+        with self._cache_lock:
+            self._cache[answer] = analysis
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return analysis
+
+    def _analyze(self, answer: str) -> AnswerAnalysis:
+        answer_lower = answer.lower()
+
+        phrases = frozenset(phrase for phrase in _ALL_PHRASES if phrase in answer_lower)
+
+        # Figures stated in a negative (monetary) or hypothetical (time) context do not count
+        excluded = set()
+        if not phrases.isdisjoint(MONETARY_NEGATIVE_PHRASES):
+            excluded.add('monetary')
+        if not phrases.isdisjoint(TIME_HYPOTHETICAL_PHRASES):
+            excluded.add('time')
+
+        specificity_count = 0
+        for match in _FIGURE.finditer(answer_lower):
+            for group, category in _FIGURE_CATEGORIES.items():
+                if match.group(group) is not None and category not in excluded:
+                    specificity_count += 1
+        if 'age' in answer_lower:
+            specificity_count += len(_AGE.findall(answer_lower))
+        if 'between' in answer_lower:
+            specificity_count += len(_RANGE.findall(answer_lower))
+
+        return AnswerAnalysis(
+            answer_lower=answer_lower,
+            word_count=len(answer.split()),
+            phrases=phrases,
+            specificity_count=specificity_count,
+            numbered_markers=frozenset(_NUMBERED_MARKER.findall(answer_lower))
+        )
+
+    def mentions_word(self, analysis: AnswerAnalysis, word: str) -> bool:
+        """Whether a (lowercase) word or phrase occurs in the answer on word boundaries"""
+        # A single \\w+ token is on word boundaries exactly when it is one of the answer's tokens
+        parts = _WORD.findall(word)
+        if parts and not analysis.words.issuperset(parts):
+            return False
+        if len(parts) == 1 and parts[0] == word:
+            return True
+
+        pattern = self._word_patterns.get(word)
+        if pattern is None:
+            pattern = re.compile(r'\b' + re.escape(word) + r'\b')
+            if len(self._word_patterns) < 1024:
+                self._word_patterns[word] = pattern
+        return pattern.search(analysis.answer_lower) is not None
+
+
+answer_analyzer = AnswerAnalyzer()
@@ -0,0 +1,332 @@
+"""
+Direct answers from the Benefits tables
+
+Source/Benefits/*_Tables.txt state one benefit per line, with a limit per
+plan tier ("... is $150,000 for the Basic plan, $250,000 for the Silver
+plan ..."). Reading one of those numbers does not need an LLM call: the
+lines are parsed once into a typed in-memory index, and a question that
+names a product, a plan tier and a benefit is answered straight from the
+matching line with a citation.
+
+The engine only answers when exactly one benefit clearly matches; anything
+ambiguous returns None and goes through the normal retrieval and
+generation pipeline.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import Config
+from .models import Citation, ResponseResult
+
+
+# Plan tiers used across the product tables (the Travel table spells Platinum "Platinium")
+PLAN_TIERS = {
+    "basic": "Basic", "enhanced": "Enhanced", "premier": "Premier", "exclusive": "Exclusive",
+    "bronze": "Bronze", "silver": "Silver", "gold": "Gold", "platinum": "Platinum",
+    "platinium": "Platinum", "diamond": "Diamond", "titanium": "Titanium"
+}
+
+_PLAN_NAME = r"[A-Z][a-z]+"
+_PLAN_MARKER = re.compile(
+    rf"\b(?:for|across|on)\s+(?:the\s+)?({_PLAN_NAME}(?:(?:\s*,\s*|\s+)(?:and\s+)?{_PLAN_NAME})*)\s+plans?\b"
+)
+# The value of the first tier follows the last of these words before it
+_VALUE_LEAD = re.compile(r"\b(?:is|are|provides|providing|of|be)\s+")
+# Later tiers are separated by list punctuation and conjunctions
+_VALUE_SEPARATOR = re.compile(r"^[\s,;]*(?:(?:and|but|with|is|provides|providing)\b[\s,]*)*")
+_VALUE_TOKEN = re.compile(
+    r"\$|\d|%|\bno coverage\b|\bnot available\b|\bnot applicable\b|\bunlimited\b|\bdollars?\b|\bpercent\b",
+    re.IGNORECASE
+)
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[&\-.][a-z0-9]+)*")
+
+# Words that say what kind of number is wanted but not which benefit
+_GENERIC_TERMS = {
+    'plan', 'plans', 'tier', 'limit', 'limits', 'maximum', 'max', 'amount', 'cover', 'covered', 'coverage',
+    'benefit', 'benefits', 'insurance', 'policy', 'much', 'payable', 'pay', 'paid', 'get', 'up', 'total',
+    'value', 'provide', 'provides', 'under', 'protect360', 'hl', 'assurance', 'sg', 'singapore', 'dollars'
+}
+_STOPWORDS = {
+    'a', 'an', 'the', 'is', 'are', 'was', 'be', 'do', 'does', 'can', 'i', 'me', 'my', 'we', 'you', 'your',
+    'it', 'this', 'that', 'what', 'which', 'how', 'for', 'of', 'to', 'in', 'on', 'at', 'with', 'by',
+    'and', 'or', 'if', 'there', 'any', 'per', 's', 'whats', 'tell', 'please', 'about', 'much'
+}
+# Negations ("not covered", "not applicable") say nothing about which benefit is meant
+_NEGATION_TERMS = {'not', 'no', 'non', 'nor', 'never', 'without'}
+
+# Qualifiers that split one benefit into lines with different figures; lines
+# that tie on the question's terms but differ in these cannot be told apart
+_QUALIFIERS = [
+    re.compile(r"\badults?\b", re.IGNORECASE),
+    re.compile(r"\bchild(?:ren)?\b", re.IGNORECASE),
+    re.compile(r"\bage[sd]?\s+(?:\w+\s+){0,2}\d+(?:\s+years?)?(?:\s+and\s+(?:below|above|under|over))?", re.IGNORECASE),
+    re.compile(r"\bcovid", re.IGNORECASE),
+    re.compile(r"\badd-?ons?\b|\boptional\b|\brider\b", re.IGNORECASE),
+    re.compile(r"\bfamily\b", re.IGNORECASE),
+]
+
+# Questions asking for a figure from the tables ("what is" or "cover" alone do not)
+_NUMERIC_QUESTION = re.compile(
+    r"\bhow much\b|\blimit\b|\bmaximum\b|\bmax\b|\bamount\b|\bup to\b|\bbenefit\b|\bsum insured\b|"
+    r"\bpay(?:out|able)?\b|\bpremium\b|\bdiscount\b|\bbonus\b|%|\$",
+    re.IGNORECASE
+)
+
+# Smallest share of the question's benefit terms an entry must contain
+MIN_TERM_RECALL = 0.75
+
+
+def _terms(text: str) -> Set[str]:
+    """Content terms of a text (lowercase, without stopwords); "covid-19" also yields "covid" and "19" """
+    terms = set()
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        terms.add(token)
+        if '-' in token:
+            terms.update(part for part in token.split('-') if part not in _STOPWORDS)
+    return terms
+
+
+def _benefit_terms(text: str, product: str) -> Set[str]:
+    """Terms that identify a benefit: content terms minus generic words, plan tiers and the product name"""
+    return _terms(text) - _GENERIC_TERMS - _NEGATION_TERMS - set(PLAN_TIERS) - {product.lower()}
+
+
+def _qualifiers(text: str) -> Set[str]:
+    """Qualifiers a benefit text states, e.g. {"adult", "age 70 years and below"}"""
+    return {" ".join(match.group(0).lower().split()) for pattern in _QUALIFIERS for match in pattern.finditer(text)}
+
+
+@dataclass(frozen=True)
+class BenefitEntry:
+    """One plan tier's limit for one benefit line"""
+    product: str
+    table: Optional[str]
+    plan: str
+    benefit: str          # Line text before the first limit, e.g. "Under X, the Y benefit is"
+    limit: str            # Limit text as written, e.g. "$250,000" or "not available"
+    suffix: str           # Qualifier after the last tier, e.g. ", payable per day up to 30 days"
+    line: str
+    source_file: str
+    line_number: int
+
+    def sentence(self) -> str:
+        """The benefit restated for this plan only"""
+        return f"{self.benefit} {self.limit} for the {self.plan} plan{self.suffix}."
+
+
+class BenefitsIndex:
+    """Typed index of plan-tier limits parsed from the Benefits table files"""
+
+    def __init__(self, entries: List[BenefitEntry]):
+        self.entries = entries
+        self._by_product: Dict[str, List[Tuple[BenefitEntry, Set[str]]]] = {}
+        for entry in entries:
+            self._by_product.setdefault(entry.product.lower(), []).append((entry, _benefit_terms(entry.benefit, entry.product)))
+
+        # Inverse line frequency per product: qualifiers such as "covid-19" or
+        # "pre-existing" appear on few lines and weigh more than "under" or "coverage"
+        self._term_weights: Dict[str, Dict[str, float]] = {}
+        for product, candidates in self._by_product.items():
+            lines = {entry.line_number: terms for entry, terms in candidates}
+            frequency: Dict[str, int] = {}
+            for terms in lines.values():
+                for term in terms:
+                    frequency[term] = frequency.get(term, 0) + 1
+            self._term_weights[product] = {
+                term: math.log(1 + len(lines) / count) for term, count in frequency.items()
+            }
+
+    @classmethod
+    def from_directory(cls, directory: str) -> "BenefitsIndex":
+        """Parse every <Product>_Tables.txt file in a directory"""
+        entries: List[BenefitEntry] = []
+        for path in sorted(Path(directory).glob("*_Tables.txt")):
+            product = path.name[:-len("_Tables.txt")]
+            with open(path, 'r', encoding='utf-8') as f:
+                entries.extend(cls.parse(f.read(), product, path.name))
+        return cls(entries)
+
+    @staticmethod
+    def parse(content: str, product: str, source_file: str) -> List[BenefitEntry]:
+        """Parse one table file into plan-tier entries; lines without tiers are skipped"""
+        entries = []
+        table = None
+
+        for line_number, raw_line in enumerate(content.split('\n'), 1):
+            line = raw_line.strip()
+            if not line:
+                continue
+
+            # Table and section headings ("TABLE 2 FROM TRAVEL INSURANCE:", "Section 1 - ...:")
+            if line.endswith(':') or (line.isupper() and 'TABLE' in line):
+                table = line.rstrip(':')
+                continue
+
+            markers = list(_PLAN_MARKER.finditer(line))
+            if not markers:
+                continue
+
+            first_value_start = None
+            limits: Dict[str, str] = {}
+            previous_end = 0
+            for marker in markers:
+                plans = [PLAN_TIERS.get(name.lower()) for name in re.findall(_PLAN_NAME, marker.group(1))]
+                segment = line[previous_end:marker.start()]
+                previous_end = marker.end()
+                if not plans or None in plans:
+                    continue
+
+                if not limits:
+                    leads = list(_VALUE_LEAD.finditer(segment))
+                    value_start = leads[-1].end() if leads else 0
+                else:
+                    value_start = _VALUE_SEPARATOR.match(segment).end()
+                    leads = list(_VALUE_LEAD.finditer(segment, value_start))
+                    if leads:
+                        value_start = leads[-1].end()
+
+                value = segment[value_start:].strip(" ,;")
+                if not value or not _VALUE_TOKEN.search(value):
+                    continue
+
+                if first_value_start is None:
+                    first_value_start = value_start
+                for plan in plans:
+                    limits[plan] = value
+
+            if not limits:
+                continue
+
+            benefit = line[:first_value_start].strip()
+            suffix = line[previous_end:].rstrip('.').rstrip()
+            if suffix and not suffix.startswith((',', ';', ' (')):
+                suffix = ""
+
+            for plan, limit in limits.items():
+                entries.append(BenefitEntry(
+                    product=product, table=table, plan=plan, benefit=benefit, limit=limit,
+                    suffix=suffix, line=line, source_file=source_file, line_number=line_number
+                ))
+
+        return entries
+
+    def plans(self, product: str) -> Set[str]:
+        return {entry.plan for entry, _ in self._by_product.get(product.lower(), [])}
+
+    def candidates(self, product: str) -> List[Tuple[BenefitEntry, Set[str]]]:
+        return self._by_product.get(product.lower(), [])
+
+    def term_weights(self, product: str) -> Dict[str, float]:
+        return self._term_weights.get(product.lower(), {})
+
+
+class BenefitsLookupEngine:
+    """Answers single-figure Benefits table questions without calling Gemini"""
+
+    def __init__(self, index: BenefitsIndex):
+        self.index = index
+
+    @classmethod
+    def from_source(cls, source_dir: str = None) -> "BenefitsLookupEngine":
+        """Build the engine from Source/Benefits"""
+        return cls(BenefitsIndex.from_directory(str(Path(source_dir or Config.SOURCE_DIR) / "Benefits")))
+
+    def answer(self, query: str, product_focus: List[str]) -> Optional[ResponseResult]:
+        """
+        Answer a question directly from the benefits index
+
+        Args:
+            query: Customer question
+            product_focus: Products identified by the Intent Router
+
+        Returns:
+            ResponseResult with a cited answer, or None when the question is not
+            a clear single-benefit lookup
+        """
+        if not query or len(product_focus or []) != 1 or not _NUMERIC_QUESTION.search(query):
+            return None
+
+        product = product_focus[0]
+        candidates = self.index.candidates(product)
+        if not candidates:
+            return None
+
+        query_tokens = _TOKEN_PATTERN.findall(query.lower())
+        mentioned_plans = {PLAN_TIERS[token] for token in query_tokens if token in PLAN_TIERS}
+        mentioned_plans &= self.index.plans(product)
+        if len(mentioned_plans) > 1:
+            return None
+        plan = next(iter(mentioned_plans), None)
+
+        query_terms = _benefit_terms(query, product)
+        if not query_terms:
+            return None
+
+        # Rank benefit lines by how many question terms they contain, then by how
+        # little weight their unmatched (distinguishing) terms carry
+        weights = self.index.term_weights(product)
+        scored = {}
+        for entry, entry_terms in candidates:
+            if plan is not None and entry.plan != plan:
+                continue
+            matched_terms = query_terms & entry_terms
+            if not matched_terms:
+                continue
+            recall = len(matched_terms) / len(query_terms)
+            precision = (sum(weights.get(term, 0.0) for term in matched_terms) /
+                         sum(weights.get(term, 0.0) for term in entry_terms))
+            key = entry.line_number
+            if key not in scored or recall > scored[key][0]:
+                scored[key] = (recall, precision, entry)
+
+        if not scored:
+            return None
+
+        ranked = sorted(scored.values(), key=lambda item: (item[0], item[1]), reverse=True)
+        best_recall, best_precision, best = ranked[0]
+        if best_recall < MIN_TERM_RECALL:
+            return None
+
+        # Unsure if another line with a different figure matches nearly as well
+        best_qualifiers = _qualifiers(best.benefit)
+        for recall, precision, other in ranked[1:]:
+            if other.line == best.line:
+                continue
+            if best_recall - recall >= 0.2:
+                break
+            if recall == best_recall and _qualifiers(other.benefit) != best_qualifiers:
+                # e.g. the Adult and Child limits of the same benefit: the question does not say which
+                return None
+            if recall == best_recall and best_precision - precision >= 0.1:
+                continue
+            return None
+
+        answer = best.sentence() if plan else best.line.rstrip('.') + "."
+        if answer and answer[0].islower():
+            answer = answer[0].upper() + answer[1:]
+
+        citation = Citation(
+            id="cite_1",
+            product_name=best.product,
+            document_type="Benefits Summary",
+            source_file=best.source_file,
+            section_hierarchy=[best.table] if best.table else [],
+            relevance_score=round(best_recall, 2)
+        )
+
+        return ResponseResult(
+            answer=f"{answer} [1]",
+            citations=[citation],
+            confidence_score=round(best_recall, 2),
+            context_used=1,
+            context_available=1,
+            has_sufficient_context=True,
+            reasoning=(f"Answered directly from the {best.product} benefits table "
+                       f"({best.source_file}, line {best.line_number}) without LLM generation")
+        )
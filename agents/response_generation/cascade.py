@@ -0,0 +1,80 @@
+"""
+Per-tier statistics for the response model cascade
+
+In cascade mode every answer is first generated by the fast model and only
+re-generated by the strong model when its confidence is below the cascade
+threshold. These counters record how often each tier's answer is kept and
+how long each tier takes, so the threshold can be tuned against cost and
+p95 latency.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+class TierStats:
+    """Calls, accepted answers and recent latencies of one model tier"""
+
+    def __init__(self, model_name: str, window: int = 1000):
+        self.model_name = model_name
+        self.calls = 0
+        self.accepted = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=window)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "calls": self.calls,
+            "accepted": self.accepted,
+            "hit_rate": round(self.accepted / self.calls, 3) if self.calls else 0.0,
+            "p50_ms": round(self.percentile(0.50), 1),
+            "p95_ms": round(self.percentile(0.95), 1)
+        }
+
+
+class CascadeStats:
+    """Thread-safe per-tier counters for the fast/strong model cascade"""
+
+    def __init__(self, fast_model: str, strong_model: str, window: int = 1000):
+        """
+        Args:
+            fast_model: Model tried first
+            strong_model: Model used when the fast answer's confidence is too low
+            window: Recent latencies kept per tier for percentiles
+        """
+        self.tiers = {
+            "fast": TierStats(fast_model, window),
+            "strong": TierStats(strong_model, window)
+        }
+        self.requests = 0
+        self.escalated = 0
+        self._lock = threading.Lock()
+
+    def record(self, tier: str, latency_ms: float, accepted: bool):
+        """Record one generation by a tier and whether its answer was returned"""
+        with self._lock:
+            stats = self.tiers[tier]
+            stats.calls += 1
+            stats.latencies_ms.append(latency_ms)
+            if accepted:
+                stats.accepted += 1
+            if tier == "fast":
+                self.requests += 1
+                if not accepted:
+                    self.escalated += 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "escalated": self.escalated,
+                "escalation_rate": round(self.escalated / self.requests, 3) if self.requests else 0.0,
+                "tiers": {name: stats.to_dict() for name, stats in self.tiers.items()}
+            }
@@ -0,0 +1,172 @@
+"""
+Map-reduce comparison answers
+
+For comparisons across several products, each product's chunks are sent in
+their own short generation call (map) that lists the relevant aspects as
+"Aspect: detail <citation>" lines. The partial answers are merged without
+another LLM call into one comparison table (reduce), so generation time is
+bounded by the slowest product instead of the combined context.
+
+Every map call is given the same fixed aspect names, and labels that still
+differ are mapped onto them, so the products' lines meet in shared rows.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .models import CitationStyle
+
+
+COMPARISON_INSTRUCTION = """Customer Question: {query}
+
+List what the context says about {product} insurance for this question, one aspect per line, in the format:
+Aspect: detail {citation}
+Use only these aspect names, each at most once: {aspects}. Give 3 to 6 lines. Leave out aspects the context does not cover. Do not add any other text."""
+
+# Row labels shared by every product's map answer, in table order
+COMPARISON_ASPECTS = [
+    "Coverage", "Benefit limit", "Excess", "Waiting period", "Eligibility",
+    "Exclusions", "Premium", "Claims", "Policy period", "Optional add-ons"
+]
+
+# Other labels the model uses for the same aspects
+_ASPECT_SYNONYMS = {
+    "what is covered": "Coverage",
+    "covered": "Coverage",
+    "benefits": "Coverage",
+    "coverage limit": "Benefit limit",
+    "limit": "Benefit limit",
+    "limits": "Benefit limit",
+    "maximum limit": "Benefit limit",
+    "maximum benefit": "Benefit limit",
+    "sum insured": "Benefit limit",
+    "deductible": "Excess",
+    "waiting": "Waiting period",
+    "eligible": "Eligibility",
+    "age limit": "Eligibility",
+    "exclusion": "Exclusions",
+    "not covered": "Exclusions",
+    "premiums": "Premium",
+    "cost": "Premium",
+    "price": "Premium",
+    "claim": "Claims",
+    "claims process": "Claims",
+    "period of insurance": "Policy period",
+    "add ons": "Optional add-ons",
+    "add on": "Optional add-ons",
+    "optional benefits": "Optional add-ons",
+    "riders": "Optional add-ons",
+}
+
+# One marker of each citation style, shown in the map instruction's line format
+_CITATION_EXAMPLES = {
+    CitationStyle.NUMBERED: "[1]",
+    CitationStyle.INLINE: "(Source: Product Document Type)",
+    CitationStyle.FOOTNOTE: "¹",
+}
+
+MISSING_CELL = "Not stated"
+
+# "Coverage limit: $500,000 [1]", optionally bulleted or with the aspect in bold
+_ASPECT_LINE = re.compile(r"^\s*(?:[-*•]|\d+[.)])?\s*(?:\*\*)?([^:*\[\]]{2,60}?)(?:\*\*)?\s*:\s*(?:\*\*)?\s*(.+?)\s*$")
+
+
+def parse_partial_answer(text: str) -> List[Tuple[str, str]]:
+    """
+    Parse a map answer into (aspect, detail) pairs
+
+    Args:
+        text: Partial answer for one product
+
+    Returns:
+        Pairs in the order given; lines that are not "Aspect: detail" are skipped
+    """
+    pairs = []
+    for line in (text or "").splitlines():
+        match = _ASPECT_LINE.match(line)
+        if match:
+            pairs.append((match.group(1).strip(), match.group(2).strip()))
+    return pairs
+
+
+def format_comparison_instruction(query: str, product: str, citation_style: CitationStyle) -> str:
+    """Map instruction for one product, with the fixed aspect names and the request's citation style"""
+    return COMPARISON_INSTRUCTION.format(
+        query=query,
+        product=product,
+        citation=_CITATION_EXAMPLES.get(citation_style, "[1]"),
+        aspects=", ".join(COMPARISON_ASPECTS)
+    )
+
+
+def _aspect_key(aspect: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", aspect.lower()))
+
+
+_CANONICAL_ASPECTS = {_aspect_key(aspect): aspect for aspect in COMPARISON_ASPECTS}
+_CANONICAL_ASPECTS.update({_aspect_key(label): aspect for label, aspect in _ASPECT_SYNONYMS.items()})
+
+
+def canonical_aspect(aspect: str) -> str:
+    """The fixed aspect name a label stands for, or the label itself if it matches none"""
+    return _CANONICAL_ASPECTS.get(_aspect_key(aspect), aspect)
+
+
+def _cell(text: str) -> str:
+    return text.replace("|", "/").replace("\n", " ").strip()
+
+
+def build_comparison_table(products: List[str], partial_answers: Dict[str, Optional[str]]) -> str:
+    """
+    Merge per-product partial answers into a markdown comparison table
+
+    Labels are mapped onto the fixed aspect names; those rows come first in
+    COMPARISON_ASPECTS order, any other labels follow in the order they first
+    appear across products. Products are columns in the order given. A product whose answer has no
+    "Aspect: detail" lines contributes its whole answer as a Summary row.
+
+    Args:
+        products: Products to compare, in column order
+        partial_answers: Map answer per product (None when generation failed)
+
+    Returns:
+        Comparison answer with the table
+    """
+    rows: "OrderedDict[str, Tuple[str, Dict[str, str]]]" = OrderedDict()
+    for product in products:
+        answer = partial_answers.get(product)
+        pairs = parse_partial_answer(answer)
+        if not pairs and answer:
+            pairs = [("Summary", answer)]
+        for aspect, detail in pairs:
+            aspect = canonical_aspect(aspect)
+            key = _aspect_key(aspect)
+            if not key:
+                continue
+            label, cells = rows.setdefault(key, (aspect[:1].upper() + aspect[1:], {}))
+            cells[product] = f"{cells[product]}; {detail}" if product in cells else detail
+
+    if not rows:
+        return ""
+
+    order = {_aspect_key(aspect): position for position, aspect in enumerate(COMPARISON_ASPECTS)}
+    ordered_rows = sorted(rows.items(), key=lambda item: order.get(item[0], len(order)))
+
+    lines = [
+        f"Comparison of {', '.join(products[:-1])} and {products[-1]} insurance:",
+        "",
+        "| Aspect | " + " | ".join(products) + " |",
+        "|---" * (len(products) + 1) + "|"
+    ]
+    for _, (label, cells) in ordered_rows:
+        lines.append(f"| {_cell(label)} | " +
+                     " | ".join(_cell(cells.get(product, MISSING_CELL)) for product in products) + " |")
+
+    failed = [product for product in products if partial_answers.get(product) is None]
+    if failed:
+        lines.append("")
+        lines.append(f"Details for {', '.join(failed)} could not be generated; please ask about "
+                     f"{'it' if len(failed) == 1 else 'them'} separately.")
+
+    return "\n".join(lines)
@@ -0,0 +1,183 @@
+"""
+Token-budget-aware context packing
+
+Retrieved chunks are packed into the prompt in relevance order until a
+token budget is reached. Oversized chunks (typically long Terms sections)
+are trimmed to the paragraphs that best match the query instead of being
+sent in full, and chunks that no longer fit are dropped.
+
+Token counts are estimated locally (about four characters per token for
+Gemini models), so packing adds no API calls.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
+
+from agents.retrieval.models import ChunkResult
+from agents.retrieval.query_processor import query_processor
+from config import Config
+
+
+CHARS_PER_TOKEN = 4
+
+# Chunks with less room than this left in the budget are dropped, not trimmed
+MIN_USEFUL_TOKENS = 40
+
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WORD_PATTERN = re.compile(r"[a-z0-9]+(?:[&\-.][a-z0-9]+)*")
+
+
+def count_tokens(text: str) -> int:
+    """Estimated token count of a text"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+@dataclass
+class PackedChunk:
+    """A chunk as it will appear in the prompt"""
+    chunk: ChunkResult
+    content: str
+    tokens: int
+    trimmed: bool = False
+
+
+@dataclass
+class PackedContext:
+    """Result of packing retrieved chunks into a token budget"""
+    chunks: List[PackedChunk] = field(default_factory=list)
+    tokens_used: int = 0
+    tokens_original: int = 0
+    dropped: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.tokens_original - self.tokens_used)
+
+    @property
+    def trimmed(self) -> int:
+        return sum(1 for packed in self.chunks if packed.trimmed)
+
+
+class ContextPacker:
+    """Fills a prompt token budget with the most relevant chunk content"""
+
+    def __init__(self,
+                 token_budget: int = None,
+                 max_chunk_tokens: int = None):
+        """
+        Args:
+            token_budget: Total tokens available for context (defaults to Config.CONTEXT_TOKEN_BUDGET)
+            max_chunk_tokens: Tokens above which a single chunk is trimmed (defaults to Config.CONTEXT_MAX_CHUNK_TOKENS)
+        """
+        self.token_budget = token_budget or Config.CONTEXT_TOKEN_BUDGET
+        self.max_chunk_tokens = max_chunk_tokens or Config.CONTEXT_MAX_CHUNK_TOKENS
+
+    def pack(self, query: str, chunks: List[ChunkResult], token_budget: int = None) -> PackedContext:
+        """
+        Pack chunks into the token budget by relevance
+
+        Args:
+            query: Customer question, used to pick paragraphs when trimming
+            chunks: Retrieved chunks
+            token_budget: Budget for this request (defaults to the packer's budget)
+
+        Returns:
+            PackedContext with the chunks to send, in their original retrieval order
+        """
+        packed = PackedContext()
+        query_terms = set(query_processor.process(query).cache_key.split())
+
+        # Budget goes to the most relevant chunks first; the prompt keeps the
+        # retrieval order (comparison results are interleaved per product)
+        ranked = sorted(range(len(chunks)), key=lambda i: chunks[i].relevance_score or 0.0, reverse=True)
+        selected = {}
+        remaining = token_budget or self.token_budget
+
+        for position in ranked:
+            chunk = chunks[position]
+            header_tokens = self._header_tokens(chunk)
+            content_tokens = count_tokens(chunk.content)
+            packed.tokens_original += header_tokens + content_tokens
+
+            room = min(self.max_chunk_tokens, remaining - header_tokens)
+
+            # Always keep the best chunk, even if it has to be trimmed hard
+            if room < MIN_USEFUL_TOKENS and selected:
+                packed.dropped += 1
+                continue
+
+            if content_tokens <= room:
+                content, tokens, trimmed = chunk.content, content_tokens, False
+            else:
+                content = self._trim_to_budget(chunk.content, query_terms, max(room, MIN_USEFUL_TOKENS))
+                tokens, trimmed = count_tokens(content), True
+
+            selected[position] = PackedChunk(chunk=chunk, content=content, tokens=tokens, trimmed=trimmed)
+            packed.tokens_used += header_tokens + tokens
+            remaining -= header_tokens + tokens
+
+        packed.chunks = [selected[position] for position in sorted(selected)]
+        return packed
+
+    def stable(self, chunks: List[ChunkResult]) -> PackedContext:
+        """
+        Every chunk whole (before compression) in chunk_id order
+
+        Nothing in this layout depends on the question or on the retrieval
+        order, so the same chunks always give the same prompt prefix.
+        """
+        packed = PackedContext()
+        ordered = sorted(chunks, key=lambda chunk: chunk.chunk_id or chunk.content)
+        for chunk in ordered:
+            content = chunk.full_content or chunk.content
+            tokens = count_tokens(content)
+            packed.chunks.append(PackedChunk(chunk=chunk, content=content, tokens=tokens, trimmed=False))
+            packed.tokens_used += self._header_tokens(chunk) + tokens
+        packed.tokens_original = packed.tokens_used
+        return packed
+
+    def _header_tokens(self, chunk: ChunkResult) -> int:
+        """Tokens of the source/citation lines wrapped around each chunk in the prompt"""
+        header = f"Source 10: {chunk.product_name} {chunk.document_type}"
+        if chunk.section_hierarchy:
+            header += f" - {' > '.join(chunk.section_hierarchy)}"
+        return count_tokens(header + "\nContent: \nCitation: [10]\n---\n")
+
+    def _trim_to_budget(self, content: str, query_terms: Set[str], budget: int) -> str:
+        """Keep the paragraphs that best match the query, in their original order"""
+        separator = "\n\n"
+        segments = [p.strip() for p in _PARAGRAPH_SPLIT.split(content) if p.strip()]
+        if len(segments) <= 1:
+            separator = "\n"
+            segments = [s.strip() for s in content.splitlines() if s.strip()]
+        if len(segments) <= 1:
+            separator = " "
+            segments = [s.strip() for s in _SENTENCE_SPLIT.split(content) if s.strip()]
+        if not segments:
+            return content
+
+        scored = []
+        for position, segment in enumerate(segments):
+            overlap = len(query_terms.intersection(_WORD_PATTERN.findall(segment.lower())))
+            scored.append((overlap, -position, segment))
+
+        selected: List[Optional[str]] = [None] * len(segments)
+        used = 0
+        for overlap, negative_position, segment in sorted(scored, reverse=True):
+            tokens = count_tokens(segment) + 1
+            if used + tokens > budget:
+                continue
+            selected[-negative_position] = segment
+            used += tokens
+
+        kept = [segment for segment in selected if segment is not None]
+        if kept:
+            return separator.join(kept)
+
+        # A single segment larger than the budget: cut it at a word boundary
+        best_segment = max(scored)[2]
+        cut = best_segment[:budget * CHARS_PER_TOKEN]
+        return cut.rsplit(" ", 1)[0] if " " in cut else cut
@@ -107,6 +107,14 @@ class ResponseRequest:
     max_response_length: int = 1000
     include_confidence_score: bool = True
     confidence_config: ConfidenceConfig = None
+
+    # Per-channel overrides (None uses the agent's defaults)
+    response_model: Optional[str] = None
+    max_output_tokens: Optional[int] = None
+    context_token_budget: Optional[int] = None
+
+    # Comparison question (products are answered separately and merged when there are enough of them)
+    is_comparison: bool = False
     
     @property
     def has_context(self) -> bool:
@@ -161,6 +169,7 @@ class ResponseResult:
     context_available: int
     has_sufficient_context: bool
     reasoning: str
+    tokens_saved: int = 0  # Context tokens removed by packing before generation
     
     def format_response(self, include_citations: bool = True, include_confidence: bool = False) -> str:
         """Format the complete response with citations"""
@@ -177,8 +186,8 @@ class ResponseResult:
         
         return "\n".join(response_parts)
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for API responses"""
+    def to_dict(self, include_formatted_response: bool = True) -> Dict[str, Any]:
+        """Convert to dictionary for API responses (formatted_response is None when not built)"""
         return {
             "answer": self.answer,
             "citations": [
@@ -197,5 +206,7 @@ class ResponseResult:
             "context_available": self.context_available,
             "has_sufficient_context": self.has_sufficient_context,
             "reasoning": self.reasoning,
-            "formatted_response": self.format_response(include_citations=True, include_confidence=True)
+            "tokens_saved": self.tokens_saved,
+            "formatted_response": (self.format_response(include_citations=True, include_confidence=True)
+                                   if include_formatted_response else None)
         }
@@ -0,0 +1,190 @@
+"""
+Gemini explicit context caching for response generation
+
+The system instruction and the packed context are the stable prefix of
+every generation prompt; only the customer question varies. When the same
+context (popular chunks) is sent repeatedly, that prefix is stored once as
+a Gemini CachedContent and later requests send only the question, so the
+cached tokens are billed at the reduced cached rate and not reprocessed.
+
+A cache entry is created only after a context has been seen min_uses times
+and is long enough to meet the API's minimum cacheable size. If the model
+does not support explicit caching, creation is disabled and generation falls
+back to the stable-prefix prompt (which still benefits from implicit caching
+on models that support it). A prefix the API rejects as too small raises the
+minimum to the one it reports; any other failure (quota, server errors) only
+pauses creation with exponential backoff.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from google.generativeai import caching
+
+# "Cached content is too small. total_token_count=..., min_total_token_count=4096"
+_MIN_TOKENS_PATTERN = re.compile(r"min_total_token_count\D*(\d+)")
+
+
+class PromptCache:
+    """Creates and reuses CachedContent objects for repeated prompt prefixes"""
+
+    def __init__(self,
+                 model_name: str,
+                 generation_config: Dict[str, Any],
+                 ttl_seconds: int = 900,
+                 min_tokens: int = 4096,
+                 min_uses: int = 2,
+                 max_entries: int = 32,
+                 max_backoff_seconds: int = 300):
+        """
+        Args:
+            model_name: Gemini model the cached content is created for
+            generation_config: Generation settings for models built from the cache
+            ttl_seconds: Lifetime of each cached content on the server
+            min_tokens: Smallest prefix (estimated tokens) to cache; the API minimum by default
+            min_uses: Times a prefix must be seen before it is cached
+            max_entries: Cached contents kept alive at once (oldest are deleted)
+            max_backoff_seconds: Longest pause in cache creation after transient failures
+        """
+        self.model_name = model_name
+        self.generation_config = generation_config
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = min_tokens
+        self.min_uses = min_uses
+        self.max_entries = max_entries
+        self.max_backoff_seconds = max_backoff_seconds
+        self.enabled = True
+
+        self._failures = 0
+        self._retry_at = 0.0
+
+        self._uses: "OrderedDict[str, int]" = OrderedDict()
+        self._entries: "OrderedDict[str, Tuple[caching.CachedContent, genai.GenerativeModel, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.created = 0
+        self.reused = 0
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        return hashlib.sha1("\x00".join(parts).encode('utf-8')).hexdigest()
+
+    def get_model(self, system_instruction: str, prefix: str, prefix_tokens: int) -> Optional[genai.GenerativeModel]:
+        """
+        Model bound to a cached copy of the prefix, or None to send the full prompt
+
+        Args:
+            system_instruction: Static instructions stored with the cached content
+            prefix: Stable leading part of the user prompt (the packed context)
+            prefix_tokens: Estimated token count of system instruction plus prefix
+        """
+        if not self.enabled or prefix_tokens < self.min_tokens:
+            return None
+
+        key = self.make_key(self.model_name, system_instruction, prefix)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            # Leave a margin so a cache never expires between lookup and generation
+            if entry is not None and entry[2] - 30 > now:
+                self._entries.move_to_end(key)
+                self.reused += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+
+            uses = self._uses.pop(key, 0) + 1
+            self._uses[key] = uses
+            while len(self._uses) > self.max_entries * 16:
+                self._uses.popitem(last=False)
+
+            if uses < self.min_uses or now < self._retry_at:
+                return None
+
+        try:
+            cached_content = caching.CachedContent.create(
+                model=self.model_name,
+                display_name=f"hlas-context-{key[:12]}",
+                system_instruction=system_instruction,
+                contents=[prefix],
+                ttl=timedelta(seconds=self.ttl_seconds)
+            )
+            model = genai.GenerativeModel.from_cached_content(
+                cached_content,
+                generation_config=self.generation_config
+            )
+        except Exception as e:
+            self._creation_failed(e)
+            return None
+
+        evicted = []
+        with self._lock:
+            self._entries[key] = (cached_content, model, now + self.ttl_seconds)
+            self.created += 1
+            self._failures = 0
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[1][0])
+
+        for old_content in evicted:
+            self._delete(old_content)
+
+        print(f"🗄️ PromptCache: Cached {prefix_tokens} prompt tokens ({cached_content.name})")
+        return model
+
+    def _creation_failed(self, error: Exception):
+        """Disable caching for an unsupported model, raise a too-small minimum, back off otherwise"""
+        message = str(error)
+        if isinstance(error, google_exceptions.NotFound) or (
+                isinstance(error, google_exceptions.InvalidArgument)
+                and ("not supported" in message or "does not support" in message)):
+            print(f"⚠️ PromptCache: Explicit context caching unavailable for {self.model_name}, disabling: {error}")
+            self.enabled = False
+            return
+
+        if isinstance(error, google_exceptions.InvalidArgument) and "too small" in message:
+            minimum = _MIN_TOKENS_PATTERN.search(message)
+            if minimum is None:
+                print(f"⚠️ PromptCache: Cached content too small for {self.model_name}, disabling: {error}")
+                self.enabled = False
+                return
+            self.min_tokens = max(self.min_tokens, int(minimum.group(1)))
+            print(f"⚠️ PromptCache: Prefix too small to cache, caching only prefixes of {self.min_tokens}+ tokens")
+            return
+
+        with self._lock:
+            self._failures += 1
+            delay = min(self.max_backoff_seconds, 2 ** self._failures)
+            self._retry_at = time.monotonic() + delay
+        print(f"⚠️ PromptCache: Could not create cached content, retrying in {delay}s: {error}")
+
+    def clear(self):
+        """Delete every cached content created by this process"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            self._uses.clear()
+        for cached_content, _, _ in entries:
+            self._delete(cached_content)
+
+    @staticmethod
+    def _delete(cached_content):
+        try:
+            cached_content.delete()
+        except Exception as e:
+            print(f"⚠️ PromptCache: Could not delete cached content: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "created": self.created,
+            "reused": self.reused
+        }
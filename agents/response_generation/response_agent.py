@@ -6,13 +6,31 @@ with proper citations. It follows strict principles of being grounded in truth,
 traceable, and honest about limitations.
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from config import Config
 from .models import ResponseRequest, ResponseResult, Citation, CitationStyle, ConfidenceConfig
+from .context_packer import ContextPacker, PackedChunk, count_tokens
+from .prompt_cache import PromptCache
+from .cascade import CascadeStats
+from .answer_analyzer import answer_analyzer
+from .comparison import build_comparison_table, format_comparison_instruction
 from agents.retrieval.models import ChunkResult
 
 
+# Static rules, sent as the system instruction so they form a reusable prompt prefix
+SYSTEM_INSTRUCTION = """You are an insurance customer service assistant. Your job is to answer customer questions based ONLY on the provided insurance document context. Follow these strict rules:
+
+1. ONLY use information from the provided context - never use external knowledge
+2. If the context doesn't contain enough information to answer the question, say so clearly
+3. Use clear, simple language that customers can understand
+4. Cite every piece of information using the citation format: {citation_instruction}
+5. Be direct and helpful
+6. If multiple products are mentioned, clearly distinguish between them"""
+
+
 class ResponseGenerationAgent:
     """
     Agent responsible for generating human-readable responses from retrieved context chunks.
@@ -45,16 +63,31 @@ class ResponseGenerationAgent:
             "max_output_tokens": 1024,
         }
 
-        # Initialize the model
+        # Initialize the model (one per citation style, each with its own system instruction)
+        self.model_name = Config.RESPONSE_MODEL
+        self._models: Dict[Tuple[str, int, CitationStyle], Any] = {}
         try:
-            self.model = genai.GenerativeModel(
-                model_name="gemini-2.0-flash-exp",
-                generation_config=self.generation_config
-            )
+            self.model = self._get_model(CitationStyle.NUMBERED)
             print("✅ ResponseGenerationAgent: Gemini model initialized")
         except Exception as e:
             print(f"❌ ResponseGenerationAgent: Failed to initialize Gemini model: {str(e)}")
             raise
+
+        # Explicit context caching of the system instruction + context prefix (one cache per model)
+        self._prompt_caches: Dict[Tuple[str, int], PromptCache] = {}
+        self.prompt_cache = self._get_prompt_cache(self.model_name)
+
+        # Cascade mode: answer with the fast model, escalate to RESPONSE_MODEL on low confidence
+        self.fast_model_name = Config.RESPONSE_FAST_MODEL
+        self.cascade_threshold = Config.RESPONSE_CASCADE_THRESHOLD
+        self.cascade_stats = None
+        if self.fast_model_name and self.fast_model_name != self.model_name:
+            self.cascade_stats = CascadeStats(self.fast_model_name, self.model_name)
+            print(f"✅ ResponseGenerationAgent: Cascade mode {self.fast_model_name} -> {self.model_name} "
+                  f"(escalate below confidence {self.cascade_threshold})")
+
+        # Fits retrieved chunks into the prompt token budget
+        self.context_packer = ContextPacker()
     
     def generate_response(self, request: ResponseRequest) -> ResponseResult:
         """
@@ -83,15 +116,43 @@ class ResponseGenerationAgent:
         if not request.has_context:
             return self._generate_no_context_response(request)
         
-        # Step 2: Create citations from context chunks
-        citations = self._create_citations(request.context_chunks)
-        
-        # Step 3: Prepare context for the LLM
-        context_text = self._prepare_context_text(request.context_chunks, citations, request.citation_style)
-        
-        # Step 4: Generate the response using LLM
+        # Comparisons across several products are answered per product and merged
+        if request.is_comparison:
+            products = list(dict.fromkeys(chunk.product_name for chunk in request.context_chunks))
+            if len(products) >= Config.COMPARISON_MAP_REDUCE_MIN_PRODUCTS:
+                return self._generate_comparison_response(request, products)
+
+        # Step 2: Lay out the context. The untrimmed chunks in chunk_id order do not depend on
+        # the question, so once that prefix has been seen often enough it is served from the
+        # explicit context cache; otherwise the chunks are packed into the prompt token budget
+        cascaded = self.cascade_stats is not None and request.response_model is None
+        first_model = self.fast_model_name if cascaded else (request.response_model or self.model_name)
+        packed = self.context_packer.stable(request.context_chunks)
+        citations = self._create_citations([packed_chunk.chunk for packed_chunk in packed.chunks])
+        context_text = self._prepare_context_text(packed.chunks, citations, request.citation_style)
+        cached_model = self._get_cached_model(context_text, request.citation_style, first_model,
+                                              request.max_output_tokens)
+
+        if cached_model is None:
+            # Step 3: Pack the chunks into the prompt token budget and cite the packed chunks
+            packed = self.context_packer.pack(request.original_query, request.context_chunks, request.context_token_budget)
+            citations = self._create_citations([packed_chunk.chunk for packed_chunk in packed.chunks])
+            context_text = self._prepare_context_text(packed.chunks, citations, request.citation_style)
+        print(f"📦 ResponseGenerationAgent: Context {packed.tokens_used}/{packed.tokens_original} tokens "
+              f"(saved {packed.tokens_saved}, trimmed {packed.trimmed}, dropped {packed.dropped}, "
+              f"{'cached prefix' if cached_model is not None else 'packed'})")
+
+        # Step 4: Generate the response using LLM (fast model first in cascade mode)
+        config = request.confidence_config or ConfidenceConfig()
+        confidence_score = None
         try:
-            answer = self._generate_answer(request.original_query, context_text, request.citation_style)
+            if cascaded:
+                answer, confidence_score, has_sufficient_context = self._generate_cascaded_answer(
+                    request, context_text, config, cached_model
+                )
+            else:
+                answer = self._generate_answer(request.original_query, context_text, request.citation_style,
+                                               request.response_model, request.max_output_tokens, cached_model)
             if not answer or not isinstance(answer, str):
                 raise ValueError("LLM returned invalid response")
         except Exception as e:
@@ -102,15 +163,16 @@ class ResponseGenerationAgent:
                 context_used=0,
                 context_available=len(request.context_chunks),
                 has_sufficient_context=False,
-                reasoning=f"Error during response generation: {str(e)}"
+                reasoning=f"Error during response generation: {str(e)}",
+                tokens_saved=packed.tokens_saved
             )
         
-        # Step 5: Calculate confidence score
-        config = request.confidence_config or ConfidenceConfig()
-        confidence_score = self._calculate_confidence_score(request.context_chunks, answer, config)
-        
-        # Step 6: Determine if context is sufficient
-        has_sufficient_context = self._assess_context_sufficiency(request.original_query, request.context_chunks, answer, config)
+        if confidence_score is None:
+            # Step 5: Calculate confidence score
+            confidence_score = self._calculate_confidence_score(request.context_chunks, answer, config)
+
+            # Step 6: Determine if context is sufficient
+            has_sufficient_context = self._assess_context_sufficiency(request.original_query, request.context_chunks, answer, config)
         
         # Step 7: Generate reasoning
         reasoning = self._generate_reasoning(request, answer, confidence_score, has_sufficient_context)
@@ -122,9 +184,37 @@ class ResponseGenerationAgent:
             context_used=len([c for c in citations if self._citation_used_in_answer(c, answer)]),
             context_available=len(request.context_chunks),
             has_sufficient_context=has_sufficient_context,
-            reasoning=reasoning
+            reasoning=reasoning,
+            tokens_saved=packed.tokens_saved
         )
     
+    def generate_faq_response(self, request: ResponseRequest) -> ResponseResult:
+        """
+        Return a matched FAQ answer as written, without LLM generation
+
+        Args:
+            request: ResponseRequest whose single context chunk is the matched FAQ
+                     (relevance_score = question similarity)
+
+        Returns:
+            ResponseResult with the stored FAQ answer and its citation
+        """
+        faq_chunk = request.context_chunks[0]
+        citations = self._create_citations([faq_chunk])
+        citation_marker = citations[0].format_citation(request.citation_style, 1)
+
+        return ResponseResult(
+            answer=f"{faq_chunk.content.strip()} {citation_marker}",
+            citations=citations,
+            confidence_score=round(faq_chunk.relevance_score, 2),
+            context_used=1,
+            context_available=1,
+            has_sufficient_context=True,
+            reasoning=(f"Answered with the stored {faq_chunk.product_name} FAQ answer to "
+                       f"'{faq_chunk.question}' (question similarity {faq_chunk.relevance_score:.2f}) "
+                       f"without LLM generation")
+        )
+
     def _generate_no_context_response(self, request: ResponseRequest) -> ResponseResult:
         """Generate response when no context is available"""
         answer = (
@@ -160,11 +250,13 @@ class ResponseGenerationAgent:
         
         return citations
     
-    def _prepare_context_text(self, context_chunks: List[ChunkResult], citations: List[Citation], citation_style: CitationStyle) -> str:
-        """Prepare context text with citations for the LLM"""
+    def _prepare_context_text(self, packed_chunks: List[PackedChunk], citations: List[Citation],
+                              citation_style: CitationStyle, start: int = 1) -> str:
+        """Prepare context text with citations for the LLM (numbered from start)"""
         context_parts = []
         
-        for i, (chunk, citation) in enumerate(zip(context_chunks, citations), 1):
+        for i, (packed_chunk, citation) in enumerate(zip(packed_chunks, citations), start):
+            chunk = packed_chunk.chunk
             citation_marker = citation.format_citation(citation_style, i)
             
             # Add source information
@@ -173,38 +265,267 @@ class ResponseGenerationAgent:
                 source_info += f" - {' > '.join(chunk.section_hierarchy)}"
             
             context_parts.append(f"{source_info}")
-            context_parts.append(f"Content: {chunk.content}")
+            context_parts.append(f"Content: {packed_chunk.content}")
             context_parts.append(f"Citation: {citation_marker}")
             context_parts.append("---")
         
         return "\n".join(context_parts)
     
-    def _generate_answer(self, query: str, context_text: str, citation_style: CitationStyle) -> str:
-        """Generate answer using the LLM"""
-        
-        citation_instruction = self._get_citation_instruction(citation_style)
-        
-        prompt = f"""You are an insurance customer service assistant. Your job is to answer customer questions based ONLY on the provided insurance document context. Follow these strict rules:
+    def _generate_comparison_response(self, request: ResponseRequest, products: List[str]) -> ResponseResult:
+        """
+        Answer a multi-product comparison by map-reduce
 
-1. ONLY use information from the provided context - never use external knowledge
-2. If the context doesn't contain enough information to answer the question, say so clearly
-3. Use clear, simple language that customers can understand
-4. Cite every piece of information using the citation format: {citation_instruction}
-5. Be direct and helpful
-6. If multiple products are mentioned, clearly distinguish between them
+        Each product's chunks are packed into their own budget and answered in a
+        short, concurrent "Aspect: detail" call; the partial answers are merged
+        into one comparison table without a further LLM call. Citation numbers
+        run across all products, so the table's markers match the citation list.
 
-Customer Question: {query}
+        Args:
+            request: Comparison request whose chunks cover the products
+            products: Products in the order their chunks were retrieved
 
-Context from Insurance Documents:
-{context_text}
+        Returns:
+            ResponseResult with the comparison table
+        """
+        budget = Config.COMPARISON_PRODUCT_TOKEN_BUDGET
+        if request.context_token_budget:
+            budget = min(budget, max(1, request.context_token_budget // len(products)))
+        max_output_tokens = min(Config.COMPARISON_PARTIAL_MAX_TOKENS,
+                                request.max_output_tokens or Config.COMPARISON_PARTIAL_MAX_TOKENS)
+        model_name = request.response_model or self.model_name
+
+        # Map inputs: packed chunks per product, numbered consecutively across products
+        packed_by_product = {}
+        tokens_saved = 0
+        for product in products:
+            product_chunks = [chunk for chunk in request.context_chunks if chunk.product_name == product]
+            packed = self.context_packer.pack(request.original_query, product_chunks, budget)
+            packed_by_product[product] = packed.chunks
+            tokens_saved += packed.tokens_saved
+
+        citations = self._create_citations([packed_chunk.chunk for product in products
+                                            for packed_chunk in packed_by_product[product]])
+        map_inputs = {}
+        offset = 0
+        for product in products:
+            packed_chunks = packed_by_product[product]
+            context_text = self._prepare_context_text(packed_chunks, citations[offset:offset + len(packed_chunks)],
+                                                      request.citation_style, start=offset + 1)
+            map_inputs[product] = context_text
+            offset += len(packed_chunks)
+
+        def answer_product(product: str) -> Tuple[Optional[str], float]:
+            started = time.perf_counter()
+            try:
+                partial = self._generate(
+                    f"Context from Insurance Documents:\n{map_inputs[product]}",
+                    format_comparison_instruction(request.original_query, product, request.citation_style),
+                    request.citation_style, model_name, max_output_tokens
+                )
+            except Exception as e:
+                print(f"⚠️ ResponseGenerationAgent: Comparison answer for {product} failed: {e}")
+                partial = None
+            return partial, (time.perf_counter() - started) * 1000
+
+        # Map: one call per product, all in flight at once
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(products)) as executor:
+            results = dict(zip(products, executor.map(answer_product, products)))
+        total_ms = (time.perf_counter() - started) * 1000
+        partial_answers = {product: partial for product, (partial, _) in results.items()}
+        slowest_ms = max(latency_ms for _, latency_ms in results.values())
+        print(f"🧩 ResponseGenerationAgent: Compared {len(products)} products in {total_ms:.0f}ms "
+              f"(slowest product {slowest_ms:.0f}ms)")
+
+        # Reduce: deterministic merge into one table
+        answer = build_comparison_table(products, partial_answers)
+        if not answer:
+            return ResponseResult(
+                answer="I apologize, but I encountered an error while processing your question. Please try again or contact customer service.",
+                citations=citations,
+                confidence_score=0.0,
+                context_used=0,
+                context_available=len(request.context_chunks),
+                has_sufficient_context=False,
+                reasoning="Error during comparison generation: no product answer could be generated.",
+                tokens_saved=tokens_saved
+            )
+
+        config = request.confidence_config or ConfidenceConfig()
+        confidence_score = self._calculate_confidence_score(request.context_chunks, answer, config)
+        has_sufficient_context = self._assess_context_sufficiency(request.original_query, request.context_chunks, answer, config)
+        reasoning = self._generate_reasoning(request, answer, confidence_score, has_sufficient_context)
+
+        return ResponseResult(
+            answer=answer,
+            citations=citations,
+            confidence_score=confidence_score,
+            context_used=len([c for c in citations if self._citation_used_in_answer(c, answer)]),
+            context_available=len(request.context_chunks),
+            has_sufficient_context=has_sufficient_context,
+            reasoning=reasoning,
+            tokens_saved=tokens_saved
+        )
+
+    def _generate_cascaded_answer(self, request: ResponseRequest, context_text: str,
+                                  config: ConfidenceConfig, cached_model=None) -> Tuple[str, float, bool]:
+        """
+        Answer with the fast model, re-generating with the strong model on low confidence
+
+        Args:
+            request: The response request
+            context_text: Prepared context with citation markers
+            config: Confidence scoring configuration
+            cached_model: Fast model bound to the cached context prefix, if the context is cached
+
+        Returns:
+            (answer, confidence_score, has_sufficient_context) of the answer returned
+        """
+        tiers = [("fast", self.fast_model_name), ("strong", self.model_name)]
+        for tier, model_name in tiers:
+            started = time.perf_counter()
+            # The strong model looks up its own cache for the same stable prefix
+            answer = self._generate_answer(request.original_query, context_text, request.citation_style,
+                                           model_name, request.max_output_tokens,
+                                           cached_model if tier == "fast" else None,
+                                           cacheable=cached_model is not None)
+            latency_ms = (time.perf_counter() - started) * 1000
+
+            confidence_score = self._calculate_confidence_score(request.context_chunks, answer, config)
+            has_sufficient_context = self._assess_context_sufficiency(
+                request.original_query, request.context_chunks, answer, config
+            )
+            accepted = tier == "strong" or (confidence_score >= self.cascade_threshold and has_sufficient_context)
+            self.cascade_stats.record(tier, latency_ms, accepted)
+
+            print(f"🪜 ResponseGenerationAgent: {tier} model {model_name} answered in {latency_ms:.0f}ms "
+                  f"(confidence {confidence_score:.2f}, sufficient {has_sufficient_context})"
+                  f"{'' if accepted else ', escalating'}")
+            if accepted:
+                return answer, confidence_score, has_sufficient_context
+
+    def get_cascade_stats(self) -> Optional[Dict[str, Any]]:
+        """Per-tier hit rates and latency percentiles, or None when cascade mode is off"""
+        return self.cascade_stats.summary() if self.cascade_stats is not None else None
+
+    def get_prompt_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Explicit context cache counters per model and output limit"""
+        return {f"{model_name}/{max_output_tokens}": prompt_cache.stats()
+                for (model_name, max_output_tokens), prompt_cache in list(self._prompt_caches.items())}
+
+    def _get_generation_config(self, max_output_tokens: int = None) -> Dict[str, Any]:
+        if not max_output_tokens or max_output_tokens == self.generation_config["max_output_tokens"]:
+            return self.generation_config
+        return {**self.generation_config, "max_output_tokens": max_output_tokens}
+
+    def _get_model(self, citation_style: CitationStyle, model_name: str = None, max_output_tokens: int = None):
+        """Model whose system instruction carries the rules for this citation style"""
+        model_name = model_name or self.model_name
+        generation_config = self._get_generation_config(max_output_tokens)
+        key = (model_name, generation_config["max_output_tokens"], citation_style)
+        model = self._models.get(key)
+        if model is None:
+            model = genai.GenerativeModel(
+                model_name=model_name,
+                generation_config=generation_config,
+                system_instruction=self._get_system_instruction(citation_style)
+            )
+            self._models[key] = model
+        return model
+
+    def _get_prompt_cache(self, model_name: str, max_output_tokens: int = None) -> PromptCache:
+        """Explicit context cache for a model (cached contents are bound to one model)"""
+        generation_config = self._get_generation_config(max_output_tokens)
+        key = (model_name, generation_config["max_output_tokens"])
+        prompt_cache = self._prompt_caches.get(key)
+        if prompt_cache is None:
+            prompt_cache = PromptCache(
+                model_name=model_name,
+                generation_config=generation_config,
+                ttl_seconds=Config.PROMPT_CACHE_TTL_SECONDS,
+                min_tokens=Config.PROMPT_CACHE_MIN_TOKENS,
+                min_uses=Config.PROMPT_CACHE_MIN_USES
+            )
+            self._prompt_caches[key] = prompt_cache
+        return prompt_cache
+
+    def _get_system_instruction(self, citation_style: CitationStyle) -> str:
+        return SYSTEM_INSTRUCTION.format(citation_instruction=self._get_citation_instruction(citation_style))
+
+    def _generate_answer(self, query: str, context_text: str, citation_style: CitationStyle,
+                         model_name: str = None, max_output_tokens: int = None,
+                         cached_model=None, cacheable: bool = False) -> str:
+        """
+        Generate answer using the LLM (RESPONSE_MODEL and the default output limit unless given)
+
+        cached_model is a model already bound to this context; with cacheable the
+        context is a stable prefix that may be looked up in the model's prompt cache.
+        """
+        model_name = model_name or self.model_name
+
+        # Stable context first, variable question last, so the prefix is reusable
+        context_prompt = self._context_prompt(context_text)
+
+        question_prompt = f"""Customer Question: {query}
 
 Answer the customer's question based ONLY on the provided context. Include proper citations for every fact you mention."""
 
         try:
-            response = self.model.generate_content(prompt)
-            return response.text.strip()
+            return self._generate(context_prompt, question_prompt, citation_style, model_name, max_output_tokens,
+                                  cached_model, cacheable)
         except Exception as e:
             return f"I apologize, but I encountered an error while processing your question. Please try again or contact customer service. (Error: {str(e)})"
+
+    @staticmethod
+    def _context_prompt(context_text: str) -> str:
+        return f"""Context from Insurance Documents:
+{context_text}"""
+
+    def _get_cached_model(self, context_text: str, citation_style: CitationStyle, model_name: str,
+                          max_output_tokens: int = None):
+        """Model bound to a cached copy of the system instruction and context, or None to send it in full"""
+        system_instruction = self._get_system_instruction(citation_style)
+        context_prompt = self._context_prompt(context_text)
+        return self._get_prompt_cache(model_name, max_output_tokens).get_model(
+            system_instruction,
+            context_prompt,
+            count_tokens(system_instruction) + count_tokens(context_prompt)
+        )
+
+    def _generate(self, context_prompt: str, question_prompt: str, citation_style: CitationStyle,
+                  model_name: str, max_output_tokens: int = None,
+                  cached_model=None, cacheable: bool = False) -> str:
+        """
+        Send context and question to the model; raises on API errors
+
+        Only a question-independent context (cacheable) goes through the prompt
+        cache; a packed context is trimmed for this question and sent in full.
+        """
+        if cached_model is None and cacheable:
+            system_instruction = self._get_system_instruction(citation_style)
+            cached_model = self._get_prompt_cache(model_name, max_output_tokens).get_model(
+                system_instruction,
+                context_prompt,
+                count_tokens(system_instruction) + count_tokens(context_prompt)
+            )
+        if cached_model is not None:
+            response = cached_model.generate_content(question_prompt)
+        else:
+            response = self._get_model(citation_style, model_name, max_output_tokens).generate_content(
+                f"{context_prompt}\n\n{question_prompt}"
+            )
+        self._log_token_usage(response)
+        return response.text.strip()
+
+    def _log_token_usage(self, response):
+        """Log prompt, cached and output token counts reported by the API"""
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is None:
+            return
+        prompt_tokens = getattr(usage, 'prompt_token_count', 0) or 0
+        cached_tokens = getattr(usage, 'cached_content_token_count', 0) or 0
+        output_tokens = getattr(usage, 'candidates_token_count', 0) or 0
+        print(f"🧮 ResponseGenerationAgent: Tokens - prompt {prompt_tokens} (cached {cached_tokens}), output {output_tokens}")
     
     def _get_citation_instruction(self, citation_style: CitationStyle) -> str:
         """Get citation format instruction for the LLM"""
@@ -264,71 +585,23 @@ Answer the customer's question based ONLY on the provided context. Include prope
                 'length_factor': config.very_short_penalty
             }
 
-        answer_lower = answer.lower()
-        word_count = len(answer.split())
-
-        # Enhanced uncertainty detection with context awareness
-        uncertainty_indicators = [
-            # Strong uncertainty
-            "don't have enough information", "not enough information", "insufficient information",
-            "cannot determine", "unclear", "please contact", "i don't know", "unsure",
-            "unable to find", "no information available", "not specified", "not mentioned",
-
-            # Moderate uncertainty (context-dependent)
-            "may depend", "might vary", "could be", "possibly", "perhaps", "seems to",
-            "appears to", "likely", "probably", "i think", "it depends", "varies",
-
-            # Weak uncertainty (instructional context)
-            "you may", "may apply", "may choose", "might want", "could consider"
-        ]
-
-        # Specificity indicators with context validation
-        specificity_patterns = [
-            # Monetary values (with context)
-            (r'\$\d+', 'monetary'),
-            (r'\d+\s*dollars?', 'monetary'),
-            (r'\d+\s*cents?', 'monetary'),
-
-            # Percentages (with context)
-            (r'\d+\s*%', 'percentage'),
-            (r'\d+\s*percent', 'percentage'),
-
-            # Time periods (with context)
-            (r'\d+\s*days?', 'time'),
-            (r'\d+\s*months?', 'time'),
-            (r'\d+\s*years?', 'time'),
-            (r'\d+\s*weeks?', 'time'),
-
-            # Age ranges
-            (r'\d+\s*years?\s*old', 'age'),
-            (r'age\s*\d+', 'age'),
-            (r'between\s*\d+\s*and\s*\d+', 'range')
-        ]
+        analysis = answer_analyzer.analyze(answer)
 
         # Analyze uncertainty with severity levels
-        uncertainty_score = 0.0
-        strong_uncertainty = any(phrase in answer_lower for phrase in uncertainty_indicators[:8])
-        moderate_uncertainty = any(phrase in answer_lower for phrase in uncertainty_indicators[8:16])
-        weak_uncertainty = any(phrase in answer_lower for phrase in uncertainty_indicators[16:])
-
-        if strong_uncertainty:
+        if analysis.strong_uncertainty:
             uncertainty_score = config.strong_uncertainty_penalty
-        elif moderate_uncertainty and not self._is_instructional_context(answer_lower):
+        elif analysis.moderate_uncertainty and not analysis.instructional:
             uncertainty_score = config.moderate_uncertainty_penalty
-        elif weak_uncertainty and not self._is_instructional_context(answer_lower):
+        elif analysis.weak_uncertainty and not analysis.instructional:
             uncertainty_score = config.weak_uncertainty_penalty
         else:
             uncertainty_score = 1.0  # No penalty
 
-        # Analyze specificity with context validation
-        import re
-        specificity_count = 0
-        for pattern, category in specificity_patterns:
-            matches = re.findall(pattern, answer_lower)
-            if matches and self._is_meaningful_specificity(answer_lower, matches, category):
-                specificity_count += len(matches)
+        # Specificity (figures not stated in a negative or hypothetical context)
+        specificity_count = analysis.specificity_count
 
         # Calculate length factor with adaptive thresholds
+        word_count = analysis.word_count
         if word_count < 5:
             length_factor = config.very_short_penalty
         elif word_count < 10:
@@ -346,26 +619,6 @@ Answer the customer's question based ONLY on the provided context. Include prope
             'length_factor': length_factor
         }
 
-    def _is_instructional_context(self, answer_lower: str) -> bool:
-        """Check if uncertainty phrases are used in instructional context"""
-        instructional_indicators = [
-            "you may apply", "you may choose", "you may contact", "may be eligible",
-            "you might want", "you could consider", "may qualify", "may submit"
-        ]
-        return any(indicator in answer_lower for indicator in instructional_indicators)
-
-    def _is_meaningful_specificity(self, answer_lower: str, matches: list, category: str) -> bool:
-        """Validate that specificity indicators are meaningful, not just mentioned"""
-        if category == 'monetary':
-            # Check if monetary value is in negative context
-            negative_contexts = ["don't have", "no information", "not specified", "unclear"]
-            return not any(context in answer_lower for context in negative_contexts)
-        elif category == 'time':
-            # Check if time period is definitive, not hypothetical
-            hypothetical_contexts = ["may take", "might be", "could be", "possibly"]
-            return not any(context in answer_lower for context in hypothetical_contexts)
-        return True
-
     def _assess_context_sufficiency(self, query: str, context_chunks: List[ChunkResult], answer: str, config: ConfidenceConfig) -> bool:
         """Assess if the provided context was sufficient to answer the query"""
         if not context_chunks or not answer:
@@ -388,14 +641,8 @@ Answer the customer's question based ONLY on the provided context. Include prope
         avg_relevance = sum(valid_scores) / len(valid_scores)
 
         # Enhanced uncertainty detection
-        strong_uncertainty_indicators = [
-            "don't have enough information", "not enough information", "insufficient information",
-            "cannot determine", "unclear", "please contact", "i don't know", "unsure",
-            "unable to find", "no information available", "not specified in", "not mentioned"
-        ]
-
-        answer_lower = answer.lower() if isinstance(answer, str) else ""
-        has_strong_uncertainty = any(indicator in answer_lower for indicator in strong_uncertainty_indicators)
+        analysis = answer_analyzer.analyze(answer) if isinstance(answer, str) else None
+        has_strong_uncertainty = analysis.insufficient_context if analysis else False
 
         # Adaptive relevance threshold based on query complexity
         query_words = len(query.split()) if isinstance(query, str) else 0
@@ -409,7 +656,7 @@ Answer the customer's question based ONLY on the provided context. Include prope
         has_good_relevance = avg_relevance >= relevance_threshold
 
         # Adaptive substantiveness check based on query type
-        word_count = len(answer.split()) if isinstance(answer, str) else 0
+        word_count = analysis.word_count if analysis else 0
 
         # Different thresholds for different query types
         if any(word in query.lower() for word in ['what', 'how much', 'when', 'where']) if isinstance(query, str) else False:
@@ -435,7 +682,7 @@ Answer the customer's question based ONLY on the provided context. Include prope
             return False
 
         query_lower = query.lower()
-        answer_lower = answer.lower()
+        answer_lower = answer_analyzer.analyze(answer).answer_lower
 
         # Extract key terms from query (excluding common words)
         common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'what', 'how', 'when', 'where', 'why', 'which', 'who'}
@@ -455,7 +702,7 @@ Answer the customer's question based ONLY on the provided context. Include prope
         if not isinstance(answer, str) or not citation:
             return False
 
-        answer_lower = answer.lower()
+        analysis = answer_analyzer.analyze(answer)
         citation_markers = []
 
         # Safe citation ID parsing
@@ -464,19 +711,17 @@ Answer the customer's question based ONLY on the provided context. Include prope
                 # Handle different ID formats safely
                 if '_' in citation.id:
                     id_parts = citation.id.split('_')
-                    if len(id_parts) > 1 and id_parts[1].isdigit():
+                    if len(id_parts) > 1 and id_parts[1].isdigit() and f"[{id_parts[1]}]" in analysis.numbered_markers:
                         citation_markers.append(f"[{id_parts[1]}]")
-                elif citation.id.isdigit():
+                elif citation.id.isdigit() and f"[{citation.id}]" in analysis.numbered_markers:
                     citation_markers.append(f"[{citation.id}]")
         except (AttributeError, IndexError, ValueError):
             pass  # Skip if ID parsing fails
 
-        # Product name matching with word boundaries to avoid false positives
+        # Product name matching with word boundaries to avoid false positives like "car" in "scar"
         if hasattr(citation, 'product_name') and citation.product_name:
             product_name = citation.product_name.lower()
-            # Use word boundaries to avoid partial matches like "car" in "scar"
-            import re
-            if re.search(r'\b' + re.escape(product_name) + r'\b', answer_lower):
+            if answer_analyzer.mentions_word(analysis, product_name):
                 citation_markers.append(product_name)
 
         # Document type matching with word boundaries
@@ -486,26 +731,23 @@ Answer the customer's question based ONLY on the provided context. Include prope
                 doc_type = citation.document_type.value.lower()
             else:
                 doc_type = str(citation.document_type).lower()
-            import re
-            if re.search(r'\b' + re.escape(doc_type) + r'\b', answer_lower):
+            if answer_analyzer.mentions_word(analysis, doc_type):
                 citation_markers.append(doc_type)
 
         # Check for meaningful usage (not just mention in negative context)
-        if citation_markers:
-            for marker in citation_markers:
-                if marker in answer_lower:
-                    # Ensure it's not in a negative context
-                    negative_contexts = [
-                        f"no information about {marker}",
-                        f"don't have {marker}",
-                        f"not mentioned in {marker}",
-                        f"unclear from {marker}"
-                    ]
-                    if not any(neg_context in answer_lower for neg_context in negative_contexts):
-                        return True
+        answer_lower = analysis.answer_lower
+        for marker in citation_markers:
+            negative_contexts = [
+                f"no information about {marker}",
+                f"don't have {marker}",
+                f"not mentioned in {marker}",
+                f"unclear from {marker}"
+            ]
+            if not any(neg_context in answer_lower for neg_context in negative_contexts):
+                return True
 
         return False
-    
+
     def _generate_reasoning(self, request: ResponseRequest, answer: str, confidence_score: float, has_sufficient_context: bool) -> str:
         """Generate reasoning about the response quality"""
         context_summary = request.context_summary
@@ -0,0 +1,235 @@
+"""
+Local chunk store for hydrating search hits
+
+The embedding pipeline writes every chunk's properties to a local JSONL file
+at ingest time, together with an index of byte offsets keyed by chunk_id.
+The Retrieval Agent memory-maps that file so Weaviate searches only need to
+return the chunk_id of each hit; the chunk bodies are read locally instead of
+being shipped and deserialized on every search.
+"""
+
+import json
+import mmap
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+
+
+class _MappedChunks:
+    """One opened build of a chunk store: its memory map, offset index, manifest and record cache"""
+
+    def __init__(self, directory: Path, data_file: str, index_file: str, manifest_file: str):
+        data_path = directory / data_file
+        index_path = directory / index_file
+        manifest_path = directory / manifest_file
+
+        self.file = None
+        self.mmap: Optional[mmap.mmap] = None
+        self.index: Dict[str, List[int]] = {}
+        self.manifest: Dict[str, Any] = {}
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        if not data_path.exists() or not index_path.exists():
+            return
+
+        with open(index_path, 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+
+        if manifest_path.exists():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+
+        self.file = open(data_path, 'rb')
+        if os.path.getsize(data_path) > 0:
+            self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.cache.clear()
+
+
+class ChunkStore:
+    """
+    Memory-mapped, read-mostly store of chunk properties keyed by chunk_id
+
+    Layout of a store directory:
+    - chunks.jsonl     one JSON object per chunk
+    - chunks.idx.json  {chunk_id: [byte_offset, byte_length]}
+    - manifest.json    build metadata (index version, chunk count, build time)
+
+    The manifest's index_version changes on every build, so caches keyed on it
+    are invalidated whenever the pipeline re-ingests.
+
+    A rebuild is picked up by opening the new build next to the old one and
+    swapping a single reference, so threads still reading the old build finish
+    on it; its memory map is released once the last of them drops it.
+    """
+
+    DATA_FILE = "chunks.jsonl"
+    INDEX_FILE = "chunks.idx.json"
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, directory: str, cache_size: int = 2048):
+        """
+        Open the store in the given directory
+
+        Args:
+            directory: Store directory written by ChunkStore.build
+            cache_size: Number of decoded chunk records kept in memory
+        """
+        self.directory = Path(directory)
+        self.cache_size = cache_size
+
+        self._cache_lock = threading.Lock()
+        self._manifest_mtime = self._stat_manifest()
+        self._store = self._open()
+
+    def _open(self) -> _MappedChunks:
+        """Map the data file and load the offset index (empty if the store was never built)"""
+        return _MappedChunks(self.directory, self.DATA_FILE, self.INDEX_FILE, self.MANIFEST_FILE)
+
+    def _stat_manifest(self) -> Optional[int]:
+        try:
+            return os.stat(self.directory / self.MANIFEST_FILE).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self) -> bool:
+        """
+        Reload the store if the pipeline has rebuilt it since it was opened
+
+        The old build is not closed here: other threads may be reading it.
+
+        Returns:
+            True if a new build was loaded
+        """
+        manifest_mtime = self._stat_manifest()
+        if manifest_mtime == self._manifest_mtime:
+            return False
+
+        self._store = self._open()
+        self._manifest_mtime = manifest_mtime
+        return True
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        """Build metadata of the loaded store"""
+        return self._store.manifest
+
+    @property
+    def index_version(self) -> Optional[str]:
+        """Version stamp of the ingested index, or None if the store was never built"""
+        return self._store.manifest.get("index_version")
+
+    @property
+    def available(self) -> bool:
+        """Whether the store has been built and mapped"""
+        return self._store.mmap is not None
+
+    def __len__(self) -> int:
+        return len(self._store.index)
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self._store.index
+
+    def get(self, chunk_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored properties for a chunk, or None if unknown"""
+        return self._get(self._store, chunk_id)
+
+    def _get(self, store: _MappedChunks, chunk_id: str) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            record = store.cache.get(chunk_id)
+            if record is not None:
+                store.cache.move_to_end(chunk_id)
+                return record
+
+        location = store.index.get(chunk_id)
+        if location is None or store.mmap is None:
+            return None
+
+        offset, length = location
+        record = json.loads(store.mmap[offset:offset + length])
+
+        with self._cache_lock:
+            store.cache[chunk_id] = record
+            if len(store.cache) > self.cache_size:
+                store.cache.popitem(last=False)
+
+        return record
+
+    def get_many(self, chunk_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return stored properties for every known chunk_id (unknown IDs are omitted)"""
+        # Every record of one call comes from the same build
+        store = self._store
+        records = {}
+        for chunk_id in chunk_ids:
+            if chunk_id in records:
+                continue
+            record = self._get(store, chunk_id)
+            if record is not None:
+                records[chunk_id] = record
+        return records
+
+    def close(self):
+        """Release the memory map and file handle (only when no other thread is reading)"""
+        self._store.close()
+
+    @classmethod
+    def build(cls, directory: str, records: Iterable[Dict[str, Any]],
+              metadata: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Write a new store from chunk property records
+
+        Files are written next to the live ones and swapped in with os.replace,
+        so a running Retrieval Agent never maps a half-written store.
+
+        Args:
+            directory: Target store directory
+            records: Chunk property dicts, each containing a 'chunk_id'
+            metadata: Extra manifest fields describing the build (e.g. embedding settings)
+
+        Returns:
+            Number of chunks written
+        """
+        target = Path(directory)
+        target.mkdir(parents=True, exist_ok=True)
+
+        data_tmp = target / f"{cls.DATA_FILE}.tmp"
+        index_tmp = target / f"{cls.INDEX_FILE}.tmp"
+        manifest_tmp = target / f"{cls.MANIFEST_FILE}.tmp"
+
+        index: Dict[str, List[int]] = {}
+        offset = 0
+        with open(data_tmp, 'wb') as f:
+            for record in records:
+                line = json.dumps(record, ensure_ascii=False).encode('utf-8')
+                f.write(line + b'\n')
+                index[record['chunk_id']] = [offset, len(line)]
+                offset += len(line) + 1
+
+        with open(index_tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+
+        manifest = {
+            "index_version": uuid.uuid4().hex,
+            "chunk_count": len(index),
+            "built_at": datetime.now(timezone.utc).isoformat()
+        }
+        manifest.update(metadata or {})
+        with open(manifest_tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        os.replace(data_tmp, target / cls.DATA_FILE)
+        os.replace(index_tmp, target / cls.INDEX_FILE)
+        os.replace(manifest_tmp, target / cls.MANIFEST_FILE)
+
+        return len(index)
@@ -0,0 +1,97 @@
+"""
+Sentence-level context compression
+
+Sits between retrieval and response generation. Long chunks are reduced to
+the sentences closest to the query embedding plus their immediate
+neighbours, using the sentence embeddings precomputed at ingest, so the
+only query-time work is one matrix-vector product per chunk.
+"""
+
+from dataclasses import dataclass, replace
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import ChunkResult
+from .sentence_store import SentenceStore, min_compressible_sentences
+
+
+@dataclass
+class CompressionStats:
+    """What compression removed from one request's context"""
+    chunks_compressed: int = 0
+    sentences_kept: int = 0
+    sentences_total: int = 0
+    chars_saved: int = 0
+
+
+class SentenceCompressor:
+    """Keeps the top-scoring sentences of each long chunk and their neighbours"""
+
+    def __init__(self, sentence_store: SentenceStore, top_sentences: int = 3, neighbours: int = 1):
+        """
+        Args:
+            sentence_store: Precomputed sentence embeddings
+            top_sentences: Sentences kept per chunk by similarity to the query
+            neighbours: Sentences kept on each side of a selected sentence
+        """
+        self.sentence_store = sentence_store
+        self.top_sentences = top_sentences
+        self.neighbours = neighbours
+
+    def compress(self, query_embedding: Sequence[float], results: List[ChunkResult]) -> Tuple[List[ChunkResult], CompressionStats]:
+        """
+        Compress chunk contents against a query embedding
+
+        Args:
+            query_embedding: Normalized query embedding (same dimensionality as the store)
+            results: Retrieved chunks
+
+        Returns:
+            Chunks with compressed content (others unchanged) and compression stats
+        """
+        stats = CompressionStats()
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        if not self.sentence_store.available or query_vector.shape[0] != self.sentence_store.dimensions:
+            return results, stats
+
+        # Windows around the top sentences must leave something out to be worth it
+        min_sentences = min_compressible_sentences(self.top_sentences, self.neighbours)
+
+        compressed = []
+        for result in results:
+            entry = self.sentence_store.get(result.chunk_id) if result.chunk_id else None
+            if entry is None or len(entry[0]) < min_sentences:
+                compressed.append(result)
+                continue
+
+            sentences, vectors = entry
+            scores = vectors @ query_vector
+            top = np.argpartition(-scores, self.top_sentences - 1)[:self.top_sentences]
+
+            keep = set()
+            for index in top:
+                keep.update(range(max(0, index - self.neighbours), min(len(sentences), index + self.neighbours + 1)))
+
+            content = self._join_kept(sentences, sorted(keep))
+            stats.chunks_compressed += 1
+            stats.sentences_kept += len(keep)
+            stats.sentences_total += len(sentences)
+            stats.chars_saved += max(0, len(result.content) - len(content))
+            compressed.append(replace(result, content=content, full_content=result.full_content or result.content))
+
+        return compressed, stats
+
+    @staticmethod
+    def _join_kept(sentences: List[str], kept: List[int]) -> str:
+        """Join kept sentences, marking gaps where sentences were removed"""
+        parts = []
+        previous: Optional[int] = None
+        for index in kept:
+            if (previous is None and index > 0) or (previous is not None and index > previous + 1):
+                parts.append("...")
+            parts.append(sentences[index])
+            previous = index
+        if previous is not None and previous < len(sentences) - 1:
+            parts.append("...")
+        return "\n".join(parts)
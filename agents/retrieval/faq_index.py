@@ -0,0 +1,147 @@
+"""
+FAQ fast path
+
+Every FAQ chunk carries its canonical question, and the Metadata Enricher
+adds a few variations of it. At ingest those questions are embedded once and
+written next to the chunk store. At query time a question that is nearly
+identical to an FAQ question (the same words in the same order, or a question
+embedding similarity above the product's threshold) is answered with the stored FAQ
+answer, without hybrid retrieval or generation.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .query_processor import query_processor
+from .sentence_store import SentenceStore
+
+
+def parse_thresholds(value: str) -> Dict[str, float]:
+    """Parse per-product thresholds written as "Travel=0.9,Car=0.95" """
+    thresholds = {}
+    for item in (value or "").split(','):
+        if '=' not in item:
+            continue
+        product, threshold = item.split('=', 1)
+        try:
+            thresholds[product.strip().lower()] = float(threshold)
+        except ValueError:
+            print(f"⚠️ FAQ fast path: Ignoring invalid threshold '{item.strip()}'")
+    return thresholds
+
+
+class FAQQuestionStore(SentenceStore):
+    """
+    Memory-mapped FAQ question embeddings keyed by FAQ chunk_id
+
+    Same layout as the sentence store; the "sentences" of a chunk are its
+    canonical question followed by its variations.
+    """
+
+    MATRIX_FILE = "faq_questions.npy"
+    INDEX_FILE = "faq_questions.idx.json"
+
+    def _load(self):
+        super()._load()
+
+        # Row -> chunk_id lookup, and normalized question -> chunk_ids for lexical matches.
+        # The key keeps word order and question words: "Where can I buy ..." is not "Can I buy ...".
+        self._row_chunk_ids: List[str] = [None] * (len(self._matrix) if self._matrix is not None else 0)
+        self._lexical: Dict[str, List[str]] = {}
+        for chunk_id, (first_row, questions) in self._chunks.items():
+            for offset, question in enumerate(questions):
+                self._row_chunk_ids[first_row + offset] = chunk_id
+                key = query_processor.process(question).normalized
+                if key and chunk_id not in self._lexical.setdefault(key, []):
+                    self._lexical[key].append(chunk_id)
+
+    @property
+    def matrix(self) -> Optional[np.ndarray]:
+        return self._matrix
+
+    def chunk_id_at(self, row: int) -> str:
+        return self._row_chunk_ids[row]
+
+    def question_at(self, row: int) -> str:
+        first_row, questions = self._chunks[self._row_chunk_ids[row]]
+        return questions[row - first_row]
+
+    def lexical_matches(self, query: str) -> List[str]:
+        """FAQ chunk_ids whose question has the same words, in the same order, as the query"""
+        return self._lexical.get(query_processor.process(query).normalized, [])
+
+
+@dataclass
+class FAQCandidate:
+    """An FAQ question close to the query"""
+    chunk_id: str
+    question: str
+    similarity: float
+    method: str           # "lexical" or "embedding"
+
+
+class FAQMatcher:
+    """Ranks FAQ chunks by how closely their questions match a query"""
+
+    def __init__(self,
+                 question_store: FAQQuestionStore,
+                 default_threshold: float = 0.92,
+                 product_thresholds: Optional[Dict[str, float]] = None,
+                 min_margin: float = 0.02):
+        """
+        Args:
+            question_store: Precomputed FAQ question embeddings
+            default_threshold: Similarity an FAQ question must reach to be answered directly
+            product_thresholds: Per-product overrides (lowercase product name -> threshold)
+            min_margin: Similarity by which the best FAQ must beat the next FAQ of the same product
+        """
+        self.question_store = question_store
+        self.default_threshold = default_threshold
+        self.product_thresholds = product_thresholds or {}
+        self.min_margin = min_margin
+
+    def threshold_for(self, product: str) -> float:
+        return self.product_thresholds.get((product or "").lower(), self.default_threshold)
+
+    def candidates(self, query: str, query_embedding: Optional[Sequence[float]], limit: int = 5) -> List[FAQCandidate]:
+        """
+        FAQ questions closest to the query, best first, one per FAQ chunk
+
+        Args:
+            query: Original customer question (used for the lexical match)
+            query_embedding: Normalized query embedding, or None for lexical matching only
+            limit: Maximum candidates returned
+
+        Returns:
+            Lexical matches (similarity 1.0) followed by embedding matches
+        """
+        store = self.question_store
+        if not store.available:
+            return []
+
+        candidates = [FAQCandidate(chunk_id, store.get(chunk_id)[0][0], 1.0, "lexical")
+                      for chunk_id in store.lexical_matches(query)]
+        seen = {candidate.chunk_id for candidate in candidates}
+
+        if query_embedding is None or len(candidates) >= limit:
+            return candidates[:limit]
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        if query_vector.shape[0] != store.dimensions or not np.any(query_vector) or not len(store.matrix):
+            return candidates[:limit]
+
+        scores = store.matrix @ query_vector
+        # Several rows belong to each chunk, so take enough rows to fill the limit after dedup
+        top_count = min(len(scores), limit * 4)
+        top_rows = np.argpartition(-scores, top_count - 1)[:top_count]
+        for row in top_rows[np.argsort(-scores[top_rows])]:
+            chunk_id = store.chunk_id_at(row)
+            if chunk_id in seen:
+                continue
+            seen.add(chunk_id)
+            candidates.append(FAQCandidate(chunk_id, store.question_at(row), float(scores[row]), "embedding"))
+            if len(candidates) >= limit:
+                break
+
+        return candidates
@@ -0,0 +1,136 @@
+"""
+Score fusion for hybrid retrieval
+
+Merges ranked result lists from different searches (BM25, vector) into one
+ranking keyed by chunk_id. BM25 scores and distance-derived scores live on
+incompatible scales, so they are never added raw:
+
+- "rrf": reciprocal rank fusion, which only uses each result's rank
+- "weighted": min-max normalizes each list's scores to [0, 1], then takes a
+  weighted sum
+
+The fused score only decides the order and is kept on fused_score. A rank
+says nothing about how well a chunk matches, so relevance_score stays a
+similarity for the relevance threshold and confidence scoring: the vector
+search's distance-derived similarity, or for a keyword-only hit its min-max
+normalized BM25 score scaled by the keyword weight's share.
+"""
+
+from typing import List, Tuple, Dict
+import numpy as np
+
+from .models import ChunkResult
+
+
+FUSION_METHODS = ("rrf", "weighted")
+
+
+def fuse_results(sources: List[Tuple[str, List[ChunkResult], float]],
+                 method: str = "rrf",
+                 rrf_k: int = 60,
+                 limit: int = None,
+                 similarity_sources: Tuple[str, ...] = ("vector",)) -> List[ChunkResult]:
+    """
+    Fuse ranked result lists into a single ranking keyed by chunk_id
+
+    Args:
+        sources: (source_name, ranked_results, weight) for each search
+        method: "rrf" or "weighted"
+        rrf_k: Rank damping constant for reciprocal rank fusion
+        limit: Maximum number of results to return
+        similarity_sources: Sources whose scores are already similarities in [0, 1]
+
+    Returns:
+        Fused ChunkResults sorted by fused_score, with relevance_score set to the
+        best similarity any source gave the chunk
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method: {method}")
+
+    # Assign each distinct chunk a row in the score array
+    positions: Dict[str, int] = {}
+    representatives: List[ChunkResult] = []
+    contributors: List[set] = []
+
+    source_rows = []
+    for source_name, results, weight in sources:
+        rows = np.empty(len(results), dtype=np.int64)
+        for rank, result in enumerate(results):
+            key = _result_key(result)
+            row = positions.get(key)
+            if row is None:
+                row = len(representatives)
+                positions[key] = row
+                representatives.append(result)
+                contributors.append(set())
+            contributors[row].add(source_name)
+            rows[rank] = row
+        source_rows.append(rows)
+
+    if not representatives:
+        return []
+
+    fused = np.zeros(len(representatives), dtype=np.float64)
+    similarity = np.zeros(len(representatives), dtype=np.float64)
+    total_weight = sum(weight for _, _, weight in sources) or 1.0
+
+    for (source_name, results, weight), rows in zip(sources, source_rows):
+        if len(rows) == 0:
+            continue
+
+        raw = np.fromiter((r.relevance_score for r in results), dtype=np.float64, count=len(results))
+        normalized = _min_max(raw)
+        if method == "rrf":
+            ranks = np.arange(1, len(rows) + 1, dtype=np.float64)
+            contribution = weight / (rrf_k + ranks)
+        else:
+            contribution = weight * normalized
+
+        # Duplicate chunk_ids inside one list accumulate like separate hits
+        np.add.at(fused, rows, contribution)
+
+        if source_name in similarity_sources:
+            source_similarity = np.clip(raw, 0.0, 1.0)
+        else:
+            source_similarity = normalized * (weight / total_weight)
+        np.maximum.at(similarity, rows, source_similarity)
+
+    # Rescale fused scores to [0, 1]: the best possible is rank 1 (or a normalized 1.0) in every list
+    if method == "rrf":
+        fused /= total_weight / (rrf_k + 1)
+    else:
+        fused /= total_weight
+    np.clip(fused, 0.0, 1.0, out=fused)
+
+    # Stable sort keeps first-seen order among ties
+    order = np.argsort(-fused, kind="stable")
+    if limit is not None:
+        order = order[:limit]
+
+    fused_results = []
+    for row in order:
+        result = representatives[row]
+        result.fused_score = float(fused[row])
+        result.relevance_score = float(similarity[row])
+        sources_used = contributors[row]
+        if len(sources_used) == 1:
+            result.search_method = f"hybrid_{next(iter(sources_used))}"
+        else:
+            result.search_method = "hybrid_combined"
+        fused_results.append(result)
+
+    return fused_results
+
+
+def _min_max(scores: np.ndarray) -> np.ndarray:
+    """Min-max normalize scores to [0, 1]; a constant list maps to all ones"""
+    low = scores.min()
+    spread = scores.max() - low
+    if spread <= 0:
+        return np.ones_like(scores)
+    return (scores - low) / spread
+
+
+def _result_key(result: ChunkResult) -> str:
+    """Merge key for a result: its chunk_id, or its full content if it has none"""
+    return result.chunk_id or result.content
@@ -84,6 +84,10 @@ class ChunkResult:
     search_method: Optional[str] = None
     original_distance: Optional[float] = None
     rerank_score: Optional[float] = None
+    fused_score: Optional[float] = None  # Hybrid rank-fusion score (ordering only, not a similarity)
+
+    # Content before query-time sentence compression (None when not compressed)
+    full_content: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -101,7 +105,8 @@ class ChunkResult:
             "is_table_data": self.is_table_data,
             "search_method": self.search_method,
             "original_distance": self.original_distance,
-            "rerank_score": self.rerank_score
+            "rerank_score": self.rerank_score,
+            "fused_score": self.fused_score
         }
     
     def to_json(self) -> str:
@@ -144,6 +149,10 @@ class SearchConfig:
     # Search parameters
     hybrid_alpha: float = 0.7  # Balance between vector (1.0) and keyword (0.0) search
 
+    # Score fusion for hybrid search: "rrf" (reciprocal rank) or "weighted" (min-max normalized)
+    fusion_method: str = "rrf"
+    rrf_k: int = 60
+
     # Relevance thresholds
     min_relevance_score: float = 0.1
     max_distance: float = 1.5
@@ -155,6 +164,8 @@ class SearchConfig:
             "summary_weight": self.summary_weight,
             "content_weight": self.content_weight,
             "hybrid_alpha": self.hybrid_alpha,
+            "fusion_method": self.fusion_method,
+            "rrf_k": self.rrf_k,
             "min_relevance_score": self.min_relevance_score,
             "max_distance": self.max_distance
         }
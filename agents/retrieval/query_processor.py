@@ -0,0 +1,154 @@
+"""
+Query normalization and insurance term expansion
+
+All patterns are compiled once at import. A query is tokenized and
+normalized, then every synonym in INSURANCE_TERMS is matched on whole
+tokens in a single pass over a token trie, so an expansion is never re-expanded
+("maid" no longer becomes "maid domestic helper domestic helper"), substrings
+do not fire ("card" is not "car") and a term is added at most once no matter
+how many synonyms produce it.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .models import INSURANCE_TERMS
+
+
+# Tokens keep inner joiners so "a&e", "covid-19" and "1.5" stay whole
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[&\-.][a-z0-9]+)*")
+
+# Words ignored when building the order-insensitive cache key
+_STOPWORDS = frozenset({
+    'a', 'an', 'the', 'is', 'are', 'was', 'were', 'be', 'do', 'does', 'did', 'can', 'could',
+    'i', 'me', 'my', 'we', 'our', 'you', 'your', 'it', 'its', 'this', 'that', 'there',
+    'what', 'which', 'who', 'how', 'when', 'where', 'why', 'please', 'tell',
+    'of', 'to', 'in', 'on', 'at', 'for', 'with', 'by', 'about', 'and', 'or', 'if'
+})
+
+
+def _plural(word: str) -> str:
+    """Regular English plural, enough for the insurance vocabulary"""
+    return word + ('es' if word.endswith(('s', 'x', 'z', 'ch', 'sh')) else 's')
+
+
+@dataclass(frozen=True)
+class ProcessedQuery:
+    """Normalized query and its expansions (immutable, shared between callers)"""
+    original: str
+    normalized: str       # lowercase tokens joined by single spaces
+    expanded: str         # normalized query plus new expansion and entity terms (BM25 / embedding input)
+    terms: Tuple[str, ...]  # every distinct token in expanded, in order
+    cache_key: str        # order-insensitive key without stopwords, for answer-level caches
+
+
+class QueryProcessor:
+    """Compiled-once query preprocessing engine shared by retrieval and the caches"""
+
+    def __init__(self, synonyms: Dict[str, str] = None, cache_size: int = 4096):
+        """
+        Args:
+            synonyms: Term -> expansion map (defaults to INSURANCE_TERMS)
+            cache_size: Number of processed queries memoized (repeat questions are common)
+        """
+        synonyms = synonyms if synonyms is not None else INSURANCE_TERMS
+
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, Tuple[str, ...]], ProcessedQuery]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Compile the synonyms into a token trie keyed on each term's first token.
+        # Plural forms are compiled in as well ("claims" -> "claim"), and
+        # continuations are kept longest first so "sum insured" wins over shorter overlaps.
+        self._terms_by_first: Dict[str, List[Tuple[Tuple[str, ...], List[str]]]] = {}
+        for term, expansion in synonyms.items():
+            term_tokens = _TOKEN_PATTERN.findall(term.lower())
+            if not term_tokens:
+                continue
+            expansion_tokens = list(dict.fromkeys(_TOKEN_PATTERN.findall(expansion.lower())))
+            for variant in (term_tokens, term_tokens[:-1] + [_plural(term_tokens[-1])]):
+                self._terms_by_first.setdefault(variant[0], []).append((tuple(variant[1:]), expansion_tokens))
+        for candidates in self._terms_by_first.values():
+            candidates.sort(key=lambda candidate: len(candidate[0]), reverse=True)
+
+    def process(self, query: str, entities: Optional[List[str]] = None) -> ProcessedQuery:
+        """
+        Normalize and expand a query
+
+        Args:
+            query: Raw user query
+            entities: Entities extracted by the Intent Router, appended if not already present
+
+        Returns:
+            ProcessedQuery with the expanded search string and cache key
+        """
+        memo_key = (query or "", tuple(entities or ()))
+        with self._cache_lock:
+            processed = self._cache.get(memo_key)
+            if processed is not None:
+                self._cache.move_to_end(memo_key)
+                return processed
+
+        processed = self._process(query, entities)
+
+        with self._cache_lock:
+            self._cache[memo_key] = processed
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return processed
+
+    def _process(self, query: str, entities: Optional[List[str]]) -> ProcessedQuery:
+        """Uncached normalization and expansion"""
+        tokens = _TOKEN_PATTERN.findall((query or "").lower())
+        normalized = " ".join(tokens)
+
+        seen = set(tokens)
+        additions: List[str] = []
+
+        # Single pass over the query tokens; expansions are never rescanned.
+        # Most queries contain no synonym at all and skip the walk entirely.
+        terms_by_first = self._terms_by_first
+        if not seen.isdisjoint(terms_by_first):
+            resume_at = 0
+            for position, token in enumerate(tokens):
+                if position < resume_at:
+                    continue
+                for rest, expansion in terms_by_first.get(token, ()):
+                    end = position + 1 + len(rest)
+                    if rest and tuple(tokens[position + 1:end]) != rest:
+                        continue
+                    for expansion_token in expansion:
+                        if expansion_token not in seen:
+                            seen.add(expansion_token)
+                            additions.append(expansion_token)
+                    resume_at = end
+                    break
+
+        # Entities are added whole unless every word is already present
+        for entity in entities or ():
+            entity_tokens = _TOKEN_PATTERN.findall(entity.lower())
+            if entity_tokens and not seen.issuperset(entity_tokens):
+                for token in entity_tokens:
+                    if token not in seen:
+                        seen.add(token)
+                        additions.append(token)
+
+        terms = tuple(dict.fromkeys(tokens)) + tuple(additions)
+        expanded = " ".join(tokens + additions)
+        cache_key = " ".join(sorted(seen - _STOPWORDS))
+
+        return ProcessedQuery(
+            original=query,
+            normalized=normalized,
+            expanded=expanded,
+            terms=terms,
+            cache_key=cache_key
+        )
+
+
+# Shared instance; patterns are compiled once per process
+query_processor = QueryProcessor()
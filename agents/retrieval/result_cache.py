@@ -0,0 +1,115 @@
+"""
+Retrieval result cache
+
+Retrieval for the same enhanced query, product filter, top_k and search
+configuration returns the same chunks until the index is rebuilt. The cache
+keeps only compact (chunk_id, score, search_method) tuples; chunk bodies are
+re-hydrated from the local chunk store on a hit.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from .models import ChunkResult, SearchConfig
+
+
+CachedHit = Tuple[str, float, Optional[str]]
+
+
+class RetrievalCache:
+    """
+    LRU cache of retrieval results keyed on query inputs and index version
+
+    Queries that returned nothing are cached as well (negative caching), but
+    only for negative_ttl_seconds, because an empty result can also come from
+    a transient search failure.
+    """
+
+    def __init__(self, max_entries: int = 1024, negative_ttl_seconds: float = 60.0):
+        """
+        Args:
+            max_entries: Maximum number of cached queries before LRU eviction
+            negative_ttl_seconds: Lifetime of cached empty results
+        """
+        self.max_entries = max_entries
+        self.negative_ttl_seconds = negative_ttl_seconds
+
+        self._entries: "OrderedDict[str, Tuple[Tuple[CachedHit, ...], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query: str,
+                 product_focus: List[str],
+                 top_k: int,
+                 is_comparison: bool,
+                 search_config: SearchConfig,
+                 index_version: str) -> str:
+        """Build a cache key from every input that affects the retrieved results"""
+        payload = json.dumps([
+            query,
+            sorted(product_focus or []),
+            top_k,
+            is_comparison,
+            search_config.to_dict(),
+            index_version
+        ], sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[CachedHit, ...]]:
+        """Return the cached hits for a key (possibly empty), or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            hits, stored_at = entry
+            if not hits and time.monotonic() - stored_at > self.negative_ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            if hits:
+                self.hits += 1
+            else:
+                self.negative_hits += 1
+            return hits
+
+    def put(self, key: str, results: List[ChunkResult]):
+        """Store the final results of a retrieval"""
+        hits = tuple(
+            (result.chunk_id, result.relevance_score, result.search_method)
+            for result in results
+            if result.chunk_id
+        )
+        with self._lock:
+            self._entries[key] = (hits, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses
+        }
@@ -6,15 +6,27 @@ using sophisticated multi-vector hybrid search strategies.
 """
 
 import re
-from typing import List, Dict, Any, Optional
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple
 import weaviate
 import weaviate.classes as wvc
 from weaviate.classes.query import Filter
 import google.generativeai as genai
 
-from .models import (
-    RetrievalRequest, ChunkResult, SearchStrategy, SearchConfig, 
-    INSURANCE_TERMS
+from .models import RetrievalRequest, ChunkResult, SearchStrategy, SearchConfig
+from .chunk_store import ChunkStore
+from .query_processor import query_processor
+from .fusion import fuse_results
+from .result_cache import RetrievalCache
+from .sentence_store import SentenceStore
+from .context_compression import SentenceCompressor
+from .faq_index import FAQQuestionStore, FAQMatcher, parse_thresholds
+from agents.embedding.embedding_utils import (
+    embed_text, parse_index_dimensions, resolve_collection, validate_index_dimensions
 )
 from agents.intent_router.models import IntentClassification
 from config import Config
@@ -27,6 +39,9 @@ class RetrievalAgent:
     Executes sophisticated multi-vector hybrid search to find the most
     relevant document chunks from Weaviate based on intent classification.
     """
+
+    # Searches only return the chunk_id; bodies are hydrated from the local chunk store
+    ID_ONLY_PROPERTIES = ["chunk_id"]
     
     def __init__(self,
                  weaviate_host: str = None,
@@ -71,9 +86,25 @@ class RetrievalAgent:
             print(f"❌ RetrievalAgent: Failed to connect to Weaviate: {str(e)}")
             raise
 
-        self.collection_name = "InsuranceDocumentChunk"
+        # The configured name is an alias to the live collection version after a blue/green build
+        self.collection_alias = Config.WEAVIATE_COLLECTION
+        self.collection_name = resolve_collection(self.client, self.collection_alias)
+        self._alias_checked_at = time.monotonic()
         print(f"🔧 RetrievalAgent: Target collection: {self.collection_name}")
 
+        # Retrieval result cache, keyed on the chunk store's index version
+        self.result_cache = RetrievalCache(
+            max_entries=Config.RETRIEVAL_CACHE_SIZE,
+            negative_ttl_seconds=Config.RETRIEVAL_CACHE_NEGATIVE_TTL
+        )
+
+        # Query embeddings are kept so later stages (context compression) reuse them
+        self._query_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
+
+        self._open_index_stores()
+        print(f"🔧 RetrievalAgent: Embedding dimensions: {Config.EMBEDDING_DIMENSIONS}")
+
         # Initialize Gemini for embeddings
         try:
             genai.configure(api_key=self.gemini_api_key)
@@ -82,6 +113,53 @@ class RetrievalAgent:
             print(f"❌ RetrievalAgent: Failed to configure Gemini API: {str(e)}")
             raise
     
+    def _open_index_stores(self):
+        """Open the local stores written at ingest for the current collection"""
+        # Local chunk store used to hydrate ID-only search results
+        self.chunk_store = ChunkStore(os.path.join(Config.CHUNK_STORE_DIR, self.collection_name))
+        if self.chunk_store.available:
+            print(f"✅ RetrievalAgent: Chunk store loaded ({len(self.chunk_store)} chunks)")
+        else:
+            print("⚠️ RetrievalAgent: Chunk store not found, hits will be hydrated from Weaviate")
+
+        # Query embeddings must match the dimensionality the index was built with
+        self._validate_index_dimensions()
+
+        # Sentence embeddings precomputed at ingest, used to compress long chunks
+        self.sentence_store = SentenceStore(self.chunk_store.directory)
+        self.compressor = SentenceCompressor(
+            self.sentence_store,
+            top_sentences=Config.COMPRESSION_TOP_SENTENCES,
+            neighbours=Config.COMPRESSION_NEIGHBOURS
+        )
+
+        # FAQ question embeddings precomputed at ingest, for the FAQ fast path
+        self.faq_store = FAQQuestionStore(self.chunk_store.directory)
+        self.faq_matcher = FAQMatcher(
+            self.faq_store,
+            default_threshold=Config.FAQ_FAST_PATH_THRESHOLD,
+            product_thresholds=parse_thresholds(Config.FAQ_FAST_PATH_THRESHOLDS)
+        )
+
+    def _check_collection_alias(self):
+        """Follow an alias swap to the new collection version, at most every ALIAS_CHECK_INTERVAL_SECONDS"""
+        now = time.monotonic()
+        if now - self._alias_checked_at < Config.ALIAS_CHECK_INTERVAL_SECONDS:
+            return
+        self._alias_checked_at = now
+
+        collection_name = resolve_collection(self.client, self.collection_alias, current=self.collection_name)
+        if collection_name == self.collection_name:
+            return
+
+        print(f"🔄 RetrievalAgent: {self.collection_alias} now serves {collection_name} "
+              f"(was {self.collection_name}), reloading stores and clearing caches")
+        self.collection_name = collection_name
+        self._open_index_stores()
+        self.result_cache.clear()
+        with self._query_embeddings_lock:
+            self._query_embeddings.clear()
+
     def retrieve(self, request: RetrievalRequest) -> List[ChunkResult]:
         """
         Main retrieval method
@@ -99,23 +177,44 @@ class RetrievalAgent:
             query = self._enhance_query(request.query, request.entities)
             print(f"🔍 RetrievalAgent: Enhanced query: '{query}'")
 
-            # Step 2: Construct the Filter (Precision)
-            where_filter = self._build_product_filter(request.product_focus)
-            print(f"🔍 RetrievalAgent: Product filter: {where_filter}")
+            is_comparison = (request.intent_classification.primary_intent.value == "COMPARISON_INQUIRY"
+                             and len(request.product_focus) > 1)
 
-            # Step 3: Execute the Simple Hybrid Search (Relevance)
-            print(f"🔍 RetrievalAgent: Executing simple hybrid search...")
-            candidates = self._execute_simple_hybrid_search(
-                query=query,
-                where_filter=where_filter,
-                limit=request.top_k
-            )
-            print(f"🔍 RetrievalAgent: Found {len(candidates)} candidates from search")
+            # Serve repeated retrievals from the cache while the index is unchanged
+            cache_key = self._retrieval_cache_key(query, request, is_comparison)
+            if cache_key:
+                cached_hits = self.result_cache.get(cache_key)
+                if cached_hits is not None:
+                    print(f"⚡ RetrievalAgent: Cache hit ({len(cached_hits)} results)")
+                    return self._results_from_cache(cached_hits)
 
-            # Step 4: Ensure balanced results for comparison queries
-            if request.intent_classification.primary_intent.value == "COMPARISON_INQUIRY" and len(request.product_focus) > 1:
-                final_results = self._balance_comparison_results(candidates, request.product_focus, request.top_k)
+            # Embed the query once and share it across every search below
+            query_embedding, embedded = self._generate_query_embedding(query)
+
+            if is_comparison:
+                # Step 2/3: One filtered search per product, each with its own quota
+                print(f"🔍 RetrievalAgent: Executing per-product comparison search for {request.product_focus}")
+                final_results, searched = self._execute_comparison_search(
+                    query=query,
+                    product_focus=request.product_focus,
+                    top_k=request.top_k,
+                    query_embedding=query_embedding
+                )
+                print(f"🔍 RetrievalAgent: Found {len(final_results)} candidates from comparison search")
             else:
+                # Step 2: Construct the Filter (Precision)
+                where_filter = self._build_product_filter(request.product_focus)
+                print(f"🔍 RetrievalAgent: Product filter: {where_filter}")
+
+                # Step 3: Execute the Simple Hybrid Search (Relevance)
+                print(f"🔍 RetrievalAgent: Executing simple hybrid search...")
+                candidates, searched = self._execute_simple_hybrid_search(
+                    query=query,
+                    where_filter=where_filter,
+                    limit=request.top_k,
+                    query_embedding=query_embedding
+                )
+                print(f"🔍 RetrievalAgent: Found {len(candidates)} candidates from search")
                 final_results = candidates[:request.top_k]
 
             # Filter by minimum relevance score
@@ -126,6 +225,13 @@ class RetrievalAgent:
                 if result.relevance_score >= self.search_config.min_relevance_score
             ]
             print(f"🔍 RetrievalAgent: After relevance filtering: {len(final_results)} results")
+
+            # Results degraded by a failed search or the zero-vector fallback are not cached,
+            # so the next request retries instead of reusing them until the index changes
+            if cache_key and embedded and searched:
+                self.result_cache.put(cache_key, final_results)
+            elif cache_key:
+                print("⚠️ RetrievalAgent: Search degraded, results not cached")
             
             return final_results
             
@@ -133,87 +239,250 @@ class RetrievalAgent:
             print(f"Error in retrieval: {e}")
             return []
 
-    def _balance_comparison_results(self, results: List[ChunkResult], product_focus: List[str], target_count: int) -> List[ChunkResult]:
+    def compress_results(self, request: RetrievalRequest, results: List[ChunkResult]) -> List[ChunkResult]:
         """
-        Ensure balanced representation of products in comparison queries.
+        Reduce long chunks to the sentences that best match the query
 
-        For comparison queries, we want to make sure we get results from all requested products,
-        not just the highest-scoring ones from a single product.
+        Uses the query embedding computed during retrieval and the sentence
+        embeddings stored at ingest; makes no API calls. Chunks are returned
+        unchanged when either is unavailable.
+
+        Args:
+            request: The RetrievalRequest the results were retrieved for
+            results: Results returned by retrieve()
+
+        Returns:
+            Results with compressed content where compression applies
         """
+        try:
+            self.sentence_store.refresh()
+            if not self.sentence_store.available or self.sentence_store.index_version != self.chunk_store.index_version:
+                return results
 
-        if len(product_focus) <= 1:
-            return results[:target_count]
+            query = self._enhance_query(request.query, request.entities)
+            with self._query_embeddings_lock:
+                query_embedding = self._query_embeddings.get(query.strip())
+            if query_embedding is None:
+                return results
 
-        # Group results by product
-        product_results = {}
-        for result in results:
-            product = result.product_name
-            if product not in product_results:
-                product_results[product] = []
-            product_results[product].append(result)
-
-        # Calculate how many results per product
-        products_with_results = [p for p in product_focus if p in product_results]
-        if not products_with_results:
-            return results[:target_count]
-
-        # For comparison queries, ensure at least 1 result per product
-        min_per_product = 1
-        remaining_slots = target_count - len(products_with_results)
-
-        if remaining_slots > 0:
-            extra_per_product = remaining_slots // len(products_with_results)
-            remainder = remaining_slots % len(products_with_results)
-        else:
-            extra_per_product = 0
-            remainder = 0
+            compressed, stats = self.compressor.compress(query_embedding, results)
+            if stats.chunks_compressed:
+                print(f"✂️ RetrievalAgent: Compressed {stats.chunks_compressed} chunks to "
+                      f"{stats.sentences_kept}/{stats.sentences_total} sentences ({stats.chars_saved} chars saved)")
+            return compressed
 
-        balanced_results = []
+        except Exception as e:
+            print(f"⚠️ RetrievalAgent: Context compression failed, using full chunks: {e}")
+            return results
 
-        # Take results from each product (at least 1 per product)
-        for i, product in enumerate(products_with_results):
-            product_chunks = product_results[product]
-            # Ensure at least 1 per product, plus extra allocation
-            take_count = min_per_product + extra_per_product + (1 if i < remainder else 0)
-            balanced_results.extend(product_chunks[:take_count])
+    def match_faq(self, request: RetrievalRequest) -> Optional[ChunkResult]:
+        """
+        Find an FAQ whose question is nearly identical to the request's query
 
-        # If we still need more results, fill from the highest-scoring remaining
-        if len(balanced_results) < target_count:
-            used_ids = {result.chunk_id for result in balanced_results}
-            remaining = [r for r in results if r.chunk_id not in used_ids]
-            needed = target_count - len(balanced_results)
-            balanced_results.extend(remaining[:needed])
+        The customer's own question is embedded, not the synonym- and
+        entity-expanded query retrieval uses: FAQ questions are embedded as
+        written, and the expansion terms pull the cosine below the threshold
+        for true duplicates. The embedding is cached like any query embedding.
 
-        # Sort by relevance score to maintain quality
-        balanced_results.sort(key=lambda x: x.relevance_score, reverse=True)
+        Args:
+            request: RetrievalRequest for the customer question
 
-        return balanced_results[:target_count]
+        Returns:
+            The FAQ chunk (relevance_score = question similarity) when one FAQ of a
+            focused product clears that product's threshold, otherwise None
+        """
+        try:
+            self.faq_store.refresh()
+            if (not self.faq_store.available or not request.product_focus
+                    or self.faq_store.index_version != self.chunk_store.index_version):
+                return None
+
+            query_embedding, embedded = self._generate_query_embedding(request.query)
+            candidates = self.faq_matcher.candidates(request.query, query_embedding if embedded else None)
+            if not candidates:
+                return None
+
+            collection = self.client.collections.get(self.collection_name)
+            records = self._load_chunk_records(collection, [candidate.chunk_id for candidate in candidates])
+            focus = {product.lower() for product in request.product_focus}
+            in_focus = [candidate for candidate in candidates
+                        if candidate.chunk_id in records
+                        and str(records[candidate.chunk_id].get('product_name', '')).lower() in focus]
+            if not in_focus:
+                return None
+
+            best = in_focus[0]
+            product = records[best.chunk_id].get('product_name')
+            if best.similarity < self.faq_matcher.threshold_for(product):
+                return None
+
+            # Two FAQs of the product matching about equally well is not a clear answer
+            for other in in_focus[1:]:
+                if (records[other.chunk_id].get('product_name') == product
+                        and other.similarity > best.similarity - self.faq_matcher.min_margin):
+                    return None
+
+            print(f"⚡ RetrievalAgent: FAQ fast path matched '{best.question}' "
+                  f"({best.method}, similarity {best.similarity:.3f})")
+            return ChunkResult.from_weaviate_result(
+                records[best.chunk_id],
+                relevance_score=best.similarity,
+                search_method=f"faq_{best.method}"
+            )
+
+        except Exception as e:
+            print(f"⚠️ RetrievalAgent: FAQ fast path failed, using full retrieval: {e}")
+            return None
+
+    def _retrieval_cache_key(self, query: str, request: RetrievalRequest, is_comparison: bool) -> Optional[str]:
+        """Cache key for this retrieval, or None when the index version is unknown"""
+        self._check_collection_alias()
+        if self.chunk_store.refresh():
+            print(f"🔄 RetrievalAgent: Chunk store rebuilt (index version {self.chunk_store.index_version}), clearing result cache")
+            self.result_cache.clear()
+            self._validate_index_dimensions()
+
+        index_version = self.chunk_store.index_version
+        if not index_version:
+            return None
+
+        return self.result_cache.make_key(
+            query=query,
+            product_focus=request.product_focus,
+            top_k=request.top_k,
+            is_comparison=is_comparison,
+            search_config=self.search_config,
+            index_version=index_version
+        )
+
+    def _results_from_cache(self, cached_hits) -> List[ChunkResult]:
+        """Rebuild ChunkResults from cached (chunk_id, score, search_method) tuples"""
+        collection = self.client.collections.get(self.collection_name)
+        records = self._load_chunk_records(collection, [chunk_id for chunk_id, _, _ in cached_hits])
+
+        results = []
+        for chunk_id, relevance_score, search_method in cached_hits:
+            properties = records.get(chunk_id)
+            if properties is None:
+                continue
+            results.append(ChunkResult.from_weaviate_result(
+                properties,
+                relevance_score=relevance_score,
+                search_method=search_method
+            ))
+        return results
+
+    def _validate_index_dimensions(self):
+        """Raise if the index was built with a different EMBEDDING_DIMENSIONS than the current config"""
+        index_dimensions = self.chunk_store.manifest.get("embedding_dimensions")
+        if index_dimensions is not None:
+            validate_index_dimensions(index_dimensions, f"chunk store {self.chunk_store.directory}")
+            return
+
+        try:
+            if self.client.collections.exists(self.collection_name):
+                description = self.client.collections.get(self.collection_name).config.get().description
+                validate_index_dimensions(parse_index_dimensions(description), f"collection {self.collection_name}")
+        except ValueError:
+            raise
+        except Exception as e:
+            print(f"⚠️ RetrievalAgent: Could not read index dimensions: {str(e)}")
+
+    def _execute_comparison_search(self,
+                                   query: str,
+                                   product_focus: List[str],
+                                   top_k: int,
+                                   query_embedding: List[float]) -> Tuple[List[ChunkResult], bool]:
+        """
+        Run one filtered hybrid search per product concurrently and interleave them.
+
+        Each product gets its own quota of the top_k slots (at least one), so a
+        product whose chunks score lower overall is still represented instead of
+        being crowded out of a single OR-filtered search. Every search fetches
+        enough candidates to take over slots another product cannot fill.
+
+        Returns:
+            Interleaved results, and whether every product's search succeeded
+        """
+        quotas = self._comparison_quotas(product_focus, top_k)
+        if not quotas:
+            return [], True
+        total_slots = sum(quotas.values())
+
+        product_results: Dict[str, List[ChunkResult]] = {}
+        searched = True
+        with ThreadPoolExecutor(max_workers=len(quotas)) as executor:
+            futures = {
+                executor.submit(
+                    self._execute_simple_hybrid_search,
+                    query=query,
+                    where_filter=self._build_product_filter([product]),
+                    limit=total_slots,
+                    query_embedding=query_embedding
+                ): product
+                for product in quotas
+            }
+            for future in as_completed(futures):
+                product = futures[future]
+                try:
+                    product_results[product], product_searched = future.result()
+                    searched = searched and product_searched
+                except Exception as e:
+                    print(f"Error in comparison search for {product}: {e}")
+                    product_results[product] = []
+                    searched = False
+
+        slots = self._fill_unused_quotas(quotas, product_results)
+        for product in quotas:
+            print(f"   {product}: {slots[product]} results (quota {quotas[product]})")
+
+        return self._interleave_product_results(
+            [product_results[product][:slots[product]] for product in quotas]
+        ), searched
+
+    def _comparison_quotas(self, product_focus: List[str], top_k: int) -> Dict[str, int]:
+        """Split top_k slots across products, at least one each, giving any remainder to the first products"""
+        products = list(dict.fromkeys(product_focus))
+        if not products:
+            return {}
+        base, remainder = divmod(max(top_k, len(products)), len(products))
+        return {product: base + (1 if i < remainder else 0) for i, product in enumerate(products)}
+
+    def _fill_unused_quotas(self, quotas: Dict[str, int], product_results: Dict[str, List[ChunkResult]]) -> Dict[str, int]:
+        """Hand slots a product has too few results for to the others, one at a time in product order"""
+        slots = {product: min(quota, len(product_results[product])) for product, quota in quotas.items()}
+        spare = sum(quotas.values()) - sum(slots.values())
+        while spare > 0:
+            grown = False
+            for product in quotas:
+                if spare > 0 and slots[product] < len(product_results[product]):
+                    slots[product] += 1
+                    spare -= 1
+                    grown = True
+            if not grown:
+                break
+        return slots
+
+    def _interleave_product_results(self, ranked_lists: List[List[ChunkResult]]) -> List[ChunkResult]:
+        """Fair round-robin merge: every product's best result first, then every second-best, ..."""
+        interleaved = []
+        seen_ids = set()
+        depth = max((len(results) for results in ranked_lists), default=0)
+
+        for rank in range(depth):
+            for results in ranked_lists:
+                if rank < len(results):
+                    result = results[rank]
+                    if result.chunk_id in seen_ids:
+                        continue
+                    seen_ids.add(result.chunk_id)
+                    interleaved.append(result)
+
+        return interleaved
 
     def _enhance_query(self, query: str, entities: List[str]) -> str:
         """Enhance query with insurance-specific term expansion"""
-        
-        enhanced_query = query.lower()
-        
-        # Expand insurance abbreviations and terms
-        for abbrev, full_term in INSURANCE_TERMS.items():
-            if abbrev in enhanced_query:
-                enhanced_query = enhanced_query.replace(abbrev, f"{abbrev} {full_term}")
-        
-        # Add important entities to boost relevance
-        if entities:
-            # Add entities that aren't already in the query
-            query_words = set(enhanced_query.split())
-            additional_terms = []
-            
-            for entity in entities:
-                entity_words = set(entity.lower().split())
-                if not entity_words.issubset(query_words):
-                    additional_terms.append(entity)
-            
-            if additional_terms:
-                enhanced_query += " " + " ".join(additional_terms)
-        
-        return enhanced_query
+        return query_processor.process(query, entities).expanded
     
     def _build_product_filter(self, product_focus: List[str]) -> Optional[Filter]:
         """Build Weaviate filter for product precision"""
@@ -239,8 +508,14 @@ class RetrievalAgent:
     def _execute_simple_hybrid_search(self,
                                     query: str,
                                     where_filter: Optional[Filter],
-                                    limit: int) -> List[ChunkResult]:
-        """Execute simple hybrid search combining keyword and semantic search"""
+                                    limit: int,
+                                    query_embedding: Optional[List[float]] = None) -> Tuple[List[ChunkResult], bool]:
+        """
+        Execute simple hybrid search combining keyword and semantic search
+
+        Returns:
+            Fused results, and whether both the keyword and the vector search succeeded
+        """
 
         collection = self.client.collections.get(self.collection_name)
 
@@ -250,10 +525,11 @@ class RetrievalAgent:
             # 2. Vector search with manual embeddings
 
             # Get keyword search results
-            keyword_results = self._keyword_search(collection, query, where_filter, limit)
+            keyword_results, keyword_ok = self._keyword_search(collection, query, where_filter, limit)
 
             # Get vector search results
-            vector_results = self._vector_search(collection, query, where_filter, limit, "content")
+            vector_results, vector_ok = self._vector_search(collection, query, where_filter, limit, "content",
+                                                            query_embedding)
 
             # Combine and deduplicate results
             combined_results = self._combine_search_results(
@@ -263,86 +539,59 @@ class RetrievalAgent:
                 limit
             )
 
-            return combined_results
+            return combined_results, keyword_ok and vector_ok
 
         except Exception as e:
             print(f"Error in simple hybrid search: {e}")
             # Fallback to vector search only
-            return self._vector_search(collection, query, where_filter, limit, "content")
+            vector_results, _ = self._vector_search(collection, query, where_filter, limit, "content", query_embedding)
+            return vector_results, False
 
-    def _keyword_search(self, collection, query: str, where_filter: Optional[Filter], limit: int) -> List[ChunkResult]:
-        """Execute keyword search using BM25"""
+    def _keyword_search(self, collection, query: str, where_filter: Optional[Filter],
+                        limit: int) -> Tuple[List[ChunkResult], bool]:
+        """Execute keyword search using BM25; returns the results and whether the search succeeded"""
         try:
             if where_filter:
                 response = collection.query.bm25(
                     query=query,
                     limit=limit,
                     filters=where_filter,
-                    return_metadata=['score']
+                    return_metadata=['score'],
+                    return_properties=self.ID_ONLY_PROPERTIES
                 )
             else:
                 response = collection.query.bm25(
                     query=query,
                     limit=limit,
-                    return_metadata=['score']
+                    return_metadata=['score'],
+                    return_properties=self.ID_ONLY_PROPERTIES
                 )
 
-            results = []
+            hits = []
             for obj in response.objects:
                 # Use BM25 score
                 score = obj.metadata.score if obj.metadata and hasattr(obj.metadata, 'score') else 0.5
+                hits.append((obj.properties.get('chunk_id'), score, None))
 
-                chunk_result = ChunkResult.from_weaviate_result(
-                    dict(obj.properties),
-                    relevance_score=score,
-                    search_method="keyword_bm25",
-                    original_distance=None
-                )
-                results.append(chunk_result)
-
-            return results
+            return self._hydrate_hits(collection, hits, search_method="keyword_bm25"), True
 
         except Exception as e:
             print(f"Error in keyword search: {e}")
-            return []
+            return [], False
 
     def _combine_search_results(self, keyword_results: List[ChunkResult], vector_results: List[ChunkResult],
                                alpha: float, limit: int) -> List[ChunkResult]:
-        """Combine keyword and vector search results"""
-
-        # Create a map to combine results by content
-        combined_map = {}
-
-        # Add keyword results with weight (1 - alpha)
-        keyword_weight = 1 - alpha
-        for result in keyword_results:
-            content_key = result.content[:100]  # Use first 100 chars as key
-            if content_key not in combined_map:
-                combined_map[content_key] = result
-                combined_map[content_key].relevance_score *= keyword_weight
-                combined_map[content_key].search_method = "hybrid_keyword"
-            else:
-                # If already exists, boost the score
-                combined_map[content_key].relevance_score += result.relevance_score * keyword_weight * 0.5
-
-        # Add vector results with weight alpha
-        vector_weight = alpha
-        for result in vector_results:
-            content_key = result.content[:100]
-            if content_key not in combined_map:
-                combined_map[content_key] = result
-                combined_map[content_key].relevance_score *= vector_weight
-                combined_map[content_key].search_method = "hybrid_vector"
-            else:
-                # Combine scores
-                combined_map[content_key].relevance_score += result.relevance_score * vector_weight
-                combined_map[content_key].search_method = "hybrid_combined"
-
-        # Sort by combined relevance score and return top results
-        combined_results = list(combined_map.values())
-        combined_results.sort(key=lambda x: x.relevance_score, reverse=True)
-
-        return combined_results[:limit]
+        """Combine keyword and vector search results by chunk_id using the configured fusion method"""
+
+        return fuse_results(
+            [
+                ("keyword", keyword_results, 1 - alpha),
+                ("vector", vector_results, alpha)
+            ],
+            method=self.search_config.fusion_method,
+            rrf_k=self.search_config.rrf_k,
+            limit=limit
+        )
 
     def _execute_hybrid_search(self,
                              query: str,
@@ -362,11 +611,11 @@ class RetrievalAgent:
                 # Weaviate's hybrid search requires different setup for multi-vector collections
                 return self._multi_vector_search(collection, query, where_filter, limit, request)
             elif strategy == SearchStrategy.CONTENT_ONLY:
-                return self._vector_search(collection, query, where_filter, limit, "content")
+                return self._vector_search(collection, query, where_filter, limit, "content")[0]
             elif strategy == SearchStrategy.SUMMARY_ONLY:
-                return self._vector_search(collection, query, where_filter, limit, "summary")
+                return self._vector_search(collection, query, where_filter, limit, "summary")[0]
             elif strategy == SearchStrategy.QUESTIONS_ONLY:
-                return self._vector_search(collection, query, where_filter, limit, "questions")
+                return self._vector_search(collection, query, where_filter, limit, "questions")[0]
             else:
                 # Default to multi-vector
                 return self._multi_vector_search(collection, query, where_filter, limit)
@@ -380,7 +629,7 @@ class RetrievalAgent:
         print(f"🔍 RetrievalAgent: Multi-vector search for query: '{query}'")
 
         # Generate query embedding
-        query_embedding = self._generate_query_embedding(query)
+        query_embedding, _ = self._generate_query_embedding(query)
         print(f"🔍 RetrievalAgent: Generated query embedding (length: {len(query_embedding)})")
 
 
@@ -415,32 +664,30 @@ class RetrievalAgent:
                         target_vector=search_query["vector"],  # Specify which vector to search
                         limit=limit,
                         filters=where_filter,  # Use the filters parameter
-                        return_metadata=['distance']
+                        return_metadata=['distance'],
+                        return_properties=self.ID_ONLY_PROPERTIES
                     )
                 else:
                     response = collection.query.near_vector(
                         near_vector=search_query["embedding"],
                         target_vector=search_query["vector"],  # Specify which vector to search
                         limit=limit,
-                        return_metadata=['distance']
+                        return_metadata=['distance'],
+                        return_properties=self.ID_ONLY_PROPERTIES
                     )
 
                 # Process results
+                hits = []
                 for obj in response.objects:
-                    properties = dict(obj.properties)
                     distance = obj.metadata.distance if obj.metadata else 1.0
 
                     # Convert distance to relevance score (weighted)
                     relevance_score = (1 - min(distance, self.search_config.max_distance) / self.search_config.max_distance) * search_query["weight"]
+                    hits.append((obj.properties.get('chunk_id'), relevance_score, distance))
 
-                    chunk_result = ChunkResult.from_weaviate_result(
-                        properties,
-                        relevance_score=relevance_score,
-                        search_method=f"multi_vector_{search_query['vector']}",
-                        original_distance=distance
-                    )
-
-                    results.append(chunk_result)
+                results.extend(self._hydrate_hits(
+                    collection, hits, search_method=f"multi_vector_{search_query['vector']}"
+                ))
 
             except Exception as e:
                 print(f"Error in {search_query['vector']} search: {e}")
@@ -465,7 +712,8 @@ class RetrievalAgent:
                     limit=limit,
                     filters=where_filter,  # Use the filters parameter
                     target_vector="content_embedding",  # Specify target vector for multi-vector collections
-                    return_metadata=['distance', 'score']
+                    return_metadata=['distance', 'score'],
+                    return_properties=self.ID_ONLY_PROPERTIES
                 )
             else:
                 response = collection.query.hybrid(
@@ -473,10 +721,11 @@ class RetrievalAgent:
                     alpha=self.search_config.hybrid_alpha,
                     limit=limit,
                     target_vector="content_embedding",  # Specify target vector for multi-vector collections
-                    return_metadata=['distance', 'score']
+                    return_metadata=['distance', 'score'],
+                    return_properties=self.ID_ONLY_PROPERTIES
                 )
             
-            results = []
+            hits = []
             for obj in response.objects:
                 # Use hybrid score if available, otherwise convert distance
                 if hasattr(obj.metadata, 'score') and obj.metadata.score is not None:
@@ -485,27 +734,28 @@ class RetrievalAgent:
                     distance = obj.metadata.distance if obj.metadata else 1.0
                     relevance_score = 1 - min(distance, self.search_config.max_distance) / self.search_config.max_distance
 
-                chunk_result = ChunkResult.from_weaviate_result(
-                    dict(obj.properties),
-                    relevance_score=relevance_score,
-                    search_method=f"hybrid_{vector_name}",
-                    original_distance=obj.metadata.distance if obj.metadata else None
-                )
-
-                results.append(chunk_result)
+                hits.append((
+                    obj.properties.get('chunk_id'),
+                    relevance_score,
+                    obj.metadata.distance if obj.metadata else None
+                ))
             
-            return results
+            return self._hydrate_hits(collection, hits, search_method=f"hybrid_{vector_name}")
             
         except Exception as e:
             print(f"Error in hybrid search: {e}")
             return []
     
-    def _vector_search(self, collection, query: str, where_filter: Optional[Filter], limit: int, vector_name: str) -> List[ChunkResult]:
-        """Execute pure vector search"""
+    def _vector_search(self, collection, query: str, where_filter: Optional[Filter], limit: int, vector_name: str,
+                       query_embedding: Optional[List[float]] = None) -> Tuple[List[ChunkResult], bool]:
+        """Execute pure vector search; returns the results and whether the search succeeded"""
 
         try:
-            # Generate query embedding
-            query_embedding = self._generate_query_embedding(query)
+            # Generate query embedding unless the caller already has one
+            if query_embedding is None:
+                query_embedding, embedded = self._generate_query_embedding(query)
+                if not embedded:
+                    return [], False
 
             # Map vector names to actual embedding field names
             vector_field_map = {
@@ -523,66 +773,128 @@ class RetrievalAgent:
                     target_vector=vector_field,  # Specify which vector to search
                     limit=limit,
                     filters=where_filter,  # Use the filters parameter
-                    return_metadata=['distance']
+                    return_metadata=['distance'],
+                    return_properties=self.ID_ONLY_PROPERTIES
                 )
             else:
                 response = collection.query.near_vector(
                     near_vector=query_embedding,
                     target_vector=vector_field,  # Specify which vector to search
                     limit=limit,
-                    return_metadata=['distance']
+                    return_metadata=['distance'],
+                    return_properties=self.ID_ONLY_PROPERTIES
                 )
 
-            results = []
+            hits = []
             for obj in response.objects:
                 distance = obj.metadata.distance if obj.metadata else 1.0
                 relevance_score = 1 - min(distance, self.search_config.max_distance) / self.search_config.max_distance
+                hits.append((obj.properties.get('chunk_id'), relevance_score, distance))
 
-                chunk_result = ChunkResult.from_weaviate_result(
-                    dict(obj.properties),
-                    relevance_score=relevance_score,
-                    search_method=f"vector_{vector_name}",
-                    original_distance=distance
-                )
-
-                results.append(chunk_result)
-
-            return results
+            return self._hydrate_hits(collection, hits, search_method=f"vector_{vector_name}"), True
 
         except Exception as e:
             print(f"Error in vector search: {e}")
-            return []
+            return [], False
     
-    def _generate_query_embedding(self, query: str) -> List[float]:
-        """Generate embedding for query using Gemini"""
+    def _hydrate_hits(self,
+                      collection,
+                      hits: List[Tuple[str, float, Optional[float]]],
+                      search_method: str) -> List[ChunkResult]:
+        """
+        Build ChunkResults for ID-only search hits
+
+        Args:
+            collection: Weaviate collection, used only for chunks missing from the local store
+            hits: (chunk_id, relevance_score, original_distance) tuples in rank order
+            search_method: Search method label recorded on each result
+
+        Returns:
+            ChunkResult list in the same order as hits
+        """
+        records = self._load_chunk_records(collection, [chunk_id for chunk_id, _, _ in hits])
+
+        results = []
+        for chunk_id, relevance_score, original_distance in hits:
+            properties = records.get(chunk_id)
+            if properties is None:
+                continue
+            results.append(ChunkResult.from_weaviate_result(
+                properties,
+                relevance_score=relevance_score,
+                search_method=search_method,
+                original_distance=original_distance
+            ))
+
+        return results
+
+    def _load_chunk_records(self, collection, chunk_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Load chunk properties from the local store, fetching any misses from Weaviate"""
+        chunk_ids = [chunk_id for chunk_id in chunk_ids if chunk_id]
+        records = self.chunk_store.get_many(chunk_ids)
+
+        missing = list(dict.fromkeys(chunk_id for chunk_id in chunk_ids if chunk_id not in records))
+        if missing:
+            try:
+                # chunk_id is the object UUID; the word-tokenized chunk_id property would
+                # also match other objects sharing a hyphen-separated fragment
+                response = collection.query.fetch_objects(
+                    filters=Filter.by_id().contains_any(missing),
+                    limit=len(missing)
+                )
+                for obj in response.objects:
+                    properties = dict(obj.properties)
+                    records[properties.get('chunk_id') or str(obj.uuid)] = properties
+            except Exception as e:
+                print(f"Error hydrating {len(missing)} chunks from Weaviate: {e}")
+
+        return records
+
+    def _generate_query_embedding(self, query: str) -> Tuple[List[float], bool]:
+        """
+        Generate embedding for query using Gemini
+
+        Returns:
+            The embedding, and False when embedding failed and a zero vector was returned instead
+        """
 
         try:
             # Handle empty or whitespace-only queries
             if not query or not query.strip():
                 query = "general insurance information"
+            query = query.strip()
 
-            result = genai.embed_content(
-                model=Config.EMBEDDING_MODEL,
-                content=query.strip()
-            )
-            return result['embedding']
+            with self._query_embeddings_lock:
+                embedding = self._query_embeddings.get(query)
+                if embedding is not None:
+                    self._query_embeddings.move_to_end(query)
+                    return embedding, True
+
+            embedding = embed_text(query)
+
+            with self._query_embeddings_lock:
+                self._query_embeddings[query] = embedding
+                if len(self._query_embeddings) > Config.RETRIEVAL_CACHE_SIZE:
+                    self._query_embeddings.popitem(last=False)
+
+            return embedding, True
         except Exception as e:
             print(f"Error generating query embedding: {e}")
             # Return zero vector as fallback
-            return [0.0] * 3072  # Gemini embedding dimension
+            return [0.0] * Config.EMBEDDING_DIMENSIONS, False
     
     def _deduplicate_and_sort(self, results: List[ChunkResult], limit: int) -> List[ChunkResult]:
-        """Deduplicate results by content and sort by relevance score"""
+        """Deduplicate results by chunk_id and sort by relevance score"""
         
-        # Deduplicate by content (keep highest scoring)
-        seen_content = {}
+        # Deduplicate by chunk_id (keep highest scoring)
+        seen_chunks = {}
         for result in results:
-            content_key = result.content[:100]  # Use first 100 chars as key
-            if content_key not in seen_content or result.relevance_score > seen_content[content_key].relevance_score:
-                seen_content[content_key] = result
+            chunk_key = result.chunk_id or result.content
+            if chunk_key not in seen_chunks or result.relevance_score > seen_chunks[chunk_key].relevance_score:
+                seen_chunks[chunk_key] = result
         
         # Sort by relevance score (descending) and return top results
-        deduplicated = list(seen_content.values())
+        deduplicated = list(seen_chunks.values())
         deduplicated.sort(key=lambda x: x.relevance_score, reverse=True)
         
         return deduplicated[:limit]
@@ -591,5 +903,7 @@ class RetrievalAgent:
 
     def close(self):
         """Clean up resources"""
+        if hasattr(self, 'chunk_store'):
+            self.chunk_store.close()
         if hasattr(self, 'client'):
             self.client.close()
@@ -0,0 +1,194 @@
+"""
+Precomputed sentence embeddings for context compression
+
+At ingest the embedding pipeline splits every long chunk into sentences and
+embeds them once. The vectors are written as a single float32 matrix next
+to the chunk store, so query-time compression is a memory-mapped lookup and
+a matrix-vector product with no API calls.
+"""
+
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def min_compressible_sentences(top_sentences: int, neighbours: int) -> int:
+    """
+    Fewest sentences a chunk needs for compression to leave something out
+
+    The compressor keeps the top sentences and their neighbours; shorter
+    chunks are sent whole, so ingest does not embed their sentences either.
+    """
+    return top_sentences * (2 * neighbours + 1) + 1
+
+# Fragments shorter than this (list numbers, headings) are merged into the next sentence
+_MIN_SENTENCE_CHARS = 25
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;:])\s+(?=[A-Z0-9(\"'])")
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split chunk content into sentences
+
+    Lines are split first (Terms sections use one clause or list item per
+    line), then sentence punctuation within each line. Short fragments are
+    merged forward so "2." or "Section 3" never stand alone.
+    """
+    sentences: List[str] = []
+    pending = ""
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        for piece in _SENTENCE_BOUNDARY.split(line):
+            piece = f"{pending} {piece}".strip() if pending else piece.strip()
+            if len(piece) < _MIN_SENTENCE_CHARS:
+                pending = piece
+                continue
+            sentences.append(piece)
+            pending = ""
+    if pending:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
+
+class SentenceStore:
+    """
+    Memory-mapped sentence embeddings keyed by chunk_id
+
+    Layout (inside a chunk store directory):
+    - sentences.npy       float32 matrix, one normalized row per sentence
+    - sentences.idx.json  {"index_version", "dimensions", "chunks": {chunk_id: [first_row, [sentences]]}}
+
+    The index_version is copied from the chunk store build, so a store left
+    over from an older ingest is detected and ignored.
+    """
+
+    MATRIX_FILE = "sentences.npy"
+    INDEX_FILE = "sentences.idx.json"
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Chunk store directory the sentence files were written to
+        """
+        self.directory = Path(directory)
+        self._matrix: Optional[np.ndarray] = None
+        self._chunks: Dict[str, List[Any]] = {}
+        self.index_version: Optional[str] = None
+        self.dimensions: Optional[int] = None
+        self._index_mtime: Optional[int] = None
+
+        self._load()
+
+    def _load(self):
+        matrix_path = self.directory / self.MATRIX_FILE
+        index_path = self.directory / self.INDEX_FILE
+
+        self._index_mtime = self._stat_index()
+        if not matrix_path.exists() or not index_path.exists():
+            return
+
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+
+        self._chunks = index.get("chunks", {})
+        self.index_version = index.get("index_version")
+        self.dimensions = index.get("dimensions")
+        self._matrix = np.load(matrix_path, mmap_mode='r')
+
+    def _stat_index(self) -> Optional[int]:
+        try:
+            return os.stat(self.directory / self.INDEX_FILE).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self) -> bool:
+        """Reload if the pipeline has rebuilt the store; returns True on reload"""
+        if self._stat_index() == self._index_mtime:
+            return False
+        self._matrix = None
+        self._chunks = {}
+        self.index_version = None
+        self.dimensions = None
+        self._load()
+        return True
+
+    @property
+    def available(self) -> bool:
+        return self._matrix is not None
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def get(self, chunk_id: str) -> Optional[Tuple[List[str], np.ndarray]]:
+        """Sentences of a chunk and their embedding rows, or None if not stored"""
+        entry = self._chunks.get(chunk_id)
+        if entry is None or self._matrix is None:
+            return None
+        first_row, sentences = entry
+        return sentences, self._matrix[first_row:first_row + len(sentences)]
+
+    @classmethod
+    def build(cls, directory: str,
+              entries: Iterable[Tuple[str, Sequence[str], Sequence[Sequence[float]]]],
+              index_version: Optional[str],
+              dimensions: int) -> int:
+        """
+        Write the sentence store
+
+        Entries are consumed lazily and their rows appended to disk as they
+        arrive, so only one entry's embeddings need to be in memory at a time.
+
+        Args:
+            directory: Chunk store directory
+            entries: (chunk_id, sentences, embeddings) per chunk
+            index_version: Version stamp of the chunk store build these sentences belong to
+            dimensions: Embedding dimensionality
+
+        Returns:
+            Number of sentences written
+        """
+        target = Path(directory)
+        target.mkdir(parents=True, exist_ok=True)
+
+        # np.save appends .npy to names without it, so the temp name keeps the suffix
+        rows_tmp = target / f"tmp_{cls.MATRIX_FILE}.rows"
+        matrix_tmp = target / f"tmp_{cls.MATRIX_FILE}"
+        index_tmp = target / f"{cls.INDEX_FILE}.tmp"
+
+        chunks: Dict[str, List[Any]] = {}
+        row_count = 0
+        try:
+            with open(rows_tmp, 'wb') as rows:
+                for chunk_id, sentences, embeddings in entries:
+                    vectors = np.asarray(embeddings, dtype=np.float32).reshape(len(sentences), dimensions)
+                    chunks[chunk_id] = [row_count, list(sentences)]
+                    rows.write(vectors.tobytes())
+                    row_count += len(sentences)
+
+            # The .npy header needs the final row count, so it is written after the rows
+            with open(matrix_tmp, 'wb') as matrix, open(rows_tmp, 'rb') as rows:
+                np.lib.format.write_array_header_1_0(
+                    matrix, {"descr": np.dtype(np.float32).str, "fortran_order": False, "shape": (row_count, dimensions)}
+                )
+                shutil.copyfileobj(rows, matrix, 1024 * 1024)
+            with open(index_tmp, 'w', encoding='utf-8') as f:
+                json.dump({"index_version": index_version, "dimensions": dimensions, "chunks": chunks}, f)
+
+            os.replace(matrix_tmp, target / cls.MATRIX_FILE)
+            os.replace(index_tmp, target / cls.INDEX_FILE)
+        finally:
+            for path in (rows_tmp, matrix_tmp, index_tmp):
+                path.unlink(missing_ok=True)
+
+        return row_count
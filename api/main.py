@@ -15,7 +15,7 @@ from fastapi.responses import JSONResponse, PlainTextResponse
 
 from .models import (
     QueryRequest, QueryResponse, HealthCheckResponse,
-    ErrorResponse, AgentPipelineStatus, CitationResponse,
+    ErrorResponse, AgentPipelineStatus, PipelineStatsResponse, CitationResponse,
     ConversationRequest, SessionCreateRequest
 )
 from .conversation_models import ConversationHistory, ConversationSummary
@@ -93,7 +93,8 @@ async def root():
         "message": "HLAS Insurance Agent API",
         "version": "0.1.0",
         "docs": "/docs",
-        "health": "/health"
+        "health": "/health",
+        "stats": "/stats"
     }
 
 
@@ -142,6 +143,23 @@ async def get_agents_status():
         )
 
 
+@app.get("/stats", response_model=PipelineStatsResponse)
+async def get_pipeline_stats():
+    """Cache hit rates and cascade tier usage of the pipeline"""
+    try:
+        stats = agent_service.get_pipeline_stats()
+        return PipelineStatsResponse(
+            **stats,
+            timestamp=datetime.now(timezone.utc).isoformat() + "Z"
+        )
+    except Exception as e:
+        print(f"❌ API: Failed to get pipeline stats: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get pipeline stats: {str(e)}"
+        )
+
+
 @app.post("/query", response_model=QueryResponse)
 async def query_insurance(request: QueryRequest):
     """
@@ -174,7 +192,8 @@ async def query_insurance(request: QueryRequest):
             session_id=request.session_id,
             max_results=request.max_results,
             include_citations=request.include_citations,
-            include_confidence=request.include_confidence
+            include_confidence=request.include_confidence,
+            profile="web"
         )
         
         # Calculate processing time
@@ -236,7 +255,8 @@ async def query_insurance_simple(request: QueryRequest):
             session_id=request.session_id,
             max_results=request.max_results,
             include_citations=request.include_citations,
-            include_confidence=request.include_confidence
+            include_confidence=request.include_confidence,
+            profile="api-simple"
         )
 
         return {"response": result["formatted_response"]}
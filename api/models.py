@@ -49,7 +49,7 @@ class QueryResponse(BaseModel):
     context_available: int = Field(..., description="Total number of context chunks available")
     has_sufficient_context: bool = Field(..., description="Whether sufficient context was available")
     reasoning: str = Field(..., description="Reasoning about response quality")
-    formatted_response: str = Field(..., description="Complete formatted response with citations")
+    formatted_response: Optional[str] = Field(None, description="Complete formatted response with citations (only built for profiles that use it)")
     processing_time_ms: float = Field(..., description="Total processing time in milliseconds")
     
     class Config:
@@ -121,6 +121,14 @@ class AgentPipelineStatus(BaseModel):
         }
 
 
+class PipelineStatsResponse(BaseModel):
+    """Cache and model cascade counters of the agent pipeline"""
+    retrieval_cache: Dict[str, Any] = Field(..., description="Retrieval result cache hits and misses")
+    prompt_cache: Dict[str, Dict[str, Any]] = Field(..., description="Context cache counters per response model")
+    cascade: Optional[Dict[str, Any]] = Field(None, description="Per-tier cascade hit rates and latencies (None when off)")
+    timestamp: str = Field(..., description="Response timestamp")
+
+
 class ConversationRequest(BaseModel):
     """Request model for conversation history operations"""
     session_id: Optional[str] = Field(None, description="Session ID to retrieve history for")
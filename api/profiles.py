@@ -0,0 +1,67 @@
+"""
+Pipeline Profiles
+
+Each channel shows the user a different amount of the pipeline's output:
+WhatsApp sends a short answer with two sources, /query/simple returns only
+the formatted text, the web UI renders answer and citations itself. A
+profile sets how much work the pipeline does for a channel: chunks
+retrieved, context budget, generation model and output length, citation
+style and whether the formatted response string is built.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Union
+
+from agents.response_generation import CitationStyle
+from config import Config
+
+
+@dataclass(frozen=True)
+class PipelineProfile:
+    """Per-channel pipeline settings"""
+    name: str
+    top_k: int                                  # Chunks retrieved
+    context_token_budget: int                   # Estimated context tokens sent to the model
+    max_output_tokens: int                      # Generation length limit
+    response_model: Optional[str] = None        # None uses Config.RESPONSE_MODEL
+    citation_style: CitationStyle = CitationStyle.NUMBERED
+    max_citations: Optional[int] = None         # Sources shown (caps top_k, so every [n] keeps its source)
+    build_formatted_response: bool = False      # Build the formatted_response string
+
+
+PROFILES: Dict[str, PipelineProfile] = {
+    # Web UI renders answer and citations from the structured fields
+    "web": PipelineProfile(
+        name="web",
+        top_k=5,
+        context_token_budget=Config.CONTEXT_TOKEN_BUDGET,
+        max_output_tokens=1024
+    ),
+    # WhatsApp messages are short and list at most two sources
+    "whatsapp": PipelineProfile(
+        name="whatsapp",
+        top_k=2,
+        context_token_budget=min(Config.CONTEXT_TOKEN_BUDGET, 1500),
+        max_output_tokens=512,
+        max_citations=2
+    ),
+    # /query/simple returns only the formatted text
+    "api-simple": PipelineProfile(
+        name="api-simple",
+        top_k=5,
+        context_token_budget=Config.CONTEXT_TOKEN_BUDGET,
+        max_output_tokens=1024,
+        build_formatted_response=True
+    ),
+}
+
+DEFAULT_PROFILE = "web"
+
+
+def get_profile(profile: Union[str, PipelineProfile, None]) -> PipelineProfile:
+    """Resolve a profile name (or pass a profile through); unknown names fall back to web"""
+    if isinstance(profile, PipelineProfile):
+        return profile
+    if profile and profile not in PROFILES:
+        print(f"⚠️ Unknown pipeline profile '{profile}', using '{DEFAULT_PROFILE}'")
+    return PROFILES.get(profile or DEFAULT_PROFILE, PROFILES[DEFAULT_PROFILE])
@@ -5,14 +5,15 @@ Business logic layer that orchestrates the agent pipeline for API endpoints.
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 
-from agents.intent_router import IntentRouterAgent
+from agents.intent_router import IntentRouterAgent, PrimaryIntent
 from agents.retrieval import RetrievalAgent, RetrievalRequest, SearchStrategy
-from agents.response_generation import ResponseGenerationAgent, ResponseRequest, CitationStyle
+from agents.response_generation import ResponseGenerationAgent, ResponseRequest, BenefitsLookupEngine
 from .conversation_service import ConversationService
 from .conversation_models import MessageType
+from .profiles import PipelineProfile, get_profile
 from config import Config
 
 
@@ -31,6 +32,7 @@ class InsuranceAgentService:
         self.intent_router = None
         self.retrieval_agent = None
         self.response_agent = None
+        self.benefits_engine = None
         self.conversation_service = None
         self._initialize_agents()
         self._initialize_conversation_service()
@@ -54,6 +56,15 @@ class InsuranceAgentService:
             self.response_agent = ResponseGenerationAgent(gemini_api_key=Config.GEMINI_API_KEY)
             print("✅ InsuranceAgentService: Response Agent initialized")
 
+            # Optional fast path: a missing or unreadable Benefits folder only disables it
+            try:
+                self.benefits_engine = BenefitsLookupEngine.from_source()
+                print(f"✅ InsuranceAgentService: Benefits lookup initialized "
+                      f"({len(self.benefits_engine.index.entries)} plan limits)")
+            except Exception as e:
+                print(f"⚠️ InsuranceAgentService: Benefits lookup unavailable: {e}")
+                self.benefits_engine = None
+
         except Exception as e:
             print(f"❌ InsuranceAgentService: Error initializing agents: {e}")
             import traceback
@@ -76,9 +87,10 @@ class InsuranceAgentService:
         self,
         query: str,
         session_id: Optional[str] = None,
-        max_results: int = 5,
+        max_results: Optional[int] = None,
         include_citations: bool = True,
-        include_confidence: bool = True
+        include_confidence: bool = True,
+        profile: Union[str, PipelineProfile] = "web"
     ) -> Dict[str, Any]:
         """
         Process a user query through the complete agent pipeline.
@@ -86,13 +98,19 @@ class InsuranceAgentService:
         Args:
             query: User's insurance question
             session_id: Session ID for conversation tracking
-            max_results: Maximum number of context chunks to retrieve
+            max_results: Maximum number of context chunks to retrieve (defaults to the profile's top_k)
             include_citations: Whether to include citations in response
             include_confidence: Whether to include confidence score
+            profile: Pipeline profile of the calling channel ("web", "whatsapp", "api-simple")
             
         Returns:
             Dictionary containing the complete response data
         """
+        profile = get_profile(profile)
+        max_results = max_results or profile.top_k
+        if profile.max_citations is not None:
+            # Every retrieved chunk can be cited, so retrieve no more than the channel shows
+            max_results = min(max_results, profile.max_citations)
 
         # Auto-generate session ID if not provided
         if not session_id and self.conversation_service:
@@ -135,29 +153,56 @@ class InsuranceAgentService:
         print(f"   Entities: {intent_classification.entities}")
         print(f"   Is Purchase Intent: {intent_classification.is_purchase_intent}")
 
-        # Step 2: Document Retrieval
-        print(f"🔍 InsuranceAgentService: Step 2 - Document Retrieval")
+        # Single-figure plan limit questions are answered straight from the Benefits tables
+        response_result = None
+        if self.benefits_engine and intent_classification.primary_intent != PrimaryIntent.COMPARISON_INQUIRY:
+            response_result = self.benefits_engine.answer(query, intent_classification.product_focus)
+            if response_result:
+                print(f"⚡ InsuranceAgentService: Answered from benefits table, skipping retrieval and generation")
+
         retrieval_request = RetrievalRequest(
             intent_classification=intent_classification,
             top_k=max_results,
             search_strategy=SearchStrategy.MULTI_VECTOR
         )
 
-        context_chunks = self.retrieval_agent.retrieve(retrieval_request)
-        print(f"   Retrieved {len(context_chunks)} context chunks")
-        for i, chunk in enumerate(context_chunks[:3]):  # Show first 3
-            print(f"   Chunk {i+1}: {chunk.product_name} - {chunk.document_type} (Score: {chunk.relevance_score:.3f})")
-
-        # Step 3: Response Generation
-        print(f"🔍 InsuranceAgentService: Step 3 - Response Generation")
-        response_request = ResponseRequest(
-            original_query=query,
-            context_chunks=context_chunks,
-            citation_style=CitationStyle.NUMBERED,
-            include_confidence_score=include_confidence
-        )
+        # Questions nearly identical to an FAQ question get the stored FAQ answer
+        if response_result is None and intent_classification.primary_intent != PrimaryIntent.COMPARISON_INQUIRY:
+            faq_chunk = self.retrieval_agent.match_faq(retrieval_request)
+            if faq_chunk:
+                print(f"⚡ InsuranceAgentService: Answered from FAQ, skipping retrieval and generation")
+                response_result = self.response_agent.generate_faq_response(ResponseRequest(
+                    original_query=query,
+                    context_chunks=[faq_chunk],
+                    citation_style=profile.citation_style,
+                    include_confidence_score=include_confidence
+                ))
 
-        response_result = self.response_agent.generate_response(response_request)
+        if response_result is None:
+            # Step 2: Document Retrieval
+            print(f"🔍 InsuranceAgentService: Step 2 - Document Retrieval")
+            context_chunks = self.retrieval_agent.retrieve(retrieval_request)
+            print(f"   Retrieved {len(context_chunks)} context chunks")
+            for i, chunk in enumerate(context_chunks[:3]):  # Show first 3
+                print(f"   Chunk {i+1}: {chunk.product_name} - {chunk.document_type} (Score: {chunk.relevance_score:.3f})")
+
+            # Keep only the sentences of long chunks that answer the question
+            context_chunks = self.retrieval_agent.compress_results(retrieval_request, context_chunks)
+
+            # Step 3: Response Generation
+            print(f"🔍 InsuranceAgentService: Step 3 - Response Generation")
+            response_request = ResponseRequest(
+                original_query=query,
+                context_chunks=context_chunks,
+                citation_style=profile.citation_style,
+                include_confidence_score=include_confidence,
+                response_model=profile.response_model,
+                max_output_tokens=profile.max_output_tokens,
+                context_token_budget=profile.context_token_budget,
+                is_comparison=intent_classification.primary_intent == PrimaryIntent.COMPARISON_INQUIRY
+            )
+
+            response_result = self.response_agent.generate_response(response_request)
         print(f"   Generated answer length: {len(response_result.answer)} chars")
         print(f"   Confidence score: {response_result.confidence_score}")
         print(f"   Has sufficient context: {response_result.has_sufficient_context}")
@@ -184,8 +229,8 @@ class InsuranceAgentService:
         elif not session_id:
             print(f"ℹ️  InsuranceAgentService: No session_id available, skipping response storage")
 
-        # Return structured result with session_id
-        result = response_result.to_dict()
+        # Return structured result with session_id, trimmed to what the channel shows
+        result = response_result.to_dict(include_formatted_response=profile.build_formatted_response)
         result["session_id"] = session_id
         return result
     
@@ -224,6 +269,14 @@ class InsuranceAgentService:
         
         return health_status
     
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """Retrieval cache, prompt cache and cascade counters since the service started"""
+        return {
+            "retrieval_cache": self.retrieval_agent.result_cache.stats(),
+            "prompt_cache": self.response_agent.get_prompt_cache_stats(),
+            "cascade": self.response_agent.get_cascade_stats()
+        }
+
     async def get_detailed_agent_status(self) -> Dict[str, str]:
         """Get detailed status information for each agent"""
         status = {}
@@ -248,7 +301,7 @@ class InsuranceAgentService:
             if self.retrieval_agent and hasattr(self.retrieval_agent, 'client'):
                 print("🔍 Retrieval Agent: Testing vector database connection...")
                 # Test vector database connection
-                collection = self.retrieval_agent.client.collections.get('InsuranceDocumentChunk')
+                collection = self.retrieval_agent.client.collections.get(self.retrieval_agent.collection_name)
                 if collection:
                     status["retrieval"] = "operational"
                     print("✅ Retrieval Agent: operational - collection found")
@@ -151,9 +151,9 @@ class WhatsAppWebhook:
             # Process through the agent pipeline
             result = await self.agent_service.process_query(
                 query=query,
-                max_results=3,  # Limit for WhatsApp (shorter responses)
                 include_citations=True,
-                include_confidence=False  # Skip confidence for cleaner WhatsApp messages
+                include_confidence=False,  # Skip confidence for cleaner WhatsApp messages
+                profile="whatsapp"  # Fewer chunks, shorter generation, two sources
             )
             
             # Format response for WhatsApp
@@ -181,7 +181,7 @@ class WhatsAppWebhook:
             # Add sources if available (but keep it short for WhatsApp)
             if citations and len(citations) > 0:
                 response_parts.append("\n📚 *Sources:*")
-                for i, citation in enumerate(citations[:2], 1):  # Limit to 2 sources for WhatsApp
+                for i, citation in enumerate(citations, 1):  # Already limited by the whatsapp profile
                     source_info = f"{citation.get('product_name', 'Unknown')} {citation.get('document_type', 'Document')}"
                     response_parts.append(f"[{i}] {source_info}")
             
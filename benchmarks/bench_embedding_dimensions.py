@@ -0,0 +1,143 @@
+"""
+Benchmark for Matryoshka-truncated embedding sizes
+
+Embeds the FAQ answers from Source/FAQs once at the full 3072 dimensions,
+then truncates and renormalizes them to each candidate EMBEDDING_DIMENSIONS
+value. For every size it reports:
+
+- Recall@k of each FAQ question retrieving its own answer
+- Overlap of the top-k neighbours with the full 3072-dimensional ranking
+- Raw vector memory for the three named vectors stored per chunk
+- Brute-force search latency per query (a lower bound for HNSW distance cost)
+- JSON payload size of one query vector, as sent to Weaviate
+
+Full-size embeddings are cached in an .npz file so reruns make no API calls.
+
+Usage:
+    python benchmarks/bench_embedding_dimensions.py [--sizes 768 1536 3072] [--k 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import google.generativeai as genai
+
+from agents.embedding.chunking_strategies import FAQChunker
+from agents.embedding.embedding_utils import prepare_embedding
+from agents.embedding.models import ProductType
+from config import Config
+
+
+FULL_DIMENSIONS = 3072
+VECTORS_PER_CHUNK = 3
+
+
+def load_faq_pairs() -> List[tuple]:
+    """(question, answer) pairs from every FAQ file, chunked exactly as at ingest"""
+    pairs = []
+    faq_dir = os.path.join(ROOT, Config.SOURCE_DIR, "FAQs")
+    for product in Config.INSURANCE_PRODUCTS:
+        path = os.path.join(faq_dir, f"{product}_FAQs.txt")
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            chunks = FAQChunker().chunk(f.read(), {
+                'product_type': ProductType(product),
+                'source_file': os.path.basename(path)
+            })
+        pairs.extend((chunk.question, chunk.content) for chunk in chunks)
+    return pairs
+
+
+def embed_full(texts: List[str], batch_size: int) -> np.ndarray:
+    """Embed texts at the full output size in batches"""
+    vectors = []
+    for start in range(0, len(texts), batch_size):
+        batch = [text[:2048] for text in texts[start:start + batch_size]]
+        result = genai.embed_content(model=Config.EMBEDDING_MODEL, content=batch)
+        vectors.extend(result['embedding'])
+        print(f"   embedded {min(start + batch_size, len(texts))}/{len(texts)}", end="\r", flush=True)
+    print()
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def truncate(matrix: np.ndarray, dimensions: int) -> np.ndarray:
+    return np.asarray([prepare_embedding(row, dimensions) for row in matrix], dtype=np.float32)
+
+
+def top_k(queries: np.ndarray, documents: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ documents.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 768, 1536, 3072])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=0, help="Use only the first N FAQ pairs (0 = all)")
+    parser.add_argument("--cache", default=os.path.join(ROOT, "data", "bench_faq_embeddings.npz"))
+    parser.add_argument("--repeats", type=int, default=20, help="Latency measurement repeats")
+    args = parser.parse_args()
+
+    pairs = load_faq_pairs()
+    if args.limit:
+        pairs = pairs[:args.limit]
+    questions = [q for q, _ in pairs]
+    answers = [a for _, a in pairs]
+    print(f"📊 Embedding dimension benchmark: {len(pairs)} FAQ pairs, recall@{args.k}")
+    print("=" * 78)
+
+    if os.path.exists(args.cache):
+        cached = np.load(args.cache)
+        question_vectors, answer_vectors = cached["questions"], cached["answers"]
+        print(f"📦 Loaded full-size embeddings from {args.cache}")
+        if len(question_vectors) != len(pairs):
+            sys.exit(f"❌ Cache holds {len(question_vectors)} pairs but {len(pairs)} were loaded; delete {args.cache}")
+    else:
+        genai.configure(api_key=Config.GEMINI_API_KEY)
+        print("🔄 Embedding questions and answers at 3072 dimensions...")
+        question_vectors = embed_full(questions, Config.EMBEDDING_BATCH_SIZE)
+        answer_vectors = embed_full(answers, Config.EMBEDDING_BATCH_SIZE)
+        os.makedirs(os.path.dirname(args.cache), exist_ok=True)
+        np.savez(args.cache, questions=question_vectors, answers=answer_vectors)
+
+    reference = top_k(truncate(question_vectors, FULL_DIMENSIONS), truncate(answer_vectors, FULL_DIMENSIONS), args.k)
+    expected = np.arange(len(pairs))[:, None]
+
+    print(f"\n{'dims':>6} {'recall@k':>9} {'overlap':>8} {'index MB':>9} {'µs/query':>9} {'payload KB':>11}")
+    for dimensions in args.sizes:
+        queries = truncate(question_vectors, dimensions)
+        documents = truncate(answer_vectors, dimensions)
+
+        neighbours = top_k(queries, documents, args.k)
+        recall = float(np.mean(np.any(neighbours == expected, axis=1)))
+        overlap = float(np.mean([
+            len(set(row) & set(ref)) / args.k for row, ref in zip(neighbours, reference)
+        ]))
+
+        index_mb = len(pairs) * dimensions * 4 * VECTORS_PER_CHUNK / 1e6
+
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            for query in queries:
+                np.argpartition(-(documents @ query), args.k)[:args.k]
+        latency_us = (time.perf_counter() - start) / (args.repeats * len(queries)) * 1e6
+
+        payload_kb = len(json.dumps(queries[0].tolist())) / 1024
+
+        print(f"{dimensions:>6} {recall:>9.3f} {overlap:>8.3f} {index_mb:>9.2f} {latency_us:>9.1f} {payload_kb:>11.1f}")
+
+    print("\nindex MB counts raw float32 vectors for the three named vectors per chunk (HNSW graph excluded).")
+
+
+if __name__ == "__main__":
+    main()
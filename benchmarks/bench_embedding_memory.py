@@ -0,0 +1,157 @@
+"""
+Benchmark for the memory footprint of ingestion embeddings
+
+Chunks the full Source corpus exactly as at ingest and gives every chunk its
+three named vectors (content, summary, questions), then holds all of them at
+once, as a phase-wise or incremental ingestion run does before writing to
+Weaviate. Two representations are compared, each in a fresh subprocess so
+peak RSS is measured independently:
+
+- lists:  each vector a Python list of floats (the former DocumentChunk storage)
+- arrays: each vector a float32 row of its embed request's matrix (current storage)
+
+Reports per representation:
+- Peak RSS of the process and its growth over the chunked corpus alone
+- Time to build the vectors from the API's response lists
+- Time to convert them to the lists the Weaviate client is sent
+
+No API calls are made: vector values do not affect memory, so synthetic
+embeddings of the full 3072-dimensional API output stand in for Gemini's.
+Chunks get a placeholder summary and questions so all three vectors exist.
+
+Usage:
+    python benchmarks/bench_embedding_memory.py [--dimensions 3072] [--batch-size 50]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from agents.embedding.chunking_strategies import ChunkerFactory
+from agents.embedding.embedding_utils import prepare_embedding, prepare_embeddings
+from agents.embedding.models import DocumentChunk, ProductType
+from agents.embedding.vector_store import WeaviateVectorStore
+from config import Config
+
+
+API_DIMENSIONS = 3072
+MODES = ["lists", "arrays"]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def load_corpus() -> List[DocumentChunk]:
+    """Every chunk of the Source corpus, with placeholder enrichment"""
+    chunks = []
+    for subdir, pattern in (("Terms", "{}_Terms.md"), ("FAQs", "{}_FAQs.txt"), ("Benefits", "{}_Tables.txt")):
+        for product in Config.INSURANCE_PRODUCTS:
+            path = os.path.join(ROOT, Config.SOURCE_DIR, subdir, pattern.format(product))
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                chunks.extend(ChunkerFactory.get_chunker(path).chunk(f.read(), {
+                    'product_type': ProductType(product),
+                    'policy_name': product,
+                    'source_file': os.path.basename(path)
+                }))
+    for chunk in chunks:
+        chunk.summary = chunk.summary or chunk.content[:200]
+        chunk.hypothetical_questions = chunk.hypothetical_questions or [f"Question {i}?" for i in range(3)]
+    return chunks
+
+
+def measure(mode: str, dimensions: int, batch_size: int) -> dict:
+    """Hold embeddings for the whole corpus in one representation (run in a subprocess)"""
+    chunks = load_corpus()
+    slots = WeaviateVectorStore._embedding_slots(chunks)
+    baseline = peak_rss_mb()
+    rng = np.random.default_rng(0)
+
+    started = time.perf_counter()
+    for start in range(0, len(slots), batch_size):
+        batch = slots[start:start + batch_size]
+        # The API returns JSON-decoded lists at its full output size
+        response = rng.standard_normal((len(batch), API_DIMENSIONS)).tolist()
+        if mode == "lists":
+            vectors = [prepare_embedding(values, dimensions).tolist() for values in response]
+        else:
+            vectors = list(prepare_embeddings(response, dimensions))
+        for (chunk, attribute, _), vector in zip(batch, vectors):
+            setattr(chunk, attribute, vector)
+        del response
+    build_seconds = time.perf_counter() - started
+    peak = peak_rss_mb()
+
+    started = time.perf_counter()
+    for chunk, attribute, _ in slots:
+        vector = getattr(chunk, attribute)
+        payload = vector if isinstance(vector, list) else vector.tolist()
+        del payload
+    convert_seconds = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "chunks": len(chunks),
+        "vectors": len(slots),
+        "baseline_mb": baseline,
+        "peak_mb": peak,
+        "build_seconds": build_seconds,
+        "convert_seconds": convert_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dimensions", type=int, default=Config.EMBEDDING_DIMENSIONS,
+                        help="Stored embedding size (default: EMBEDDING_DIMENSIONS)")
+    parser.add_argument("--batch-size", type=int, default=Config.EMBEDDING_BATCH_SIZE,
+                        help="Texts per simulated embed request")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.dimensions, args.batch_size)))
+        return
+
+    results = []
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--mode", mode,
+             "--dimensions", str(args.dimensions), "--batch-size", str(args.batch_size)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    first = results[0]
+    print(f"📊 Embedding memory benchmark: {first['chunks']} chunks, {first['vectors']} vectors "
+          f"of {args.dimensions} dimensions")
+    print("=" * 78)
+    print(f"\n{'storage':>8} {'peak RSS MB':>12} {'growth MB':>10} {'KB/chunk':>9} {'build s':>8} {'to-list s':>10}")
+    for result in results:
+        growth = result["peak_mb"] - result["baseline_mb"]
+        print(f"{result['mode']:>8} {result['peak_mb']:>12.1f} {growth:>10.1f} "
+              f"{growth * 1024 / result['chunks']:>9.1f} {result['build_seconds']:>8.2f} "
+              f"{result['convert_seconds']:>10.2f}")
+
+    lists, arrays = (result["peak_mb"] - result["baseline_mb"] for result in results)
+    if arrays > 0:
+        print(f"\nFloat32 arrays use {lists / arrays:.1f}x less memory for the corpus's embeddings.")
+    print("growth is peak RSS over the chunked corpus alone; to-list s is the Weaviate boundary conversion.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Benchmark for hybrid search score fusion
+
+Compares the legacy content-prefix combiner that RetrievalAgent used to
+apply against the chunk_id-keyed fusion stage (reciprocal rank fusion and
+min-max weighted fusion) on synthetic BM25 / vector result lists.
+
+Reports:
+- Fusion cost per query
+- Distinct chunks lost by the legacy 100-character content key
+- Ranking stability when the BM25 score scale shifts between queries
+- Top-k agreement between each method and the legacy ranking
+
+Usage:
+    python benchmarks/bench_fusion.py [--queries 2000] [--limit 10]
+"""
+
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+from typing import List, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.retrieval.models import ChunkResult
+from agents.retrieval.fusion import fuse_results
+
+
+ALPHA = 0.7
+BENEFITS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Source", "Benefits")
+
+
+def legacy_combine(keyword_results: List[ChunkResult], vector_results: List[ChunkResult],
+                   alpha: float, limit: int) -> List[ChunkResult]:
+    """The combiner RetrievalAgent used before chunk_id-keyed fusion"""
+    combined_map = {}
+
+    keyword_weight = 1 - alpha
+    for result in keyword_results:
+        content_key = result.content[:100]
+        if content_key not in combined_map:
+            combined_map[content_key] = result
+            combined_map[content_key].relevance_score *= keyword_weight
+            combined_map[content_key].search_method = "hybrid_keyword"
+        else:
+            combined_map[content_key].relevance_score += result.relevance_score * keyword_weight * 0.5
+
+    vector_weight = alpha
+    for result in vector_results:
+        content_key = result.content[:100]
+        if content_key not in combined_map:
+            combined_map[content_key] = result
+            combined_map[content_key].relevance_score *= vector_weight
+            combined_map[content_key].search_method = "hybrid_vector"
+        else:
+            combined_map[content_key].relevance_score += result.relevance_score * vector_weight
+            combined_map[content_key].search_method = "hybrid_combined"
+
+    combined_results = list(combined_map.values())
+    combined_results.sort(key=lambda x: x.relevance_score, reverse=True)
+    return combined_results[:limit]
+
+
+def rrf_combine(keyword_results, vector_results, alpha, limit):
+    return fuse_results([("keyword", keyword_results, 1 - alpha), ("vector", vector_results, alpha)],
+                        method="rrf", limit=limit)
+
+
+def weighted_combine(keyword_results, vector_results, alpha, limit):
+    return fuse_results([("keyword", keyword_results, 1 - alpha), ("vector", vector_results, alpha)],
+                        method="weighted", limit=limit)
+
+
+METHODS = {
+    "legacy": legacy_combine,
+    "rrf": rrf_combine,
+    "weighted": weighted_combine,
+}
+
+
+def load_table_rows() -> List[str]:
+    """Benefit table rows exactly as BenefitsTableChunker emits them (one chunk per line)"""
+    rows = []
+    if not os.path.isdir(BENEFITS_DIR):
+        return rows
+    for name in sorted(os.listdir(BENEFITS_DIR)):
+        with open(os.path.join(BENEFITS_DIR, name), 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not (line.startswith('TABLE') and 'FROM' in line):
+                    rows.append(line)
+    return rows
+
+
+def make_corpus(size: int, rng: random.Random) -> List[dict]:
+    """Real benefit table rows (many share long prefixes) padded with synthetic prose chunks"""
+    contents = load_table_rows()
+    for i in range(len(contents), size):
+        contents.append(f"Chunk {i} " + " ".join(rng.choice(["cover", "claim", "excess", "policy", "travel", "car"])
+                                                 for _ in range(40)))
+    return [
+        {"chunk_id": f"chunk-{i}", "content": content, "relevance": rng.random()}
+        for i, content in enumerate(contents)
+    ]
+
+
+def make_query(corpus: List[dict], limit: int, rng: random.Random):
+    """Return (keyword_results, vector_results) with scores on their native scales"""
+    def ranked(noise: float, to_score: Callable[[float], float], method: str):
+        scored = [(doc["relevance"] + rng.gauss(0, noise), doc) for doc in corpus]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [
+            ChunkResult(content=doc["content"], product_name="Travel", document_type="Terms",
+                        source_file="Travel_Terms.md", section_hierarchy=[],
+                        relevance_score=to_score(signal), chunk_id=doc["chunk_id"], search_method=method)
+            for signal, doc in scored[:limit]
+        ]
+
+    # BM25 scores are unbounded (here roughly 0-15); vector scores are distance-derived and in [0, 1]
+    keyword = ranked(0.25, lambda signal: max(0.0, signal * 12.0), "keyword_bm25")
+    vector = ranked(0.15, lambda signal: max(0.0, min(1.0, 0.2 + signal * 0.6)), "vector_content")
+    return keyword, vector
+
+
+def scale_scores(results: List[ChunkResult], factor: float) -> List[ChunkResult]:
+    scaled = copy.deepcopy(results)
+    for result in scaled:
+        result.relevance_score *= factor
+    return scaled
+
+
+def top_ids(results: List[ChunkResult], k: int) -> List[str]:
+    return [r.chunk_id for r in results[:k]]
+
+
+def overlap(a: List[str], b: List[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(set(a) & set(b)) / max(len(a), len(b))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--corpus", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = make_corpus(args.corpus, rng)
+    queries = [make_query(corpus, args.limit, rng) for _ in range(args.queries)]
+    k = min(5, args.limit)
+
+    print(f"📊 Fusion benchmark: {args.queries} queries, {args.limit} results per search, top-{k} compared")
+    print("=" * 72)
+
+    # 1. Cost per fusion call (inputs are copied up front so copying is not timed)
+    print("\n⏱️  Fusion cost")
+    for name, combine in METHODS.items():
+        inputs = [copy.deepcopy(q) for q in queries]
+        start = time.perf_counter()
+        for keyword, vector in inputs:
+            combine(keyword, vector, ALPHA, args.limit)
+        elapsed = time.perf_counter() - start
+        print(f"   {name:<9} {elapsed / args.queries * 1e6:8.1f} µs/query")
+
+    # 2. Distinct chunks collapsed by the legacy content-prefix key
+    lost = 0
+    for keyword, vector in queries:
+        distinct = {r.chunk_id for r in keyword + vector}
+        fused = legacy_combine(copy.deepcopy(keyword), copy.deepcopy(vector), ALPHA, len(distinct))
+        lost += len(distinct) - len(fused)
+    print(f"\n🧩 Distinct chunks merged away by the legacy 100-char key: "
+          f"{lost} ({lost / args.queries:.2f} per query); chunk_id fusion: 0")
+
+    # 3. Stability when the BM25 scale changes (e.g. longer queries produce larger BM25 scores)
+    print(f"\n📐 Top-{k} stability when BM25 scores are rescaled (1.0 = identical ranking)")
+    factors = [0.5, 2.0, 4.0]
+    print(f"   {'method':<9}" + "".join(f"  x{factor:<6}" for factor in factors))
+    for name, combine in METHODS.items():
+        row = []
+        for factor in factors:
+            total = 0.0
+            for keyword, vector in queries:
+                base = combine(copy.deepcopy(keyword), copy.deepcopy(vector), ALPHA, args.limit)
+                shifted = combine(scale_scores(keyword, factor), copy.deepcopy(vector), ALPHA, args.limit)
+                total += overlap(top_ids(base, k), top_ids(shifted, k))
+            row.append(total / args.queries)
+        print(f"   {name:<9}" + "".join(f"  {value:<7.3f}" for value in row))
+
+    # 4. Agreement with the legacy ranking
+    print(f"\n🔁 Top-{k} overlap with the legacy combiner")
+    for name in ("rrf", "weighted"):
+        total = 0.0
+        for keyword, vector in queries:
+            legacy = legacy_combine(copy.deepcopy(keyword), copy.deepcopy(vector), ALPHA, args.limit)
+            fused = METHODS[name](copy.deepcopy(keyword), copy.deepcopy(vector), ALPHA, args.limit)
+            total += overlap(top_ids(legacy, k), top_ids(fused, k))
+        print(f"   {name:<9} {total / args.queries:.3f}")
+
+
+if __name__ == "__main__":
+    main()
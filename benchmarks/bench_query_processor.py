@@ -0,0 +1,150 @@
+"""
+Benchmark for query normalization and expansion
+
+Compares the legacy substring-replace expansion (the former
+RetrievalAgent._enhance_query) with the precompiled QueryProcessor on
+synthetic insurance queries built from INSURANCE_TERMS and entity lists. It reports:
+
+- Throughput in µs per query, cold (every query processed from scratch) and
+  warm (repeat queries served from the processor's memo)
+- Average expanded query length in tokens
+- How many legacy expansions repeated a term or fired inside a longer word
+
+Usage:
+    python benchmarks/bench_query_processor.py [--queries 100000] [--seed 7]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from agents.retrieval.models import INSURANCE_TERMS
+from agents.retrieval.query_processor import QueryProcessor
+
+
+TEMPLATES = [
+    "What is the {term} for {product}?",
+    "Does my {product} policy cover {term}?",
+    "How do I make a claim for {term} under {product}",
+    "{term} vs {term2} - which plans include them?",
+    "Is there an excess on {term} claims for my car?",
+    "Can my maid's helper get {term} coverage while on vacation",
+    "compare {product} and {product2} {term} benefits",
+    "What's the sum insured for {term} on the Silver plan?",
+]
+
+FILLERS = ["card", "carpet", "scare", "policyholder", "trips", "helpers", "premiums", "ICU", "A&E", "GP"]
+PRODUCTS = ["Car", "Early", "Family", "Home", "Hospital", "Maid", "Travel"]
+
+
+def legacy_enhance_query(query: str, entities: List[str]) -> str:
+    """Former RetrievalAgent._enhance_query, kept verbatim for comparison"""
+    enhanced_query = query.lower()
+
+    for abbrev, full_term in INSURANCE_TERMS.items():
+        if abbrev in enhanced_query:
+            enhanced_query = enhanced_query.replace(abbrev, f"{abbrev} {full_term}")
+
+    if entities:
+        query_words = set(enhanced_query.split())
+        additional_terms = []
+
+        for entity in entities:
+            entity_words = set(entity.lower().split())
+            if not entity_words.issubset(query_words):
+                additional_terms.append(entity)
+
+        if additional_terms:
+            enhanced_query += " " + " ".join(additional_terms)
+
+    return enhanced_query
+
+
+def build_queries(count: int, seed: int) -> List[Tuple[str, List[str]]]:
+    rng = random.Random(seed)
+    vocabulary = list(INSURANCE_TERMS) + FILLERS
+    queries = []
+    for _ in range(count):
+        template = rng.choice(TEMPLATES)
+        query = template.format(
+            term=rng.choice(vocabulary),
+            term2=rng.choice(vocabulary),
+            product=rng.choice(PRODUCTS),
+            product2=rng.choice(PRODUCTS)
+        )
+        entities = rng.sample(PRODUCTS, rng.randint(0, 2))
+        queries.append((query, entities))
+    return queries
+
+
+def has_repeated_expansion(text: str) -> bool:
+    """True if any multi-word expansion appears more than once"""
+    return any(text.count(expansion) > 1 for expansion in INSURANCE_TERMS.values() if " " in expansion)
+
+
+def fired_inside_word(query: str) -> bool:
+    """True if the legacy substring check matched a term inside a longer word"""
+    lowered = query.lower()
+    for term in INSURANCE_TERMS:
+        if term in lowered and not re.search(rf"(?<![\w&]){re.escape(term)}(?:e?s)?(?![\w&])", lowered):
+            return True
+    return False
+
+
+def time_per_query(fn, queries) -> float:
+    start = time.perf_counter()
+    for query, entities in queries:
+        fn(query, entities)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    queries = build_queries(args.queries, args.seed)
+    processor = QueryProcessor()
+
+    print(f"📊 Query processor benchmark: {len(queries):,} queries")
+    print("=" * 60)
+
+    legacy_us = time_per_query(legacy_enhance_query, queries)
+    cold_us = time_per_query(lambda q, e: processor._process(q, e), queries)
+    warm_us = time_per_query(lambda q, e: processor.process(q, e), queries)
+
+    legacy_outputs = [legacy_enhance_query(q, e) for q, e in queries]
+    processed = [processor.process(q, e) for q, e in queries]
+
+    stats = Counter()
+    for (query, _), legacy, result in zip(queries, legacy_outputs, processed):
+        stats["legacy_tokens"] += len(legacy.split())
+        stats["processor_tokens"] += len(result.terms)
+        stats["legacy_repeated"] += has_repeated_expansion(legacy)
+        stats["processor_repeated"] += has_repeated_expansion(result.expanded)
+        stats["legacy_inside_word"] += fired_inside_word(query)
+
+    distinct_keys = len({result.cache_key for result in processed})
+    distinct_raw = len({(query, tuple(entities)) for query, entities in queries})
+
+    print(f"{'':<28} {'legacy':>12} {'processor':>12}")
+    print(f"{'µs / query (cold)':<28} {legacy_us:>12.2f} {cold_us:>12.2f}")
+    print(f"{'µs / query (memoized)':<28} {'':>12} {warm_us:>12.2f}")
+    print(f"{'avg expanded tokens':<28} {stats['legacy_tokens'] / len(queries):>12.2f} "
+          f"{stats['processor_tokens'] / len(queries):>12.2f}")
+    print(f"{'repeated expansions':<28} {stats['legacy_repeated']:>12,} {stats['processor_repeated']:>12,}")
+    print(f"{'substring false matches':<28} {stats['legacy_inside_word']:>12,} {0:>12,}")
+    print(f"\nDistinct (query, entities) inputs: {distinct_raw:,}, distinct cache keys: {distinct_keys:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,13 @@ class Config:
     # Weaviate Configuration
     WEAVIATE_HOST: str = os.getenv("WEAVIATE_HOST", "localhost")
     WEAVIATE_PORT: int = int(os.getenv("WEAVIATE_PORT", "8080"))
+    # Name searched by the Retrieval Agent; an alias to the live versioned collection
+    # (<name>_v<N>) after a blue/green build, or a plain collection before the first one
+    WEAVIATE_COLLECTION: str = os.getenv("WEAVIATE_COLLECTION", "InsuranceDocumentChunk")
+    # Previous collection versions kept for rollback after an alias swap
+    COLLECTION_VERSIONS_KEPT: int = int(os.getenv("COLLECTION_VERSIONS_KEPT", "2"))
+    # How often the Retrieval Agent checks whether the alias moved to a new version
+    ALIAS_CHECK_INTERVAL_SECONDS: float = float(os.getenv("ALIAS_CHECK_INTERVAL_SECONDS", "30"))
 
     # MongoDB Configuration
     MONGODB_HOST: str = os.getenv("MONGODB_HOST", "localhost")
@@ -28,22 +35,82 @@ class Config:
     
     # Document Processing
     SOURCE_DIR: str = os.getenv("SOURCE_DIR", "Source")
+
+    # Local chunk store used to hydrate ID-only search results
+    CHUNK_STORE_DIR: str = os.getenv("CHUNK_STORE_DIR", "data/chunk_store")
+
+    # Staged ingestion runs: per-stage artifacts and checkpoints, one directory per run ID
+    INGEST_RUNS_DIR: str = os.getenv("INGEST_RUNS_DIR", "data/ingest_runs")
+    # Chunks enriched or embedded between two checkpoints of a staged run
+    INGEST_CHECKPOINT_CHUNKS: int = int(os.getenv("INGEST_CHECKPOINT_CHUNKS", "100"))
+
+    # Summaries, questions and embeddings reused across ingestion runs (empty disables)
+    ENRICHMENT_CACHE_PATH: str = os.getenv("ENRICHMENT_CACHE_PATH", "data/enrichment_cache.sqlite")
     
     # Embedding Configuration
     EMBEDDING_MODEL: str = "gemini-embedding-001"
+    # Matryoshka output size (768, 1536 or 3072); must match the index being searched
+    EMBEDDING_DIMENSIONS: int = int(os.getenv("EMBEDDING_DIMENSIONS", "3072"))
     GENERATION_MODEL: str = "gemini-2.5-flash"
+    # Enrichment concurrency and the GENERATION_MODEL quota it must stay within
+    ENRICHMENT_CONCURRENCY: int = int(os.getenv("ENRICHMENT_CONCURRENCY", "8"))
+    ENRICHMENT_MAX_RETRIES: int = int(os.getenv("ENRICHMENT_MAX_RETRIES", "5"))
+    # Chunks packed into one JSON enrichment prompt (1 uses the per-chunk prompts)
+    ENRICHMENT_BATCH_SIZE: int = int(os.getenv("ENRICHMENT_BATCH_SIZE", "8"))
+    # Re-requests of malformed items before falling back to the per-chunk prompts
+    ENRICHMENT_JSON_RETRIES: int = int(os.getenv("ENRICHMENT_JSON_RETRIES", "2"))
+    GENERATION_RPM: int = int(os.getenv("GENERATION_RPM", "1000"))
+    GENERATION_TPM: int = int(os.getenv("GENERATION_TPM", "1000000"))
+    RESPONSE_MODEL: str = os.getenv("RESPONSE_MODEL", "gemini-2.0-flash-exp")
+    # Cascade mode: set RESPONSE_FAST_MODEL to answer with it first and re-generate with
+    # RESPONSE_MODEL only when the answer's confidence is below RESPONSE_CASCADE_THRESHOLD
+    RESPONSE_FAST_MODEL: str = os.getenv("RESPONSE_FAST_MODEL", "")
+    RESPONSE_CASCADE_THRESHOLD: float = float(os.getenv("RESPONSE_CASCADE_THRESHOLD", "0.6"))
     
     # Chunking Parameters
     MAX_CHUNK_SIZE: int = 2048
     CHUNK_OVERLAP: int = 200
     
     # Batch Processing
-    EMBEDDING_BATCH_SIZE: int = 50
+    # Texts per batch embed request (the API accepts at most 100)
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "50"))
+    # Retries of a failed embed batch before its texts are embedded one by one
+    EMBEDDING_MAX_RETRIES: int = int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))
     WEAVIATE_BATCH_SIZE: int = 100
+    # Chunks waiting between two ingestion pipeline stages (bounds memory in flight)
+    PIPELINE_QUEUE_SIZE: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))
     
     # Search Configuration
     DEFAULT_SEARCH_LIMIT: int = 5
     MAX_SEARCH_LIMIT: int = 20
+
+    # Retrieval result cache
+    RETRIEVAL_CACHE_SIZE: int = int(os.getenv("RETRIEVAL_CACHE_SIZE", "1024"))
+    RETRIEVAL_CACHE_NEGATIVE_TTL: float = float(os.getenv("RETRIEVAL_CACHE_NEGATIVE_TTL", "60"))
+    
+    # Response generation context packing (estimated tokens)
+    CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+    CONTEXT_MAX_CHUNK_TOKENS: int = int(os.getenv("CONTEXT_MAX_CHUNK_TOKENS", "800"))
+
+    # Sentence-level context compression (sentences kept per long chunk)
+    COMPRESSION_TOP_SENTENCES: int = int(os.getenv("COMPRESSION_TOP_SENTENCES", "3"))
+    COMPRESSION_NEIGHBOURS: int = int(os.getenv("COMPRESSION_NEIGHBOURS", "1"))
+    
+    # Gemini context caching of the response prompt prefix
+    PROMPT_CACHE_TTL_SECONDS: int = int(os.getenv("PROMPT_CACHE_TTL_SECONDS", "900"))
+    # Gemini rejects explicit caches below 4096 tokens for the default response models
+    PROMPT_CACHE_MIN_TOKENS: int = int(os.getenv("PROMPT_CACHE_MIN_TOKENS", "4096"))
+    PROMPT_CACHE_MIN_USES: int = int(os.getenv("PROMPT_CACHE_MIN_USES", "2"))
+
+    # Map-reduce comparison answers: one partial answer per product, merged into a table
+    COMPARISON_MAP_REDUCE_MIN_PRODUCTS: int = int(os.getenv("COMPARISON_MAP_REDUCE_MIN_PRODUCTS", "3"))
+    COMPARISON_PRODUCT_TOKEN_BUDGET: int = int(os.getenv("COMPARISON_PRODUCT_TOKEN_BUDGET", "1200"))
+    COMPARISON_PARTIAL_MAX_TOKENS: int = int(os.getenv("COMPARISON_PARTIAL_MAX_TOKENS", "384"))
+
+    # FAQ fast path: question similarity needed to return a stored FAQ answer directly.
+    # Per-product overrides as "Travel=0.9,Car=0.95"; a threshold above 1 disables a product.
+    FAQ_FAST_PATH_THRESHOLD: float = float(os.getenv("FAQ_FAST_PATH_THRESHOLD", "0.92"))
+    FAQ_FAST_PATH_THRESHOLDS: str = os.getenv("FAQ_FAST_PATH_THRESHOLDS", "")
     
     # Product Configuration
     INSURANCE_PRODUCTS = ["Car", "Early", "Family", "Home", "Hospital", "Maid", "Travel"]
@@ -2,8 +2,10 @@
 Main script to run the Embedding Agent
 """
 
+import argparse
 import os
 from agents.embedding import EmbeddingAgent
+from agents.embedding.staged_run import STAGES
 from config import Config
 
 
@@ -109,8 +111,34 @@ def check_gemini_api(api_key):
         return False
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the Embedding Agent pipeline")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Sync changed chunks into the existing collection instead of rebuilding it"
+    )
+    parser.add_argument(
+        "--blue-green", action="store_true",
+        help="Build a new collection version and switch the alias to it after validation"
+    )
+    parser.add_argument(
+        "--run-id",
+        help=f"Staged run to create or resume (artifacts under {Config.INGEST_RUNS_DIR}/<run-id>)"
+    )
+    parser.add_argument(
+        "--from-stage", choices=STAGES,
+        help="Re-run the pipeline from this stage using the run's earlier artifacts"
+    )
+    parser.add_argument(
+        "--to-stage", choices=STAGES,
+        help="Stop the staged run after this stage"
+    )
+    return parser.parse_args()
+
+
 def main():
     """Run the embedding agent pipeline with status checks"""
+    args = parse_args()
 
     print("🚀 Starting Embedding Agent with Status Checks")
     print("=" * 60)
@@ -160,7 +188,17 @@ def main():
         # Step 6: Run the pipeline
         print("\n🚀 Step 6: Running Embedding Pipeline")
         print("=" * 40)
-        chunks = agent.run()
+        if args.run_id or args.from_stage or args.to_stage:
+            # Staged mode persists every stage's output so an interrupted run can resume
+            chunks = agent.run_staged(
+                run_id=args.run_id,
+                from_stage=args.from_stage,
+                to_stage=args.to_stage or STAGES[-1],
+                incremental=args.incremental,
+                blue_green=args.blue_green
+            )
+        else:
+            chunks = agent.run(incremental=args.incremental, blue_green=args.blue_green)
 
         # Step 7: Verify results
         print(f"\n✅ Step 7: Pipeline Complete!")
@@ -172,7 +210,8 @@ def main():
             for i, chunk in enumerate(chunks[:3]):
                 print(f"   Chunk {i+1}: {chunk.product_name} - {chunk.document_type}")
                 print(f"   Content: {chunk.content[:100]}...")
-                print(f"   Embeddings: Content={len(chunk.content_embedding)}, Summary={len(chunk.summary_embedding)}")
+                # Embeddings are released once a chunk is inserted
+                print(f"   Summary: {(chunk.summary or 'N/A')[:100]}")
                 print()
 
         # Step 8: Test search functionality
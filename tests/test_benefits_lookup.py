@@ -0,0 +1,49 @@
+"""
+Tests for direct Benefits table answers, run against the real Source/Benefits tables
+"""
+
+import pytest
+
+from agents.response_generation.benefits_lookup import BenefitsLookupEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return BenefitsLookupEngine.from_source()
+
+
+def test_single_benefit_is_answered_from_its_line(engine):
+    result = engine.answer("What is the compassionate visit benefit for the Gold plan?", ["Travel"])
+    assert result is not None
+    assert "$10,000 for the Gold plan" in result.answer
+    assert "line 13" in result.reasoning
+
+
+def test_stated_qualifier_picks_its_line(engine):
+    result = engine.answer(
+        "What is the maximum accidental death benefit payable per adult on the Silver plan?", ["Family"]
+    )
+    assert result is not None
+    assert "S$100,000 for the Silver plan" in result.answer
+
+
+def test_adult_and_child_limits_are_not_guessed(engine):
+    # Adult (age bands) and Child lines tie on the question's terms
+    assert engine.answer("How much overseas medical expenses cover for Travel Silver?", ["Travel"]) is None
+    assert engine.answer("What is the maximum accidental death benefit payable on the Silver plan?", ["Family"]) is None
+
+
+def test_covid_and_regular_limits_are_not_guessed(engine):
+    assert engine.answer("How much is the trip cancellation benefit for Gold?", ["Travel"]) is None
+
+
+def test_negated_question_does_not_match_not_applicable_lines(engine):
+    assert engine.answer("What is not covered for trip cancellation?", ["Travel"]) is None
+
+
+def test_what_is_and_cover_alone_are_not_figure_questions(engine):
+    assert engine.answer("What is covered under overseas medical expenses?", ["Travel"]) is None
+
+
+def test_several_products_are_not_answered(engine):
+    assert engine.answer("How much is the overseas funeral expenses for Silver plan?", ["Travel", "Family"]) is None
@@ -0,0 +1,48 @@
+"""
+Tests for sentence-level context compression and the ingest threshold it shares
+"""
+
+import numpy as np
+import pytest
+
+from agents.retrieval.context_compression import SentenceCompressor
+from agents.retrieval.models import ChunkResult
+from agents.retrieval.sentence_store import SentenceStore, min_compressible_sentences
+
+
+def _sentences(count):
+    return [f"Sentence number {i} of the policy wording." for i in range(count)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    dimensions = 4
+    entries = []
+    for count in (9, 10):
+        vectors = np.zeros((count, dimensions), dtype=np.float32)
+        vectors[:, 1] = 1.0
+        vectors[count // 2] = [1.0, 0.0, 0.0, 0.0]
+        entries.append((f"chunk-{count}", _sentences(count), vectors))
+    SentenceStore.build(str(tmp_path), entries, index_version="v1", dimensions=dimensions)
+    return SentenceStore(str(tmp_path))
+
+
+def _result(count):
+    return ChunkResult(content=" ".join(_sentences(count)), product_name="Travel", document_type="Terms",
+                       source_file="Travel_Terms.md", section_hierarchy=[], relevance_score=0.8,
+                       chunk_id=f"chunk-{count}")
+
+
+def test_threshold_follows_compression_settings():
+    assert min_compressible_sentences(3, 1) == 10
+    assert min_compressible_sentences(2, 0) == 3
+
+
+def test_only_chunks_at_the_threshold_are_compressed(store):
+    compressor = SentenceCompressor(store, top_sentences=3, neighbours=1)
+    results, stats = compressor.compress([1.0, 0.0, 0.0, 0.0], [_result(9), _result(10)])
+
+    assert results[0].content == _result(9).content
+    assert results[1].content != _result(10).content
+    assert stats.chunks_compressed == 1
+    assert stats.sentences_total == 10
@@ -0,0 +1,41 @@
+"""
+Tests for Matryoshka truncation and the index dimensionality checks
+"""
+
+import numpy as np
+import pytest
+
+from agents.embedding.embedding_utils import (
+    format_index_description, parse_index_dimensions, prepare_embedding, prepare_embeddings,
+    validate_index_dimensions
+)
+
+
+def test_embeddings_are_truncated_and_renormalized():
+    matrix = prepare_embeddings([[3.0, 4.0, 12.0], [0.0, 2.0, 1.0]], dimensions=2)
+
+    assert matrix.dtype == np.float32 and matrix.shape == (2, 2)
+    np.testing.assert_allclose(matrix, [[0.6, 0.8], [0.0, 1.0]], rtol=1e-6)
+
+
+def test_zero_prefix_stays_zero():
+    np.testing.assert_array_equal(prepare_embedding([0.0, 0.0, 1.0], dimensions=2), [0.0, 0.0])
+
+
+def test_embedding_shorter_than_configured_is_rejected():
+    with pytest.raises(ValueError, match="fewer than the configured 4"):
+        prepare_embedding([1.0, 0.0, 0.0], dimensions=4)
+
+
+def test_index_description_round_trip():
+    assert parse_index_dimensions(format_index_description(768)) == 768
+    assert parse_index_dimensions("Insurance document chunks") is None
+    assert parse_index_dimensions(None) is None
+
+
+def test_index_built_at_other_dimensions_is_rejected(monkeypatch):
+    monkeypatch.setattr("agents.embedding.embedding_utils.Config.EMBEDDING_DIMENSIONS", 768)
+    validate_index_dimensions(768, "chunk store")
+    validate_index_dimensions(None, "collection without a recorded size")
+    with pytest.raises(ValueError, match="EMBEDDING_DIMENSIONS=1536"):
+        validate_index_dimensions(1536, "chunk store")
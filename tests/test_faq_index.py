@@ -0,0 +1,144 @@
+"""
+Tests for the FAQ fast path matcher
+"""
+
+import numpy as np
+import pytest
+
+from agents.retrieval.faq_index import FAQMatcher, FAQQuestionStore
+
+
+@pytest.fixture
+def matcher(tmp_path):
+    questions = {
+        "faq-buy-after-departure": ["Can I buy travel insurance after departure?",
+                                    "Is it possible to purchase travel cover after I have left?"],
+        "faq-claim-documents": ["What documents do I need to make a claim?"],
+    }
+    vectors = np.eye(4, dtype=np.float32)
+    entries = []
+    row = 0
+    for chunk_id, texts in questions.items():
+        entries.append((chunk_id, texts, vectors[row:row + len(texts)]))
+        row += len(texts)
+    FAQQuestionStore.build(str(tmp_path), entries, index_version="v1", dimensions=4)
+    return FAQMatcher(FAQQuestionStore(str(tmp_path)))
+
+
+def test_same_question_matches_lexically(matcher):
+    candidates = matcher.candidates("can I buy travel insurance after departure", None)
+    assert [(c.chunk_id, c.method, c.similarity) for c in candidates] == \
+        [("faq-buy-after-departure", "lexical", 1.0)]
+
+
+def test_variation_matches_lexically(matcher):
+    candidates = matcher.candidates("Is it possible to purchase travel cover after I have left", None)
+    assert [c.chunk_id for c in candidates] == ["faq-buy-after-departure"]
+
+
+@pytest.mark.parametrize("query", [
+    "Where can I buy travel insurance after departure?",
+    "When can I buy travel insurance after departure?",
+    "Can I buy travel insurance departure after?",
+])
+def test_different_question_words_or_order_do_not_match(matcher, query):
+    assert matcher.candidates(query, None) == []
+
+
+def test_lexical_miss_falls_back_to_embedding_similarity(matcher):
+    candidates = matcher.candidates("Where can I buy travel insurance after departure?",
+                                    np.array([0.6, 0.8, 0.0, 0.0], dtype=np.float32))
+    assert candidates[0].method == "embedding"
+    assert candidates[0].chunk_id == "faq-buy-after-departure"
+    assert candidates[0].similarity == pytest.approx(0.8)
+
+
+class _Collections:
+    def get(self, name):
+        return object()
+
+
+class _Client:
+    collections = _Collections()
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+    from agents.retrieval.retrieval_agent import RetrievalAgent
+
+    near = np.array([0.99, np.sqrt(1 - 0.99 ** 2), 0.0, 0.0], dtype=np.float32)
+    entries = [
+        ("faq-a", ["Can I buy travel insurance after departure?"], np.eye(4, dtype=np.float32)[0:1]),
+        ("faq-b", ["Can I buy travel insurance once overseas?"], near[None, :]),
+        ("faq-c", ["Is my car covered overseas?"], np.eye(4, dtype=np.float32)[2:3]),
+    ]
+    FAQQuestionStore.build(str(tmp_path), entries, index_version="v1", dimensions=4)
+
+    agent = RetrievalAgent.__new__(RetrievalAgent)
+    agent.client = _Client()
+    agent.collection_name = "Insurance"
+    agent.chunk_store = SimpleNamespace(index_version="v1")
+    agent.faq_store = FAQQuestionStore(str(tmp_path))
+    agent.faq_matcher = FAQMatcher(agent.faq_store, default_threshold=0.92)
+    agent.products = {"faq-a": "Travel", "faq-b": "Travel", "faq-c": "Car"}
+    agent.query_embedding = ([1.0, 0.0, 0.0, 0.0], True)
+    monkeypatch.setattr(agent, "_generate_query_embedding", lambda query: agent.query_embedding)
+    monkeypatch.setattr(agent, "_load_chunk_records", lambda collection, chunk_ids: {
+        chunk_id: {"chunk_id": chunk_id, "content": f"Answer {chunk_id}", "product_name": agent.products[chunk_id],
+                   "document_type": "FAQ", "source_file": "FAQ.txt", "section_hierarchy": []}
+        for chunk_id in chunk_ids
+    })
+    return agent
+
+
+def _faq_request(query, products=("Travel",)):
+    from agents.intent_router.models import IntentClassification, PrimaryIntent
+    from agents.retrieval.models import RetrievalRequest
+
+    classification = IntentClassification(
+        primary_intent=PrimaryIntent.PRODUCT_INQUIRY, product_focus=list(products), entities=[],
+        is_purchase_intent=False, original_query=query
+    )
+    return RetrievalRequest(intent_classification=classification)
+
+
+def test_two_close_faqs_of_one_product_are_not_a_clear_match(agent):
+    assert agent.match_faq(_faq_request("Buying travel cover after I leave")) is None
+
+
+def test_close_faq_of_another_product_does_not_block_the_match(agent):
+    agent.products["faq-b"] = "Car"
+    chunk = agent.match_faq(_faq_request("Buying travel cover after I leave"))
+
+    assert chunk.chunk_id == "faq-a"
+    assert chunk.relevance_score == pytest.approx(1.0)
+    assert chunk.search_method == "faq_embedding"
+
+
+def test_match_below_the_product_threshold_is_rejected(agent):
+    agent.products["faq-b"] = "Car"
+    agent.query_embedding = ([0.9, 0.0, 0.0, np.sqrt(1 - 0.9 ** 2)], True)
+    assert agent.match_faq(_faq_request("Buying travel cover after I leave")) is None
+
+    agent.faq_matcher.product_thresholds = {"travel": 0.85}
+    assert agent.match_faq(_faq_request("Buying travel cover after I leave")).chunk_id == "faq-a"
+
+
+def test_faq_outside_the_product_focus_is_ignored(agent):
+    agent.query_embedding = ([0.0, 0.0, 1.0, 0.0], True)
+    assert agent.match_faq(_faq_request("Is my car covered overseas")) is None
+    assert agent.match_faq(_faq_request("Is my car covered overseas", products=("Car",))).chunk_id == "faq-c"
+
+
+def test_failed_query_embedding_matches_lexically_only(agent):
+    agent.query_embedding = ([0.0, 0.0, 0.0, 0.0], False)
+    assert agent.match_faq(_faq_request("Buying travel cover after I leave")) is None
+
+    chunk = agent.match_faq(_faq_request("Can I buy travel insurance after departure?"))
+    assert chunk.chunk_id == "faq-a" and chunk.search_method == "faq_lexical"
+
+
+def test_stale_faq_store_is_not_used(agent):
+    agent.chunk_store.index_version = "v2"
+    assert agent.match_faq(_faq_request("Can I buy travel insurance after departure?")) is None
@@ -0,0 +1,69 @@
+"""
+Tests for chunk_id-keyed fusion of keyword and vector results
+"""
+
+import pytest
+
+from agents.retrieval.fusion import fuse_results
+from agents.retrieval.models import ChunkResult
+
+
+def _chunk(chunk_id, score, content=None):
+    return ChunkResult(content=content or f"content {chunk_id}", product_name="Travel", document_type="Terms",
+                       source_file="Travel_Terms.md", section_hierarchy=[], relevance_score=score,
+                       chunk_id=chunk_id)
+
+
+def _sources(keyword_weight=0.3, vector_weight=0.7):
+    keyword = [_chunk("k", 12.0), _chunk("both", 9.0), _chunk("k2", 3.0)]
+    vector = [_chunk("both", 0.82), _chunk("v", 0.75)]
+    return [("keyword", keyword, keyword_weight), ("vector", vector, vector_weight)]
+
+
+@pytest.mark.parametrize("method", ["rrf", "weighted"])
+def test_chunk_found_by_both_searches_ranks_first(method):
+    fused = fuse_results(_sources(), method=method)
+
+    assert [result.chunk_id for result in fused][0] == "both"
+    assert fused[0].search_method == "hybrid_combined"
+    assert len(fused) == 4
+    assert all(0.0 <= result.fused_score <= 1.0 for result in fused)
+
+
+def test_rrf_top_rank_in_every_list_scores_one():
+    sources = [("keyword", [_chunk("a", 4.0)], 0.3), ("vector", [_chunk("a", 0.9)], 0.7)]
+    assert fuse_results(sources)[0].fused_score == pytest.approx(1.0)
+
+
+def test_relevance_score_stays_a_similarity():
+    fused = {result.chunk_id: result for result in fuse_results(_sources())}
+
+    # Vector hits keep their similarity, not their fused rank score
+    assert fused["both"].relevance_score == pytest.approx(0.82)
+    assert fused["v"].relevance_score == pytest.approx(0.75)
+    # Keyword-only hits get their normalized BM25 score scaled by the keyword weight's share
+    assert fused["k"].relevance_score == pytest.approx(0.3)
+    assert fused["k2"].relevance_score == pytest.approx(0.0)
+    assert fused["k"].search_method == "hybrid_keyword"
+
+
+def test_weighted_fusion_is_not_dominated_by_raw_bm25_scores():
+    sources = [("keyword", [_chunk("k", 40.0), _chunk("v", 1.0)], 0.3),
+               ("vector", [_chunk("v", 0.9), _chunk("k", 0.2)], 0.7)]
+    assert [result.chunk_id for result in fuse_results(sources, method="weighted")] == ["v", "k"]
+
+
+def test_results_without_chunk_id_merge_on_content():
+    sources = [("keyword", [_chunk(None, 5.0, content="same text")], 0.3),
+               ("vector", [_chunk(None, 0.7, content="same text")], 0.7)]
+    fused = fuse_results(sources)
+
+    assert len(fused) == 1
+    assert fused[0].search_method == "hybrid_combined"
+
+
+def test_limit_and_unknown_method():
+    assert len(fuse_results(_sources(), limit=2)) == 2
+    assert fuse_results([("keyword", [], 0.3), ("vector", [], 0.7)]) == []
+    with pytest.raises(ValueError):
+        fuse_results(_sources(), method="sum")
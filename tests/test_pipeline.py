@@ -0,0 +1,112 @@
+"""
+Tests for the bounded-queue streaming pipeline, including its error and stop paths
+"""
+
+import itertools
+import threading
+
+from agents.embedding.pipeline import Stage, StreamingPipeline
+
+
+def _run(pipeline, source, sink=None, timeout=10):
+    """Run the pipeline in a thread so a deadlock fails the test instead of hanging it"""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["stats"] = pipeline.run(source, sink=sink)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "pipeline did not stop"
+    return outcome
+
+
+def test_items_flow_through_every_stage_in_batches():
+    batch_sizes = []
+
+    def double(batch):
+        batch_sizes.append(len(batch))
+        return [item * 2 for item in batch]
+
+    outputs = []
+    pipeline = StreamingPipeline([
+        Stage("double", double, workers=2, batch_size=3),
+        Stage("increment", lambda batch: [item + 1 for item in batch], batch_size=4),
+    ], queue_size=2)
+    outcome = _run(pipeline, range(10), sink=outputs.append)
+
+    assert sorted(outputs) == [item * 2 + 1 for item in range(10)]
+    assert max(batch_sizes) <= 3
+    assert outcome["stats"]["double"]["processed"] == 10
+    assert outcome["stats"]["increment"]["processed"] == 10
+
+
+def test_stage_error_is_raised_and_stops_reading_the_source():
+    consumed = itertools.count()
+
+    def source():
+        for item in itertools.count():
+            next(consumed)
+            yield item
+
+    def fail_on_five(batch):
+        if 5 in batch:
+            raise ValueError("enrichment failed")
+        return batch
+
+    pipeline = StreamingPipeline([
+        Stage("enrich", fail_on_five, workers=2),
+        Stage("insert", lambda batch: batch),
+    ], queue_size=2)
+    outcome = _run(pipeline, source())
+
+    assert isinstance(outcome["error"], ValueError)
+    assert next(consumed) < 100
+
+
+def test_failing_last_stage_unblocks_upstream_stages():
+    def fail(batch):
+        raise RuntimeError("insert failed")
+
+    pipeline = StreamingPipeline([
+        Stage("embed", lambda batch: batch, workers=3),
+        Stage("insert", fail),
+    ], queue_size=1)
+    outcome = _run(pipeline, range(1000))
+
+    assert str(outcome["error"]) == "insert failed"
+
+
+def test_source_error_is_raised():
+    def source():
+        yield 1
+        raise IOError("document unreadable")
+
+    outputs = []
+    outcome = _run(StreamingPipeline([Stage("chunk", lambda batch: batch)]), source(), sink=outputs.append)
+
+    assert isinstance(outcome["error"], IOError)
+
+
+def test_sink_error_is_raised():
+    def sink(item):
+        raise KeyError(item)
+
+    outcome = _run(StreamingPipeline([Stage("chunk", lambda batch: batch)]), range(5), sink=sink)
+
+    assert isinstance(outcome["error"], KeyError)
+
+
+def test_first_error_wins():
+    def fail(batch):
+        raise ValueError(f"batch {batch[0]}")
+
+    pipeline = StreamingPipeline([Stage("enrich", fail, workers=4)], queue_size=4)
+    outcome = _run(pipeline, range(20))
+
+    assert isinstance(outcome["error"], ValueError)
+    assert pipeline._errors[0] is outcome["error"]
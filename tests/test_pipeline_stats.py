@@ -0,0 +1,44 @@
+"""
+Tests for the pipeline counters served by /stats
+"""
+
+from agents.response_generation.cascade import CascadeStats
+from agents.response_generation.prompt_cache import PromptCache
+from agents.response_generation.response_agent import ResponseGenerationAgent
+from agents.retrieval.result_cache import RetrievalCache
+from api.models import PipelineStatsResponse
+from api.services import InsuranceAgentService
+
+
+class _RetrievalAgent:
+    def __init__(self):
+        self.result_cache = RetrievalCache()
+
+
+def _service(cascade):
+    response_agent = ResponseGenerationAgent.__new__(ResponseGenerationAgent)
+    response_agent._prompt_caches = {("strong-model", 1024): PromptCache("strong-model", {})}
+    response_agent.cascade_stats = CascadeStats("fast-model", "strong-model") if cascade else None
+
+    service = InsuranceAgentService.__new__(InsuranceAgentService)
+    service.retrieval_agent = _RetrievalAgent()
+    service.response_agent = response_agent
+    return service
+
+
+def test_stats_cover_caches_and_cascade():
+    service = _service(cascade=True)
+    service.response_agent.cascade_stats.record("fast", 120.0, accepted=True)
+    stats = service.get_pipeline_stats()
+
+    assert stats["retrieval_cache"]["misses"] == 0
+    assert stats["prompt_cache"]["strong-model/1024"]["created"] == 0
+    assert stats["cascade"]["requests"] == 1
+    PipelineStatsResponse(**stats, timestamp="2026-01-01T00:00:00Z")
+
+
+def test_cascade_stats_are_empty_when_cascade_is_off():
+    stats = _service(cascade=False).get_pipeline_stats()
+
+    assert stats["cascade"] is None
+    PipelineStatsResponse(**stats, timestamp="2026-01-01T00:00:00Z")
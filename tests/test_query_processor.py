@@ -0,0 +1,63 @@
+"""
+Tests for single-pass query normalization and synonym expansion
+"""
+
+from agents.retrieval.query_processor import QueryProcessor
+
+
+SYNONYMS = {
+    "maid": "maid domestic helper",
+    "car": "car motor vehicle",
+    "claim": "claim reimbursement",
+    "sum insured": "sum insured coverage limit",
+    "sum": "total amount",
+}
+
+
+def _processor():
+    return QueryProcessor(SYNONYMS)
+
+
+def test_expansion_is_not_re_expanded():
+    processed = _processor().process("Maid insurance for my maid")
+
+    assert processed.normalized == "maid insurance for my maid"
+    assert processed.expanded == "maid insurance for my maid domestic helper"
+
+
+def test_terms_match_whole_tokens_only():
+    processed = _processor().process("Does the card cover scarves?")
+    assert processed.expanded == processed.normalized
+
+
+def test_plural_matches_the_singular_term():
+    assert _processor().process("how many claims").expanded == "how many claims claim reimbursement"
+
+
+def test_longest_term_wins():
+    processed = _processor().process("what is the sum insured")
+
+    assert processed.expanded.endswith("coverage limit")
+    assert "total" not in processed.terms
+
+
+def test_entities_added_once_unless_already_present():
+    processed = _processor().process("car excess", entities=["Car Protect360", "excess"])
+
+    assert processed.expanded == "car excess motor vehicle protect360"
+    assert processed.terms == ("car", "excess", "motor", "vehicle", "protect360")
+
+
+def test_cache_key_ignores_order_case_and_stopwords():
+    processor = _processor()
+    first = processor.process("What is the car excess?")
+    second = processor.process("excess for CAR")
+
+    assert first.cache_key == second.cache_key
+    assert first.normalized != second.normalized
+
+
+def test_repeat_queries_are_memoized():
+    processor = _processor()
+    assert processor.process("car excess") is processor.process("car excess")
+    assert processor.process("car excess") is not processor.process("car excess", entities=["excess"])
@@ -0,0 +1,91 @@
+"""
+Tests for the context prefix the response agent sends through the prompt cache
+"""
+
+import pytest
+
+from agents.response_generation.context_packer import ContextPacker
+from agents.response_generation.models import ResponseRequest
+from agents.response_generation.response_agent import ResponseGenerationAgent
+from agents.retrieval.models import ChunkResult
+
+
+class _PromptCache:
+    def __init__(self, cached_model=None):
+        self.cached_model = cached_model
+        self.prefixes = []
+
+    def get_model(self, system_instruction, prefix, prefix_tokens):
+        self.prefixes.append(prefix)
+        return self.cached_model
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    agent = ResponseGenerationAgent.__new__(ResponseGenerationAgent)
+    agent.model_name = "strong-model"
+    agent.fast_model_name = None
+    agent.cascade_stats = None
+    agent.context_packer = ContextPacker()
+    agent.prompt_cache = _PromptCache()
+    agent.answers = []
+    monkeypatch.setattr(agent, "_get_prompt_cache", lambda model_name, max_output_tokens=None: agent.prompt_cache)
+
+    def generate_answer(query, context_text, citation_style, model_name=None, max_output_tokens=None,
+                        cached_model=None, cacheable=False):
+        agent.answers.append((context_text, cached_model))
+        return "Trip cancellation is covered up to $5,000 [1]."
+
+    monkeypatch.setattr(agent, "_generate_answer", generate_answer)
+    return agent
+
+
+def _chunk(chunk_id, content, full_content=None):
+    return ChunkResult(content=content, product_name="Travel", document_type="Terms",
+                       source_file="Travel_Terms.md", section_hierarchy=["Benefits"], relevance_score=0.8,
+                       chunk_id=chunk_id, full_content=full_content)
+
+
+def _requests():
+    cancellation = "Trip cancellation is covered up to $5,000. Delays are covered after 6 hours."
+    medical = "Overseas medical expenses are covered up to $500,000. Evacuation is included."
+    first = ResponseRequest(original_query="Is trip cancellation covered?", context_chunks=[
+        _chunk("a", "Trip cancellation is covered up to $5,000.", cancellation),
+        _chunk("b", "Evacuation is included.", medical),
+    ])
+    second = ResponseRequest(original_query="Are medical expenses covered?", context_chunks=[
+        _chunk("b", "Overseas medical expenses are covered up to $500,000.", medical),
+        _chunk("a", "Delays are covered after 6 hours.", cancellation),
+    ])
+    return first, second
+
+
+def test_cached_prefix_does_not_depend_on_the_question(agent):
+    for request in _requests():
+        agent.generate_response(request)
+
+    first, second = agent.prompt_cache.prefixes
+    assert first == second
+    assert "Delays are covered after 6 hours." in first
+    assert "Evacuation is included." in first
+
+
+def test_cached_model_answers_from_the_stable_prefix(agent):
+    agent.prompt_cache.cached_model = object()
+    first, _ = _requests()
+    result = agent.generate_response(first)
+
+    context_text, cached_model = agent.answers[0]
+    assert cached_model is agent.prompt_cache.cached_model
+    assert agent._context_prompt(context_text) == agent.prompt_cache.prefixes[0]
+    assert "Trip cancellation is covered up to $5,000. Delays are covered after 6 hours." in context_text
+    assert result.tokens_saved == 0
+
+
+def test_packed_context_is_sent_when_the_prefix_is_not_cached(agent):
+    first, _ = _requests()
+    agent.generate_response(first)
+
+    context_text, cached_model = agent.answers[0]
+    assert cached_model is None
+    assert "Delays are covered after 6 hours." not in context_text
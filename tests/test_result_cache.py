@@ -0,0 +1,99 @@
+"""
+Tests for the retrieval result cache and its invalidation on index rebuilds
+"""
+
+import os
+import time
+
+import pytest
+
+from agents.retrieval import result_cache as result_cache_module
+from agents.retrieval.chunk_store import ChunkStore
+from agents.retrieval.models import ChunkResult, SearchConfig
+from agents.retrieval.result_cache import RetrievalCache
+from agents.retrieval.retrieval_agent import RetrievalAgent
+
+
+def _chunk(chunk_id, score=0.8):
+    return ChunkResult(content=f"content {chunk_id}", product_name="Travel", document_type="Terms",
+                       source_file="Travel_Terms.md", section_hierarchy=[], relevance_score=score,
+                       chunk_id=chunk_id, search_method="hybrid")
+
+
+def _key(index_version="v1", product_focus=("Travel", "Maid"), top_k=5):
+    return RetrievalCache.make_key("trip cancellation", list(product_focus), top_k, False,
+                                   SearchConfig(), index_version)
+
+
+def test_hit_returns_compact_hits():
+    cache = RetrievalCache()
+    cache.put("key", [_chunk("a", 0.9), _chunk(None)])
+
+    assert cache.get("key") == (("a", 0.9, "hybrid"),)
+    assert cache.stats()["hits"] == 1
+
+
+def test_key_covers_index_version_and_ignores_product_order():
+    assert _key() == _key(product_focus=("Maid", "Travel"))
+    assert _key() != _key(index_version="v2")
+    assert _key() != _key(top_k=3)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RetrievalCache(max_entries=2)
+    cache.put("a", [_chunk("a")])
+    cache.put("b", [_chunk("b")])
+    cache.get("a")
+    cache.put("c", [_chunk("c")])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_empty_results_expire_after_negative_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: now[0])
+    cache = RetrievalCache(negative_ttl_seconds=60)
+    cache.put("empty", [])
+    cache.put("full", [_chunk("a")])
+
+    assert cache.get("empty") == ()
+    now[0] += 61
+    assert cache.get("empty") is None
+    assert cache.get("full") is not None
+    assert cache.stats() == {"entries": 1, "hits": 1, "negative_hits": 1, "misses": 1}
+
+
+@pytest.fixture
+def agent(tmp_path):
+    ChunkStore.build(str(tmp_path), [{"chunk_id": "a", "content": "content a"}])
+    agent = RetrievalAgent.__new__(RetrievalAgent)
+    agent.chunk_store = ChunkStore(str(tmp_path))
+    agent.search_config = SearchConfig()
+    agent.result_cache = RetrievalCache()
+    agent._alias_checked_at = time.monotonic()
+    return agent
+
+
+class _Request:
+    product_focus = ["Travel"]
+    top_k = 5
+
+
+def test_rebuilt_chunk_store_clears_cache_and_changes_key(agent, tmp_path):
+    key = agent._retrieval_cache_key("trip cancellation", _Request(), False)
+    agent.result_cache.put(key, [_chunk("a")])
+
+    ChunkStore.build(str(tmp_path), [{"chunk_id": "a", "content": "content a, reworded"}])
+    manifest = tmp_path / ChunkStore.MANIFEST_FILE
+    stat = os.stat(manifest)
+    os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    rebuilt_key = agent._retrieval_cache_key("trip cancellation", _Request(), False)
+    assert rebuilt_key != key
+    assert len(agent.result_cache) == 0
+
+
+def test_no_key_without_a_chunk_store(agent, tmp_path):
+    agent.chunk_store = ChunkStore(str(tmp_path / "missing"))
+    assert agent._retrieval_cache_key("trip cancellation", _Request(), False) is None
@@ -0,0 +1,97 @@
+"""
+Tests for RetrievalAgent result caching when a search component fails
+"""
+
+import threading
+from collections import OrderedDict
+
+import pytest
+
+from agents.intent_router.models import IntentClassification, PrimaryIntent
+from agents.retrieval import retrieval_agent as retrieval_module
+from agents.retrieval.models import ChunkResult, RetrievalRequest, SearchConfig
+from agents.retrieval.result_cache import RetrievalCache
+from agents.retrieval.retrieval_agent import RetrievalAgent
+
+
+def _chunk(chunk_id, score):
+    return ChunkResult(content=f"content {chunk_id}", product_name="Travel", document_type="Benefits",
+                       source_file="Travel_Tables.txt", section_hierarchy=[], relevance_score=score,
+                       chunk_id=chunk_id)
+
+
+class _Collections:
+    def get(self, name):
+        return object()
+
+
+class _Client:
+    collections = _Collections()
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    agent = RetrievalAgent.__new__(RetrievalAgent)
+    agent.client = _Client()
+    agent.collection_name = "Insurance"
+    agent.search_config = SearchConfig()
+    agent.result_cache = RetrievalCache()
+    agent._query_embeddings = OrderedDict()
+    agent._query_embeddings_lock = threading.Lock()
+    monkeypatch.setattr(agent, "_retrieval_cache_key", lambda query, request, is_comparison: "key")
+    monkeypatch.setattr(retrieval_module, "embed_text", lambda query: [0.6, 0.8])
+    monkeypatch.setattr(agent, "_keyword_search",
+                        lambda collection, query, where_filter, limit: ([_chunk("a", 7.0)], True))
+    monkeypatch.setattr(agent, "_vector_search",
+                        lambda collection, query, where_filter, limit, vector_name, query_embedding:
+                        ([_chunk("a", 0.9), _chunk("b", 0.8)], True))
+    return agent
+
+
+def _request():
+    classification = IntentClassification(
+        primary_intent=PrimaryIntent.PRODUCT_INQUIRY, product_focus=["Travel"], entities=[],
+        is_purchase_intent=False, original_query="overseas medical expenses limit"
+    )
+    return RetrievalRequest(intent_classification=classification, top_k=5)
+
+
+def test_successful_search_is_cached(agent):
+    results = agent.retrieve(_request())
+    assert [r.chunk_id for r in results] == ["a", "b"]
+    assert agent.result_cache.get("key") is not None
+
+
+def test_zero_vector_fallback_is_not_cached(agent, monkeypatch):
+    def fail(query):
+        raise RuntimeError("embedding quota exceeded")
+    monkeypatch.setattr(retrieval_module, "embed_text", fail)
+    agent.retrieve(_request())
+    assert agent.result_cache.get("key") is None
+
+
+@pytest.mark.parametrize("failing", ["_keyword_search", "_vector_search"])
+def test_failed_search_is_not_cached(agent, monkeypatch, failing):
+    monkeypatch.setattr(agent, failing, lambda *args, **kwargs: ([], False))
+    agent.retrieve(_request())
+    assert agent.result_cache.get("key") is None
+
+
+def test_missing_chunks_are_fetched_by_object_id(agent, tmp_path):
+    from types import SimpleNamespace
+    from agents.retrieval.chunk_store import ChunkStore
+
+    wanted = "1b4e28ba-2fa1-11d2-883f-0016d3cca427"
+    calls = []
+
+    class _Query:
+        def fetch_objects(self, filters, limit):
+            calls.append((filters, limit))
+            return SimpleNamespace(objects=[SimpleNamespace(uuid=wanted, properties={"chunk_id": wanted})])
+
+    agent.chunk_store = ChunkStore(str(tmp_path))
+    records = agent._load_chunk_records(SimpleNamespace(query=_Query()), [wanted])
+
+    assert list(records) == [wanted]
+    filters, limit = calls[0]
+    assert filters.target == "_id" and filters.value == [wanted] and limit == 1
@@ -0,0 +1,150 @@
+"""
+Tests for checkpointed ingestion runs: resume, torn lines and incomplete embeddings
+"""
+
+import numpy as np
+import pytest
+
+from agents.embedding.embedding_agent import EmbeddingAgent
+from agents.embedding.models import DocumentChunk, DocumentType, ProductType
+from agents.embedding.staged_run import StagedRun, _truncate_partial_line
+from agents.embedding.vector_store import WeaviateVectorStore
+
+DIMENSIONS = 4
+
+
+def _chunk(i, summary=True):
+    return DocumentChunk(product_name=ProductType.TRAVEL, policy_name="Travel Protect360",
+                         document_type=DocumentType.TERMS, source_file="Travel_Terms.md",
+                         content=f"Clause {i} of the travel policy wording.",
+                         summary=f"Summary of clause {i}" if summary else None)
+
+
+def _vector(i):
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    vector[i % DIMENSIONS] = 1.0
+    return vector
+
+
+class _VectorStore:
+    missing_embeddings = staticmethod(WeaviateVectorStore.missing_embeddings)
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    agent = EmbeddingAgent.__new__(EmbeddingAgent)
+    agent.vector_store = _VectorStore()
+    monkeypatch.setattr("agents.embedding.embedding_agent.Config.INGEST_CHECKPOINT_CHUNKS", 2)
+    return agent
+
+
+def test_chunks_with_failed_embeddings_are_requeued_on_resume(tmp_path, agent, monkeypatch):
+    run = StagedRun(str(tmp_path), run_id="run", dimensions=DIMENSIONS)
+    chunks = [_chunk(i) for i in range(3)]
+    run.append_enriched(chunks)
+    failing = {chunks[1].chunk_id}
+
+    def generate(batch):
+        for i, chunk in enumerate(batch):
+            chunk.content_embedding = _vector(i)
+            chunk.summary_embedding = None if chunk.chunk_id in failing else _vector(i + 1)
+        return batch
+
+    monkeypatch.setattr(agent, "_generate_embeddings", generate)
+    with pytest.raises(RuntimeError, match="missing from the embed output"):
+        agent._staged_embed(run)
+    assert run.embedded_ids() == {chunks[0].chunk_id, chunks[2].chunk_id}
+
+    # The resumed run embeds only the chunk that failed
+    failing.clear()
+    retried = []
+    monkeypatch.setattr(agent, "_generate_embeddings", lambda batch: retried.extend(batch) or generate(batch))
+    agent._staged_embed(run)
+    assert [chunk.chunk_id for chunk in retried] == [chunks[1].chunk_id]
+    embeddings = run.read_embeddings()
+    assert set(embeddings[chunks[1].chunk_id]) == {"content_embedding", "summary_embedding"}
+
+
+def test_chunk_without_summary_needs_no_summary_vector(agent):
+    chunk = _chunk(0, summary=False)
+    chunk.content_embedding = _vector(0)
+    assert agent.vector_store.missing_embeddings(chunk) == []
+
+
+@pytest.mark.parametrize("content, expected", [
+    (b'{"a": 1}\n{"b": 2}\n', b'{"a": 1}\n{"b": 2}\n'),
+    (b'{"a": 1}\n{"b": 2}\n{"c": ', b'{"a": 1}\n{"b": 2}\n'),
+    (b'{"c": ', b''),
+    (b'{"a": 1}\n' + b'x' * 70000, b'{"a": 1}\n'),
+])
+def test_partial_last_line_is_truncated(tmp_path, content, expected):
+    path = tmp_path / "enriched.jsonl"
+    path.write_bytes(content)
+    _truncate_partial_line(path)
+    assert path.read_bytes() == expected
+
+
+def test_enriched_append_after_a_torn_line_starts_a_fresh_line(tmp_path):
+    run = StagedRun(str(tmp_path), run_id="run")
+    chunks = [_chunk(i) for i in range(3)]
+    run.append_enriched(chunks[:2])
+    path = run.directory / StagedRun.ENRICHED_FILE
+    path.write_bytes(path.read_bytes()[:-10])
+
+    run.append_enriched(chunks[1:])
+    assert [chunk.chunk_id for chunk in run.read_enriched()] == [chunk.chunk_id for chunk in chunks]
+
+
+def test_enrich_resumes_after_the_last_checkpoint(tmp_path, agent, monkeypatch):
+    run = StagedRun(str(tmp_path), run_id="run")
+    chunks = [_chunk(i) for i in range(5)]
+    run.write_chunks(chunks)
+    run.append_enriched(chunks[:3])
+
+    enriched = []
+    monkeypatch.setattr(agent, "_enrich_chunks", lambda batch: enriched.extend(batch) or batch)
+    results = agent._staged_enrich(StagedRun(str(tmp_path), run_id="run"))
+    assert [chunk.chunk_id for chunk in enriched] == [chunk.chunk_id for chunk in chunks[3:]]
+    assert [chunk.chunk_id for chunk in results] == [chunk.chunk_id for chunk in chunks]
+
+
+def test_rows_past_the_last_index_line_are_cut_on_append(tmp_path):
+    run = StagedRun(str(tmp_path), run_id="run", dimensions=DIMENSIONS)
+    chunks = [_chunk(i) for i in range(3)]
+    for i, chunk in enumerate(chunks):
+        chunk.content_embedding = _vector(i)
+        chunk.summary_embedding = _vector(i + 1)
+    run.append_embeddings(chunks[:1])
+
+    # Crash after the column rows of a second append were written, mid-way through its index line
+    with open(run._column_path("content_embedding"), "ab") as f:
+        f.write(_vector(3).tobytes())
+    with open(run._index_path(), "ab") as f:
+        f.write(b'{"chunk_id": "torn"')
+
+    run.append_embeddings(chunks[1:])
+    embeddings = run.read_embeddings()
+    assert list(embeddings) == [chunk.chunk_id for chunk in chunks]
+    for i, chunk in enumerate(chunks):
+        np.testing.assert_array_equal(embeddings[chunk.chunk_id]["content_embedding"], _vector(i))
+        np.testing.assert_array_equal(embeddings[chunk.chunk_id]["summary_embedding"], _vector(i + 1))
+
+
+def test_checkpoint_survives_reopening_and_reset(tmp_path):
+    run = StagedRun(str(tmp_path), run_id="run", dimensions=DIMENSIONS)
+    run.append_enriched([_chunk(0)])
+    chunk = _chunk(0)
+    chunk.content_embedding = _vector(0)
+    run.append_embeddings([chunk])
+    for stage in ("chunk", "enrich", "embed"):
+        run.mark_complete(stage, embedding_dimensions=DIMENSIONS)
+
+    reopened = StagedRun(str(tmp_path), run_id="run", dimensions=DIMENSIONS)
+    assert reopened.completed_stages == ["chunk", "enrich", "embed"]
+    with pytest.raises(ValueError, match="--from-stage embed"):
+        StagedRun(str(tmp_path), run_id="run", dimensions=DIMENSIONS * 2)
+
+    reopened.reset_from("embed")
+    assert reopened.completed_stages == ["chunk", "enrich"]
+    assert reopened.embedded_ids() == set()
+    assert len(reopened.read_enriched()) == 1